@@ -0,0 +1,104 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the payload size accounting for devices with many keys: the serialization that was required to measure
+the data before it was split by maxPayloadSize, compared with the sizes kept by the entities. Building and splitting
+of ConvertedData is measured as well.
+
+Usage: python -m tests.benchmarks.data_size_benchmark [devices count] [keys per device] [max payload size]
+"""
+
+from sys import argv
+from time import perf_counter
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.data_size import get_entry_sizes
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+def generate_values(devices_count, keys_per_device):
+    keys = [DatapointKey("key_%i" % key_index) for key_index in range(keys_per_device)]
+    result = []
+    for device_index in range(devices_count):
+        values = {}
+        for key_index, key in enumerate(keys):
+            if key_index % 3 == 0:
+                values[key] = device_index * 0.5 + key_index
+            elif key_index % 3 == 1:
+                values[key] = device_index + key_index
+            else:
+                values[key] = "value_%i" % key_index
+        result.append(values)
+    return result
+
+
+def measure_with_serialization(devices_values):
+    # Serialization done for the same data before the sizes were maintained incrementally:
+    # TelemetryEntry.__init__, the entry size and every key in split_large_entries
+    for values in devices_values:
+        entry = TelemetryEntry(values, 1700000000000)
+        TBUtility.get_data_size(entry.to_dict())
+        TBUtility.get_data_size({datapoint_key.key: value for datapoint_key, value in values.items()})
+        for datapoint_key, value in values.items():
+            TBUtility.get_data_size({datapoint_key.key: value})
+
+
+def measure_with_entity_sizes(devices_values):
+    # The same sizes, as they are requested by ConvertedData.convert_to_objects_with_maximal_size now
+    for values in devices_values:
+        entry = TelemetryEntry(values, 1700000000000)
+        entry.values_size
+        get_entry_sizes(values)
+
+
+def build_and_split(devices_values, max_payload_size):
+    chunks_count = 0
+    for device_index, values in enumerate(devices_values):
+        data = ConvertedData("Device %i" % device_index, "default")
+        data.add_to_telemetry(TelemetryEntry(values, 1700000000000))
+        chunks_count += len(data.convert_to_objects_with_maximal_size(max_payload_size))
+    return chunks_count
+
+
+def run(devices_count=1000, keys_per_device=1000, max_payload_size=8196):
+    devices_values = generate_values(devices_count, keys_per_device)
+    datapoints = devices_count * keys_per_device
+    print("Devices: %i, keys per device: %i, max payload size: %i" % (devices_count, keys_per_device,
+                                                                     max_payload_size))
+
+    start = perf_counter()
+    measure_with_serialization(devices_values)
+    serialization_time = perf_counter() - start
+
+    start = perf_counter()
+    measure_with_entity_sizes(devices_values)
+    entity_sizes_time = perf_counter() - start
+
+    start = perf_counter()
+    chunks_count = build_and_split(devices_values, max_payload_size)
+    split_time = perf_counter() - start
+
+    print("sizes by serialization:      %8.1f ms (%6.3f us/dp)" % (serialization_time * 1000,
+                                                                   serialization_time * 1000000 / datapoints))
+    print("sizes by entities:           %8.1f ms (%6.3f us/dp)" % (entity_sizes_time * 1000,
+                                                                   entity_sizes_time * 1000000 / datapoints))
+    print("build and split (%6i msgs): %8.1f ms (%6.3f us/dp)" % (chunks_count, split_time * 1000,
+                                                                   split_time * 1000000 / datapoints))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:4]])
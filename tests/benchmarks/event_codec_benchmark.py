@@ -0,0 +1,77 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares storage event codecs on the storage hot path: encoding of ConvertedData before "put" and
+decoding/grouping of events in the send thread.
+
+Usage: python -m tests.benchmarks.event_codec_benchmark [events count] [keys per event]
+"""
+
+from sys import argv
+from time import perf_counter
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.storage.event_codec import EVENT_CODECS
+
+
+def generate_data(events_count, keys_per_event):
+    result = []
+    keys = [DatapointKey("key_%i" % key_index) for key_index in range(keys_per_event)]
+    for event_index in range(events_count):
+        data = ConvertedData("Device %i" % (event_index % 100), "default")
+        values = {}
+        for key_index, key in enumerate(keys):
+            if key_index % 3 == 0:
+                values[key] = event_index * 0.5 + key_index
+            elif key_index % 3 == 1:
+                values[key] = event_index + key_index
+            else:
+                values[key] = "value_%i" % key_index
+        data.add_to_telemetry(TelemetryEntry(values, 1700000000000 + event_index))
+        data.add_to_attributes(DatapointKey("firmware"), "1.0.%i" % event_index)
+        result.append(data)
+    return result
+
+
+def run(events_count=10000, keys_per_event=5):
+    data = generate_data(events_count, keys_per_event)
+    datapoints = events_count * (keys_per_event + 1)
+    print("Events: %i, datapoints: %i" % (events_count, datapoints))
+    for codec_name, codec_class in EVENT_CODECS.items():
+        codec = codec_class()
+
+        start = perf_counter()
+        events = [codec.encode(item) for item in data]
+        encode_time = perf_counter() - start
+
+        start = perf_counter()
+        devices_data_in_event_pack = {}
+        for event in events:
+            codec.decode_into_pack(event, devices_data_in_event_pack)
+        decode_time = perf_counter() - start
+
+        # Events of the in-memory codec are never serialized, so they have no size in bytes
+        total_size = "%9i bytes" % sum(len(event) for event in events) if codec.persistent else "in memory"
+        print("%-8s encode: %8.1f ms (%6.2f us/dp)  decode: %8.1f ms (%6.2f us/dp)  size: %s" % (
+            codec_name,
+            encode_time * 1000, encode_time * 1000000 / datapoints,
+            decode_time * 1000, decode_time * 1000000 / datapoints,
+            total_size))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:3]])
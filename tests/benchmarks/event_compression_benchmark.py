@@ -0,0 +1,63 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the size of the stored events and the compression/decompression time per event
+for every storage compression and event format.
+
+Usage: python -m tests.benchmarks.event_compression_benchmark [events count]
+"""
+
+from logging import getLogger
+from random import Random
+from sys import argv
+from time import perf_counter
+
+from thingsboard_gateway.storage.event_codec import get_event_codec
+from thingsboard_gateway.storage.event_compression import get_event_compressor
+
+
+def generate_data(events_count):
+    random = Random(1)
+    return [{"deviceName": "Plant 3 Line %i Meter %i" % (index % 4, index % 50), "deviceType": "meter",
+             "telemetry": [{"ts": 1700000000000 + index * 1000,
+                            "values": {"temperature": round(random.uniform(15, 30), 2),
+                                       "humidity": random.randint(30, 60),
+                                       "voltage": round(random.uniform(220, 240), 1),
+                                       "state": random.choice(("on", "off"))}}],
+             "attributes": {}} for index in range(events_count)]
+
+
+def run(events_count=100000):
+    data = generate_data(events_count)
+    for event_format in ("json", "binary"):
+        events = [get_event_codec(event_format).encode(item) for item in data]
+        raw_size = sum(len(event) for event in events)
+        for compression in (None, "zlib", "zstd"):
+            compressor = get_event_compressor({"compression": compression}, getLogger("BENCHMARK"))
+            start = perf_counter()
+            compressed_events = [compressor.compress(event) for event in events]
+            compression_time = perf_counter() - start
+            start = perf_counter()
+            compressor.decompress_pack(compressed_events)
+            decompression_time = perf_counter() - start
+            compressed_size = sum(len(event) for event in compressed_events)
+            print("%-6s %-5s %6.1f bytes/event, ratio %4.2f, compress %5.2f us/event, decompress %5.2f us/event"
+                  % (event_format, compressor.name or "none", compressed_size / events_count,
+                     raw_size / compressed_size, compression_time / events_count * 1e6,
+                     decompression_time / events_count * 1e6))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:2]])
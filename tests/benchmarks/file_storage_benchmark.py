@@ -0,0 +1,84 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares the file storage with the segmented log storage: write throughput, read throughput and the time to resume
+reading after a restart in the middle of the stored events.
+
+Usage: python -m tests.benchmarks.file_storage_benchmark [events count] [data folder]
+"""
+
+from logging import getLogger
+from shutil import rmtree
+from sys import argv
+from tempfile import mkdtemp
+from threading import Event
+from time import perf_counter
+
+from thingsboard_gateway.storage.file.file_event_storage import FileEventStorage
+from thingsboard_gateway.storage.segmented_log.segmented_log_event_storage import SegmentedLogEventStorage
+
+EVENT = ('{"deviceName":"Device %i","deviceType":"default","telemetry":[{"ts":1700000000000,'
+         '"values":{"temperature":21.5,"humidity":40,"state":"on"}}]}')
+READ_RECORDS_COUNT = 1000
+
+
+def measure(storage_class, config, events_count):
+    stop_event = Event()
+    storage = storage_class(config, getLogger("BENCHMARK"), stop_event)
+    start = perf_counter()
+    for index in range(events_count):
+        storage.put(EVENT % index)
+    write_time = perf_counter() - start
+
+    start = perf_counter()
+    read_count = 0
+    while read_count < events_count // 2:
+        read_count += len(storage.get_event_pack())
+        storage.event_pack_processing_done()
+    read_time = perf_counter() - start
+    storage.stop()
+
+    start = perf_counter()
+    storage = storage_class(config, getLogger("BENCHMARK"), stop_event)
+    storage.get_event_pack()
+    resume_time = perf_counter() - start
+    storage.stop()
+    stop_event.set()
+    return write_time, read_time, read_count, resume_time
+
+
+def run(events_count=100000, data_folder=None):
+    folder = mkdtemp(dir=data_folder)
+    print("Events: %i, folder: %s" % (events_count, folder))
+    storages = (
+        # All events are kept in one data file of the file storage, its reader skips the lines up to the position
+        ("file", FileEventStorage, {"data_folder_path": folder + "/file/", "max_file_count": 1000,
+                                    "max_records_per_file": events_count,
+                                    "max_read_records_count": READ_RECORDS_COUNT}),
+        ("segmented_log", SegmentedLogEventStorage, {"data_folder_path": folder + "/segmented_log/",
+                                                     "max_segments_count": 1000,
+                                                     "max_read_records_count": READ_RECORDS_COUNT}),
+    )
+    try:
+        for name, storage_class, config in storages:
+            write_time, read_time, read_count, resume_time = measure(storage_class, config, events_count)
+            print("%-14s write: %9.0f events/s, read: %9.0f events/s, resume: %8.2f ms"
+                  % (name, events_count / write_time, read_count / read_time, resume_time * 1000))
+    finally:
+        rmtree(folder)
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:2]], *argv[2:3])
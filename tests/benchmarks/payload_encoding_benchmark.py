@@ -0,0 +1,59 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the bytes sent to ThingsBoard and the packing time per datapoint for the JSON and protobuf payload types
+of packed gateway messages.
+
+Usage: python -m tests.benchmarks.payload_encoding_benchmark [devices count] [max payload size]
+"""
+
+from random import Random
+from sys import argv
+from time import perf_counter
+
+from thingsboard_gateway.gateway.device_data_packer import JSON_PAYLOAD_TYPE, PROTOBUF_PAYLOAD_TYPE, \
+    DeviceDataPacker
+
+# MQTT fixed header, topic length and packet identifier
+MQTT_HEADER_SIZE = 4
+TOPIC_SIZE = len("v1/gateway/telemetry")
+
+
+def generate_data(devices_count):
+    random = Random(1)
+    return {"Plant 3 Line %i Meter %i" % (index % 4, index): [
+        {"ts": 1700000000000 + sample * 1000,
+         "values": {"temperature": round(random.uniform(15, 30), 2),
+                    "humidity": random.randint(30, 60),
+                    "voltage": round(random.uniform(220, 240), 1),
+                    "state": random.choice(("on", "off"))}} for sample in range(5)]
+        for index in range(devices_count)}
+
+
+def run(devices_count=10000, max_payload_size=65535):
+    devices_telemetry = generate_data(devices_count)
+    datapoints_count = devices_count * 5 * 4
+    for payload_type in (JSON_PAYLOAD_TYPE, PROTOBUF_PAYLOAD_TYPE):
+        start = perf_counter()
+        messages, _ = DeviceDataPacker(max_payload_size, payload_type=payload_type).pack_telemetry(devices_telemetry)
+        packing_time = perf_counter() - start
+        payload_size = sum(len(message.payload) for message in messages)
+        sent_size = payload_size + len(messages) * (MQTT_HEADER_SIZE + TOPIC_SIZE)
+        print("%-8s %6i messages, %5.2f bytes/datapoint on the wire, packing %5.2f us/datapoint"
+              % (payload_type, len(messages), sent_size / datapoints_count, packing_time / datapoints_count * 1e6))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:3]])
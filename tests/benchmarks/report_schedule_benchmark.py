@@ -0,0 +1,107 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures a tick of the periodical reporting for many keys with report periods spread over the given range:
+the scan of every key that was done before the keys were scheduled, compared with the schedule, which touches
+only the keys that are due. Scheduling of all keys is measured as well.
+
+Usage: python -m tests.benchmarks.report_schedule_benchmark [keys count] [min period ms] [max period ms]
+"""
+
+from logging import getLogger
+from sys import argv
+from time import perf_counter
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.report_strategy.report_schedule import ReportSchedule
+from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+
+TICK = 10
+TICKS_COUNT = 100
+KEYS_PER_DEVICE = 100
+
+
+def fill_cache(keys_count, min_period, max_period):
+    cache = ReportStrategyDataCache({}, getLogger("BENCHMARK"))
+    strategies = [ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": period})
+                  for period in range(min_period, max_period + 1, max(1, (max_period - min_period) // 100))]
+    keys = []
+    for index in range(keys_count):
+        key = (DatapointKey("key_%i" % (index % KEYS_PER_DEVICE), strategies[index % len(strategies)]),
+               "Device %i" % (index // KEYS_PER_DEVICE), "connector")
+        cache.put(key[0], index, key[1], "default", "Connector", key[2], key[0].report_strategy, True)
+        # Keys are received spread over the first period
+        cache.update_last_report_time(*key, index % min_period)
+        keys.append(key)
+    return cache, keys
+
+
+def tick_with_scan(cache, keys, current_time):
+    # The tick as it was done before the schedule: a copy and a check of every key
+    reported = 0
+    for key, device_name, connector_id in set(keys):
+        record = cache.get(key, device_name, connector_id)
+        if record is None or not record.should_be_reported_by_period(current_time):
+            continue
+        record.update_last_report_time(current_time)
+        reported += 1
+    return reported
+
+
+def tick_with_schedule(cache, schedule, current_time):
+    reported = 0
+    for scheduled_key in schedule.pop_due(current_time):
+        record = cache.get(*scheduled_key)
+        if not record.should_be_reported_by_period(current_time):
+            schedule.schedule(scheduled_key, record.get_next_report_time())
+            continue
+        record.update_last_report_time(current_time)
+        schedule.schedule(scheduled_key, record.get_next_report_time())
+        reported += 1
+    return reported
+
+
+def run(keys_count=100000, min_period=1000, max_period=60000):
+    print("Keys: %i, report periods: %i-%i ms, %i ticks by %i ms" % (keys_count, min_period, max_period,
+                                                                   TICKS_COUNT, TICK))
+    cache, keys = fill_cache(keys_count, min_period, max_period)
+    start_time = min_period
+
+    start = perf_counter()
+    schedule = ReportSchedule()
+    for key in keys:
+        schedule.schedule(key, cache.get(*key).get_next_report_time())
+    scheduling_time = perf_counter() - start
+
+    start = perf_counter()
+    scheduled_reported = sum(tick_with_schedule(cache, schedule, start_time + tick * TICK)
+                             for tick in range(TICKS_COUNT))
+    schedule_time = perf_counter() - start
+
+    cache, keys = fill_cache(keys_count, min_period, max_period)
+    start = perf_counter()
+    scanned_reported = sum(tick_with_scan(cache, keys, start_time + tick * TICK) for tick in range(TICKS_COUNT))
+    scan_time = perf_counter() - start
+    cache.stop()
+
+    print("scheduling of all keys:    %8.1f ms" % (scheduling_time * 1000))
+    print("tick with scan:            %8.3f ms (%i reported)" % (scan_time * 1000 / TICKS_COUNT, scanned_reported))
+    print("tick with schedule:        %8.3f ms (%i reported)" % (schedule_time * 1000 / TICKS_COUNT,
+                                                                 scheduled_reported))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:4]])
@@ -0,0 +1,79 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Measures the SQLite storage with a backlog of the given sizes: write throughput, from the first put until all
+messages are stored, and drain throughput, reading and acknowledging packs until the storage is empty.
+
+Usage: python -m tests.benchmarks.sqlite_storage_benchmark [backlog size ...] [--folder data folder]
+"""
+
+from logging import getLogger
+from shutil import rmtree
+from sys import argv
+from tempfile import mkdtemp
+from threading import Event
+from time import perf_counter, sleep
+
+from thingsboard_gateway.storage.sqlite.sqlite_event_storage import SQLiteEventStorage
+
+EVENT = ('{"deviceName":"Device %i","deviceType":"default","telemetry":[{"ts":1700000000000,'
+         '"values":{"temperature":21.5,"humidity":40,"state":"on"}}]}')
+READ_RECORDS_COUNT = 1000
+
+log = getLogger("BENCHMARK")
+log.trace = log.debug
+
+
+def measure(backlog_size, folder):
+    stop_event = Event()
+    storage = SQLiteEventStorage({"data_file_path": folder + "/data.db", "max_read_records_count": READ_RECORDS_COUNT,
+                                  "writing_batch_size": READ_RECORDS_COUNT}, log, stop_event)
+    write_database = storage._SQLiteEventStorage__write_database
+    start = perf_counter()
+    for index in range(backlog_size):
+        storage.put(EVENT % index)
+    while write_database.get_stored_messages_count() < backlog_size:
+        sleep(0.01)
+    write_time = perf_counter() - start
+
+    start = perf_counter()
+    drained = 0
+    while drained < backlog_size:
+        drained += len(storage.get_event_pack())
+        storage.event_pack_processing_done()
+    drain_time = perf_counter() - start
+    storage.stop()
+    stop_event.set()
+    return write_time, drain_time
+
+
+def run(backlog_sizes=(10000, 100000, 1000000), data_folder=None):
+    for backlog_size in backlog_sizes:
+        folder = mkdtemp(dir=data_folder)
+        try:
+            write_time, drain_time = measure(backlog_size, folder)
+        finally:
+            rmtree(folder)
+        print("backlog %8i  write: %9.0f rows/s  drain: %9.0f rows/s" % (backlog_size, backlog_size / write_time,
+                                                                           backlog_size / drain_time))
+
+
+if __name__ == '__main__':
+    arguments = argv[1:]
+    folder_argument = None
+    if "--folder" in arguments:
+        folder_argument = arguments[arguments.index("--folder") + 1]
+        arguments = arguments[:arguments.index("--folder")]
+    run(tuple(int(argument) for argument in arguments) or (10000, 100000, 1000000), folder_argument)
@@ -0,0 +1,86 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Compares matching of incoming message topics with the MQTT connector mappings by the regular expressions scan
+and by the topic trie. Regular expressions are compiled in advance, with thousands of mappings the scan by
+"fullmatch" with uncompiled expressions is even slower, because they do not fit into the cache of the "re" module.
+
+Usage: python -m tests.benchmarks.topic_trie_benchmark [mappings count] [messages count]
+"""
+
+from random import Random
+from re import compile as compile_regex
+from sys import argv
+from time import perf_counter
+
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+def generate_topic_filters(mappings_count):
+    topic_filters = []
+    for index in range(mappings_count):
+        if index % 10 == 0:
+            topic_filters.append("site/%i/+/telemetry" % index)
+        elif index % 10 == 1:
+            topic_filters.append("site/%i/#" % index)
+        else:
+            topic_filters.append("site/%i/line/%i/device/%i" % (index, index % 7, index))
+    return topic_filters
+
+
+def generate_topics(mappings_count, messages_count):
+    random = Random(1)
+    topics = []
+    for _ in range(messages_count):
+        index = random.randrange(mappings_count)
+        if index % 10 == 0:
+            topics.append("site/%i/meter/telemetry" % index)
+        elif index % 10 == 1:
+            topics.append("site/%i/line/status" % index)
+        else:
+            topics.append("site/%i/line/%i/device/%i" % (index, index % 7, index))
+    return topics
+
+
+def run(mappings_count=10000, messages_count=2000):
+    topic_filters = generate_topic_filters(mappings_count)
+    topics = generate_topics(mappings_count, messages_count)
+
+    regex_topics = [(compile_regex(TBUtility.topic_to_regex(topic_filter)), topic_filter)
+                    for topic_filter in topic_filters]
+    start = perf_counter()
+    regex_matches = [[topic_filter for regex, topic_filter in regex_topics if regex.fullmatch(topic)]
+                     for topic in topics]
+    regex_time = perf_counter() - start
+
+    start = perf_counter()
+    topic_trie = TopicTrie()
+    for topic_filter in topic_filters:
+        topic_trie.add(topic_filter, topic_filter)
+    build_time = perf_counter() - start
+    start = perf_counter()
+    trie_matches = [topic_trie.match(topic) for topic in topics]
+    trie_time = perf_counter() - start
+
+    assert regex_matches == trie_matches
+    print("%i mappings, regular expressions scan: %9.2f us/message" % (mappings_count,
+                                                                        regex_time / messages_count * 1e6))
+    print("%i mappings, topic trie:               %9.2f us/message, built in %.1f ms"
+          % (mappings_count, trie_time / messages_count * 1e6, build_time * 1000))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in argv[1:3]])
@@ -0,0 +1,250 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from queue import Queue
+from threading import Event, Thread
+from types import SimpleNamespace
+from unittest import TestCase
+
+from thingsboard_gateway.connectors.mqtt.mqtt_connector import MqttConnector
+from thingsboard_gateway.grpc_connectors.mqtt.mqtt_connector import GrpcMqttConnector
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+
+LOG = getLogger("TEST")
+
+
+class Converter:
+    def convert(self, topic, content):
+        if content.get("broken"):
+            raise ValueError("Broken message")
+        converted_data = ConvertedData(topic, "default")
+        if content.get("withoutTs"):
+            converted_data.add_to_telemetry({"number": content["number"]})
+        else:
+            converted_data.add_to_telemetry({"ts": content["number"], "values": {"number": content["number"]}})
+        converted_data.add_to_attributes("lastNumber", content["number"])
+        return converted_data
+
+
+class BatchConverter(Converter):
+    def __init__(self):
+        self.batches = []
+
+    def convert_batch(self, topic, contents):
+        self.batches.append(contents)
+        return [self.convert(topic, content) for content in contents]
+
+
+class TestConverterWorker(TestCase):
+    def setUp(self):
+        self.results = []
+        self.sent_lists_count = 0
+        self.all_results_received = Event()
+        self.messages_count = 0
+        self.worker = MqttConnector.ConverterWorker("Worker", Queue(), self.save_results, LOG, batch_size=10)
+
+    def tearDown(self):
+        self.worker.stop()
+        self.worker.join(timeout=5)
+
+    def save_results(self, data_list):
+        self.sent_lists_count += 1
+        for converted_data in data_list:
+            for telemetry_entry in converted_data.telemetry:
+                self.results.append((converted_data.device_name, telemetry_entry.ts))
+        if len(self.results) == self.messages_count:
+            self.all_results_received.set()
+
+    def test_messages_of_device_are_sent_in_order_of_receiving(self):
+        self.worker.start()
+        self.messages_count = 100
+        converter = Converter()
+        for number in range(self.messages_count):
+            self.worker.queue.put((converter, "device/%i" % (number % 3), {"number": number}))
+        self.assertTrue(self.all_results_received.wait(5))
+        for device_number in range(3):
+            device_name = "device/%i" % device_number
+            self.assertListEqual([ts for name, ts in self.results if name == device_name],
+                                 list(range(device_number, 100, 3)))
+
+    def test_broken_message_does_not_drop_other_messages_of_batch(self):
+        self.worker.start()
+        self.messages_count = 2
+        converter = Converter()
+        self.worker.queue.put((converter, "device", {"number": 1}))
+        self.worker.queue.put((converter, "device", {"broken": True}))
+        self.worker.queue.put((converter, "device", {"number": 2}))
+        self.assertTrue(self.all_results_received.wait(5))
+        self.assertListEqual(self.results, [("device", 1), ("device", 2)])
+
+    def test_consecutive_messages_of_topic_are_converted_by_one_batch_call(self):
+        self.messages_count = 10
+        converter = BatchConverter()
+        for number in range(self.messages_count):
+            self.worker.queue.put((converter, "device/%i" % (number // 5), {"number": number}))
+        self.worker.start()
+        self.assertTrue(self.all_results_received.wait(5))
+        self.assertListEqual(converter.batches, [[{"number": number} for number in range(0, 5)],
+                                                 [{"number": number} for number in range(5, 10)]])
+        # Data of both devices is sent in one call
+        self.assertEqual(self.sent_lists_count, 1)
+
+    def test_messages_of_different_topics_keep_order_of_batch(self):
+        self.messages_count = 6
+        converter = BatchConverter()
+        # A device publishes telemetry and attributes to different topics
+        for number, topic in enumerate(("telemetry", "telemetry", "attributes", "telemetry", "attributes",
+                                        "attributes")):
+            self.worker.queue.put((converter, topic, {"number": number}))
+        self.worker.start()
+        self.assertTrue(self.all_results_received.wait(5))
+        self.assertListEqual([ts for _, ts in self.results], list(range(6)))
+
+    def test_messages_without_timestamp_are_not_merged(self):
+        self.messages_count = 3
+        converter = BatchConverter()
+        for number in range(self.messages_count):
+            self.worker.queue.put((converter, "device", {"number": number, "withoutTs": True}))
+        self.worker.start()
+        self.assertTrue(self.all_results_received.wait(5))
+        self.assertEqual(self.sent_lists_count, 1)
+        self.assertEqual(len(self.results), 3)
+
+    def test_messages_wait_in_queue_while_storage_backpressure_is_active(self):
+        backpressure_released = Event()
+        self.worker = MqttConnector.ConverterWorker("Worker", Queue(), self.save_results, LOG,
+                                                    is_backpressure_active=lambda: not backpressure_released.is_set())
+        self.worker.start()
+        self.messages_count = 1
+        self.worker.queue.put((Converter(), "device", {"number": 1}))
+        self.assertFalse(self.all_results_received.wait(0.2))
+        self.assertEqual(self.worker.queue.qsize(), 1)
+
+        backpressure_released.set()
+        self.assertTrue(self.all_results_received.wait(5))
+
+    def test_stopped_worker_finishes(self):
+        self.worker.start()
+        self.worker.stop()
+        self.worker.join(timeout=5)
+        self.assertFalse(self.worker.is_alive())
+
+
+class ConfiguredConverter(Converter):
+    def __init__(self, device_info):
+        self.config = {"deviceInfo": device_info}
+
+
+class TestPartitionKey(TestCase):
+    def test_device_name_is_partition_key_when_it_is_known_before_conversion(self):
+        get_partition_key = MqttConnector._get_partition_key
+        topic_converter = ConfiguredConverter({"deviceNameExpressionSource": "topic",
+                                               "deviceNameExpression": "(?<=sensors/)[^/]*"})
+        self.assertEqual(get_partition_key(topic_converter, "sensors/Device/telemetry", {}), "Device")
+        self.assertEqual(get_partition_key(topic_converter, "sensors/Device/attributes", {}), "Device")
+
+        message_converter = ConfiguredConverter({"deviceNameExpressionSource": "message",
+                                                 "deviceNameExpression": "${serial}"})
+        self.assertEqual(get_partition_key(message_converter, "telemetry", {"serial": "Device"}), "Device")
+
+        constant_converter = ConfiguredConverter({"deviceNameExpressionSource": "constant",
+                                                  "deviceNameExpression": "Device"})
+        self.assertEqual(get_partition_key(constant_converter, "telemetry", {}), "Device")
+
+    def test_topic_is_partition_key_when_device_name_is_not_known_before_conversion(self):
+        message_converter = ConfiguredConverter({"deviceNameExpressionSource": "message",
+                                                 "deviceNameExpression": "${serial}"})
+        self.assertEqual(MqttConnector._get_partition_key(message_converter, "telemetry", b"raw"), "telemetry")
+        self.assertEqual(MqttConnector._get_partition_key(Converter(), "telemetry", {}), "telemetry")
+
+
+class BytesConverter(Converter):
+    SUPPORTS_BYTES_PAYLOAD = True
+
+
+class TestMessagesReceivingBackpressure(TestCase):
+    def setUp(self):
+        # The connector is not started, only the attributes used to put messages to the workers are set
+        self.connector = MqttConnector.__new__(MqttConnector)
+        self.connector._MqttConnector__stopped = False
+        self.worker = MqttConnector.ConverterWorker("Worker", Queue(1), lambda data_list: None, LOG)
+        self.connector._MqttConnector__workers_thread_pool = [self.worker]
+        self.put_results = []
+
+    def put(self, number):
+        self.put_results.append(self.connector.put_data_to_convert(BytesConverter(), SimpleNamespace(topic="device"),
+                                                                   {"number": number}))
+
+    def test_putting_waits_while_worker_queue_is_full(self):
+        self.put(1)
+        putting_thread = Thread(target=self.put, args=(2,))
+        putting_thread.start()
+        putting_thread.join(0.2)
+        self.assertTrue(putting_thread.is_alive())
+
+        self.worker.queue.get_nowait()
+        putting_thread.join(5)
+        self.assertListEqual(self.put_results, [True, True])
+        self.assertEqual(self.worker.queue.get_nowait()[2], {"number": 2})
+
+    def test_waiting_is_finished_when_connector_is_stopped(self):
+        self.put(1)
+        putting_thread = Thread(target=self.put, args=(2,))
+        putting_thread.start()
+        self.connector._MqttConnector__stopped = True
+        putting_thread.join(5)
+        self.assertListEqual(self.put_results, [True, False])
+
+
+class GrpcClient:
+    def __init__(self):
+        self.messages = []
+        self.all_messages_sent = Event()
+
+    def send(self, message):
+        self.messages.append(message)
+        if len(self.messages) == 2:
+            self.all_messages_sent.set()
+
+
+class TestGrpcConnectorConverterWorker(TestCase):
+    def setUp(self):
+        # The connector is not started, only the attributes used by its workers are set
+        self.connector = GrpcMqttConnector.__new__(GrpcMqttConnector)
+        self.connector._GrpcMqttConnector__msg_queue = Queue()
+        self.connector._GrpcMqttConnector__workers_thread_pool = []
+        self.connector._GrpcMqttConnector__max_msg_number_for_worker = 10
+        self.connector._GrpcMqttConnector__max_number_of_workers = 100
+        self.connector._grpc_client = GrpcClient()
+        self.connector.statistics = {'MessagesSent': 0}
+
+    def tearDown(self):
+        for worker in self.connector._GrpcMqttConnector__workers_thread_pool:
+            worker.stop()
+            worker.join(timeout=5)
+
+    def test_messages_are_converted_and_sent_by_worker(self):
+        self.connector._GrpcMqttConnector__threads_manager()
+        workers = self.connector._GrpcMqttConnector__workers_thread_pool
+        self.assertEqual(len(workers), 1)
+        self.assertIsInstance(workers[0], MqttConnector.ConverterWorker)
+
+        converter = Converter()
+        for number in range(2):
+            self.assertTrue(self.connector.put_data_to_convert(converter, SimpleNamespace(topic="device"),
+                                                               {"number": number}))
+
+        self.assertTrue(self.connector._grpc_client.all_messages_sent.wait(5))
+        self.assertEqual(self.connector.statistics['MessagesSent'], 2)
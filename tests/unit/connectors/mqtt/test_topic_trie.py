@@ -0,0 +1,52 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
+
+
+class TestTopicTrie(TestCase):
+    def setUp(self):
+        self.trie = TopicTrie()
+        for topic_filter in ("sensor/data", "sensor/+/data", "sensor/#", "+/+/data", "#", "sensor/+", "$SYS/#",
+                             "$share/group/shared/+/data", "$queue/queued/data"):
+            self.trie.add(topic_filter, topic_filter)
+
+    def test_single_level_wildcard_matches_one_level(self):
+        self.assertListEqual(self.trie.match("sensor/temperature/data"),
+                             ["sensor/+/data", "sensor/#", "+/+/data", "#"])
+        self.assertListEqual(self.trie.match("sensor//data"), ["sensor/+/data", "sensor/#", "+/+/data", "#"])
+        self.assertListEqual(self.trie.match("sensor/a/b/data"), ["sensor/#", "#"])
+
+    def test_multi_level_wildcard_matches_parent_level(self):
+        self.assertListEqual(self.trie.match("sensor"), ["sensor/#", "#"])
+        self.assertListEqual(self.trie.match("sensor/data"), ["sensor/data", "sensor/#", "#", "sensor/+"])
+
+    def test_wildcards_do_not_match_system_topics(self):
+        self.assertListEqual(self.trie.match("$SYS/broker/uptime"), ["$SYS/#"])
+
+    def test_shared_subscriptions_are_matched_without_prefix(self):
+        self.assertListEqual(self.trie.match("shared/device/data"), ["+/+/data", "#", "$share/group/shared/+/data"])
+        self.assertListEqual(self.trie.match("queued/data"), ["#", "$queue/queued/data"])
+
+    def test_values_of_same_topic_filter_are_returned_in_order(self):
+        trie = TopicTrie()
+        trie.add("devices/+/telemetry", "first converter")
+        trie.add("devices/#", "second converter")
+        trie.add("devices/+/telemetry", "third converter")
+        self.assertListEqual(trie.match("devices/thermostat/telemetry"),
+                             ["first converter", "second converter", "third converter"])
+        self.assertListEqual(trie.match("other/thermostat/telemetry"), [])
+        self.assertEqual(len(trie), 3)
@@ -58,6 +58,44 @@ class JsonMqttUplinkConverterTests(BaseUnitTest):
             self.assertDictEqual(single_data, self._convert_to_dict(item.to_dict().get('telemetry')))
             self.assertDictEqual(single_data, self._convert_to_dict(item.to_dict().get('attributes')))
 
+    def test_batch_result_is_the_same_as_result_of_every_message(self):
+        config = self._get_batch_test_config()
+        messages = [{"name": "Device %i" % (ts % 2), "firmware": "1.%i" % ts, "temperature": ts, "ts": ts}
+                    for ts in range(1, 11)]
+        converter = JsonMqttUplinkConverter(config, logger=self.log)
+        converted_data = converter.convert_batch("sensors", messages[:9] + [[messages[9]]])
+
+        expected_data = [converter.convert("sensors", message) for message in messages[:9]]
+        expected_data.extend(converter.convert("sensors", [messages[9]]))
+        self.assertListEqual([data.to_dict() for data in converted_data], [data.to_dict() for data in expected_data])
+
+    def test_batch_messages_without_timestamp_are_not_merged(self):
+        config = self._get_batch_test_config()
+        messages = [{"name": "Device", "firmware": "1.%i" % number, "temperature": number} for number in range(3)]
+        converter = JsonMqttUplinkConverter(config, logger=self.log)
+        converted_data = converter.convert_batch("sensors", messages)
+
+        self.assertEqual(len(converted_data), 3)
+        self.assertEqual(sum(data.telemetry_datapoints_count for data in converted_data), 3)
+        self.assertListEqual([data.to_dict()["telemetry"][0]["values"] for data in converted_data],
+                             [{"temperature": number} for number in range(3)])
+
+    def _get_batch_test_config(self):
+        return {
+            "topicFilter": "sensors",
+            "converter": {
+                "type": "json",
+                "deviceInfo": {
+                    "deviceNameExpressionSource": "message",
+                    "deviceNameExpression": "${name}",
+                    "deviceProfileExpressionSource": "constant",
+                    "deviceProfileExpression": self.DEVICE_TYPE
+                },
+                "attributes": [{"type": "string", "key": "firmware", "value": "${firmware}"}],
+                "timeseries": [{"type": "int", "key": "temperature", "value": "${temperature}"}]
+            }
+        }
+
     def test_parse_device_name_from_spaced_key_name(self):
         device_key_name = "device name"
 
@@ -0,0 +1,98 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from threading import Event
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.storage.coalescing_index import CoalescingIndex
+from thingsboard_gateway.storage.event_codec import get_event_codec
+from thingsboard_gateway.storage.memory.memory_event_storage import MemoryEventStorage
+
+LOG = getLogger("TEST")
+
+
+class TestCoalescingIndex(TestCase):
+    def setUp(self):
+        self.codec = get_event_codec("json")
+        self.storage = MemoryEventStorage({"read_records_count": 10}, LOG, Event())
+        self.index = CoalescingIndex({"attributes": True, "telemetry_keys": ["state"]}, self.codec, self.storage, LOG)
+
+    def put(self, data, connector_name="Connector"):
+        data = self.index.coalesce(data, connector_name)
+        if data is not None:
+            self.storage.put(self.codec.encode(data))
+
+    def test_only_latest_values_of_coalesced_keys_are_kept(self):
+        for ts in range(1, 101):
+            converted_data = ConvertedData("Device", "default")
+            converted_data.add_to_telemetry({"ts": ts, "values": {"state": "state %i" % ts, "temperature": ts}})
+            converted_data.add_to_attributes("firmware", "1.%i" % ts)
+            self.put(converted_data)
+        self.assertEqual(self.storage.len(), 100)
+        self.assertEqual(self.index.len(), 1)
+
+        event_pack = self.index.get_event_pack()
+        self.assertListEqual([self.codec.decode(event) for event in event_pack], [{
+            "deviceName": "Device",
+            "deviceType": "default",
+            "attributes": {"firmware": "1.100"},
+            "telemetry": [{"ts": 100, "values": {"state": "state 100"}}],
+        }])
+        self.index.event_pack_processing_done()
+
+        stored_event = self.codec.decode(self.index.get_event_pack()[0])
+        self.assertEqual(stored_event["telemetry"], [{"ts": 1, "values": {"temperature": 1}}])
+        self.assertEqual(stored_event["attributes"], {})
+
+    def test_older_sample_does_not_replace_latest_value(self):
+        self.put({"deviceName": "Device", "telemetry": [{"ts": 20, "values": {"state": "new"}}]})
+        self.put({"deviceName": "Device", "telemetry": [{"ts": 10, "values": {"state": "old"}}]})
+        self.assertEqual(self.storage.len(), 0)
+        self.assertEqual(self.codec.decode(self.index.get_event_pack()[0])["telemetry"],
+                         [{"ts": 20, "values": {"state": "new"}}])
+
+    def test_data_of_other_connectors_is_not_coalesced(self):
+        self.index = CoalescingIndex({"connectors": ["Connector"]}, self.codec, self.storage, LOG)
+        self.put({"deviceName": "Device", "attributes": {"firmware": "1.0"}}, connector_name="Other connector")
+        self.assertEqual(self.storage.len(), 1)
+        self.assertEqual(self.index.len(), 0)
+
+    def test_event_pack_is_limited_by_read_records_count(self):
+        self.index = CoalescingIndex({"read_records_count": 2}, self.codec, self.storage, LOG)
+        for device_number in range(5):
+            self.put({"deviceName": "Device %i" % device_number, "attributes": {"firmware": "1.0"}})
+
+        device_names = []
+        for _ in range(3):
+            event_pack = self.index.get_event_pack()
+            self.assertLessEqual(len(event_pack), 2)
+            device_names.extend(self.codec.decode(event)["deviceName"] for event in event_pack)
+            self.index.event_pack_processing_done()
+        self.assertListEqual(device_names, ["Device %i" % device_number for device_number in range(5)])
+        self.assertEqual(self.index.len(), 0)
+
+    def test_metadata_of_latest_data_is_kept(self):
+        for received_ts in (1, 2):
+            self.put({"deviceName": "Device", "attributes": {"firmware": "1.0"},
+                      "metadata": {"connector": "Connector", "receivedTs": received_ts}})
+        self.assertDictEqual(self.codec.decode(self.index.get_event_pack()[0])["metadata"],
+                             {"connector": "Connector", "receivedTs": 2})
+
+    def test_coalesced_values_are_put_into_storage_on_stop(self):
+        self.put({"deviceName": "Device", "attributes": {"firmware": "1.0"}})
+        self.index.stop(self.storage)
+        self.assertEqual(self.index.len(), 0)
+        self.assertEqual(self.codec.decode(self.storage.get_event_pack()[0])["attributes"], {"firmware": "1.0"})
@@ -0,0 +1,86 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.attributes import Attributes
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.data_size import get_entry_sizes, get_key_size, get_value_size
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestDataSize(TestCase):
+    VALUES = [None, True, False, 0, -1, 12345678901234, 2 ** 63 - 1, 0.0, -0.0, 1.5, 0.1, 1e-05, 2.5e-7, 1e16,
+              1.2345678901234568e+18, 123456789.123, float('nan'), float('inf'), "", "text", 'with "quotes"',
+              "back\\slash", "new\nline", "tab\t", "\x00\x1f\x7f", "юнікод", "emoji \U0001F600", " ",
+              [1, "a", None], {"nested": {"a": [1.5]}}]
+
+    def test_value_size_matches_serialization(self):
+        for value in self.VALUES:
+            self.assertEqual(get_value_size(value), TBUtility.get_data_size(value), repr(value))
+
+    def test_entry_sizes(self):
+        entries = {DatapointKey("a"): 1.5, "b": 'say "hi"', 10: None, DatapointKey("d"): {"nested": [1, 2]}}
+        self.assertListEqual(get_entry_sizes(entries),
+                             [TBUtility.get_data_size({key.key if isinstance(key, DatapointKey) else key: value}) - 2
+                              for key, value in entries.items()])
+
+    def test_key_size(self):
+        for key in (DatapointKey("temperature"), "temperature", 'q"uote', 10, None, True):
+            raw_key = key.key if isinstance(key, DatapointKey) else key
+            self.assertEqual(get_key_size(key), TBUtility.get_data_size({raw_key: 0}) - 4, repr(key))
+
+    def test_telemetry_entry_size_is_updated(self):
+        entry = TelemetryEntry({DatapointKey("a"): 1, DatapointKey("b"): "text"}, 1700000000000)
+        self.assertEqual(entry.data_size, TBUtility.get_data_size(entry.to_dict()))
+        entry.update({DatapointKey("b"): 12.5, DatapointKey("c"): None})
+        self.assertEqual(entry.data_size, TBUtility.get_data_size(entry.to_dict()))
+        self.assertEqual(entry.values_size, TBUtility.get_data_size(entry.to_dict()["values"]))
+
+    def test_attributes_size_is_updated(self):
+        attributes = Attributes()
+        self.assertEqual(attributes.data_size, 2)
+        attributes["first"] = 1
+        self.assertEqual(attributes.data_size, TBUtility.get_data_size(attributes.to_dict()))
+        attributes[DatapointKey("model")] = "TH-01"
+        attributes.update({DatapointKey("model"): "TH-02 rev. B", "enabled": True})
+        attributes.update(Attributes({DatapointKey("serial"): 123}))
+        self.assertEqual(attributes.data_size, TBUtility.get_data_size(attributes.to_dict()))
+
+    def test_converted_data_size(self):
+        data = ConvertedData("Device \"1\"", "default")
+        self.assertEqual(data.get_size(), TBUtility.get_data_size(data.to_dict()))
+        data.add_to_attributes(DatapointKey("model"), "TH-01")
+        data.add_to_telemetry(TelemetryEntry({DatapointKey("a"): 1.5}, 1700000000000))
+        data.add_to_telemetry(TelemetryEntry({DatapointKey("b"): [1, 2]}, 1700000000000))
+        data.add_to_telemetry(TelemetryEntry({DatapointKey("a"): "é"}, 1700000001000))
+        self.assertEqual(data.get_size(), TBUtility.get_data_size(data.to_dict()))
+
+    def test_split_to_maximal_size(self):
+        data = ConvertedData("Test Device", "default", metadata={"receivedTs": 1700000000000})
+        data.add_to_attributes({DatapointKey("attribute_%i" % index): "value_%i" % index for index in range(300)})
+        for ts in range(3):
+            data.add_to_telemetry(TelemetryEntry({DatapointKey("key_%i" % index): index * 1.5
+                                                  for index in range(1000)}, 1700000000000 + ts))
+        max_data_size = 4096
+
+        split_data = data.convert_to_objects_with_maximal_size(max_data_size)
+
+        self.assertGreater(len(split_data), 1)
+        for item in split_data:
+            self.assertLessEqual(TBUtility.get_data_size(item.to_dict(True)), max_data_size)
+        self.assertEqual(sum(item.attributes_datapoints_count for item in split_data), 300)
+        self.assertEqual(sum(item.telemetry_datapoints_count for item in split_data), 3000)
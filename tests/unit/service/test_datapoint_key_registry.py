@@ -0,0 +1,94 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from threading import Thread
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.constants import ReportStrategy
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.datapoint_key_registry import DatapointKeyRegistry
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestDatapointKeyRegistry(TestCase):
+    def setUp(self):
+        self.registry = DatapointKeyRegistry()
+        self.device_report_strategy = ReportStrategyConfig({"type": ReportStrategy.ON_RECEIVED.name})
+        self.key_config = {"key": "temperature", "reportStrategy": {"type": "ON_REPORT_PERIOD", "reportPeriod": 1000}}
+
+    def test_keys_are_interned(self):
+        first_key = self.registry.get_datapoint_key("temperature", self.device_report_strategy, {})
+        second_key = self.registry.get_datapoint_key("temperature",
+                                                     ReportStrategyConfig({"type": ReportStrategy.ON_RECEIVED.name}),
+                                                     {})
+        self.assertIs(first_key, second_key)
+        self.assertEqual(first_key, DatapointKey("temperature", self.device_report_strategy))
+        self.assertEqual(hash(first_key), hash(DatapointKey("temperature", self.device_report_strategy)))
+        self.assertIsNot(first_key, self.registry.get_datapoint_key("temperature"))
+        self.assertEqual(len(self.registry), 2)
+
+    def test_key_report_strategy_is_parsed_once(self):
+        first_key = self.registry.get_datapoint_key("temperature", self.device_report_strategy, self.key_config)
+        second_key = self.registry.get_datapoint_key("temperature", self.device_report_strategy, self.key_config)
+        self.assertIs(first_key, second_key)
+        self.assertEqual(first_key.report_strategy.report_strategy, ReportStrategy.ON_REPORT_PERIOD)
+        self.assertIs(self.registry.get_report_strategy(self.key_config["reportStrategy"]),
+                      first_key.report_strategy)
+
+    def test_invalid_key_report_strategy_falls_back_to_device_one(self):
+        datapoint_key = self.registry.get_datapoint_key("temperature", self.device_report_strategy,
+                                                        {"reportStrategy": {"type": "UNKNOWN"}})
+        self.assertIs(datapoint_key.report_strategy, self.device_report_strategy)
+
+    def test_registry_is_cleared_on_overflow(self):
+        self.registry.MAX_KEYS_COUNT = 10
+        for index in range(25):
+            self.registry.get_datapoint_key("key_%i" % index)
+        self.assertLessEqual(len(self.registry), 10)
+        self.assertEqual(self.registry.get_datapoint_key("key_24").key, "key_24")
+
+    def test_parsed_report_strategies_are_cleared_on_overflow(self):
+        self.registry.MAX_KEYS_COUNT = 10
+        for _ in range(25):
+            report_strategy_config = {"type": "ON_REPORT_PERIOD", "reportPeriod": 1000}
+            self.assertEqual(self.registry.get_report_strategy(report_strategy_config).report_period, 1000)
+        self.assertLessEqual(len(self.registry), 10)
+
+    def test_registry_is_not_overflowed_by_several_threads(self):
+        self.registry.MAX_KEYS_COUNT = 100
+        errors = []
+
+        def get_keys(thread_index):
+            try:
+                for index in range(1000):
+                    key = "key_%i_%i" % (thread_index, index)
+                    if self.registry.get_datapoint_key(key).key != key:
+                        errors.append(key)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=get_keys, args=(thread_index,)) for thread_index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertListEqual(errors, [])
+        self.assertLessEqual(len(self.registry), 100)
+
+    def test_utility_uses_shared_registry(self):
+        self.assertIs(TBUtility.convert_key_to_datapoint_key("humidity", None, {}),
+                      TBUtility.convert_key_to_datapoint_key("humidity", None, {}))
+        self.assertIs(TBUtility.convert_key_to_datapoint_key("humidity", None, {}, key_registry=self.registry),
+                      self.registry.get_datapoint_key("humidity"))
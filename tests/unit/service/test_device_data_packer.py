@@ -0,0 +1,111 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from orjson import loads
+
+from simplejson import loads as json_loads
+
+from thingsboard_gateway.gateway.device_data_packer import PROTOBUF_PAYLOAD_TYPE, DeviceDataPacker
+from thingsboard_gateway.gateway.proto.messages_pb2 import GatewayAttributesMsg, GatewayTelemetryMsg, KeyValueType
+
+VALUE_FIELDS = {
+    KeyValueType.BOOLEAN_V: "bool_v",
+    KeyValueType.LONG_V: "long_v",
+    KeyValueType.DOUBLE_V: "double_v",
+    KeyValueType.STRING_V: "string_v",
+    KeyValueType.JSON_V: "json_v",
+}
+
+
+class TestDeviceDataPacker(TestCase):
+    def setUp(self):
+        self.devices_telemetry = {
+            "Device %i" % index: [{"ts": 1700000000000 + index, "values": {"temperature": index, "humidity": 50}}]
+            for index in range(1000)
+        }
+
+    def test_data_of_several_devices_is_sent_in_one_message(self):
+        messages, oversized_devices = DeviceDataPacker(1000000).pack_telemetry(self.devices_telemetry)
+        self.assertEqual(len(messages), 1)
+        self.assertListEqual(oversized_devices, [])
+        self.assertDictEqual(loads(messages[0].payload), self.devices_telemetry)
+        self.assertEqual(messages[0].datapoints, 2000)
+        self.assertListEqual(messages[0].devices, list(self.devices_telemetry))
+
+    def test_messages_are_not_bigger_than_maximal_payload_size(self):
+        max_payload_size = 4096
+        messages, oversized_devices = DeviceDataPacker(max_payload_size).pack_telemetry(self.devices_telemetry)
+        self.assertGreater(len(messages), 1)
+        self.assertListEqual(oversized_devices, [])
+        packed_telemetry = {}
+        for message_number, message in enumerate(messages):
+            self.assertLessEqual(len(message.payload), max_payload_size)
+            if message_number < len(messages) - 1:
+                # The message is closed only when the next device entry does not fit into it
+                self.assertGreater(len(message.payload) + 80, max_payload_size)
+            packed_telemetry.update(loads(message.payload))
+        self.assertDictEqual(packed_telemetry, self.devices_telemetry)
+        self.assertListEqual(list(packed_telemetry), list(self.devices_telemetry))
+
+    def test_messages_are_closed_by_datapoints_limit(self):
+        messages, _ = DeviceDataPacker(1000000, max_datapoints=100).pack_attributes(
+            {"Device %i" % index: {"firmware": "1.0", "model": "A1", "serial": index} for index in range(100)})
+        self.assertEqual(len(messages), 4)
+        self.assertListEqual([message.datapoints for message in messages], [99, 99, 99, 3])
+
+    def test_data_bigger_than_maximal_payload_size_is_sent_separately(self):
+        devices_attributes = {"Small device": {"firmware": "1.0"}, "Big device": {"description": "a" * 1000}}
+        messages, oversized_devices = DeviceDataPacker(512).pack_attributes(devices_attributes)
+        self.assertListEqual(oversized_devices, ["Big device"])
+        self.assertEqual(len(messages), 1)
+        self.assertDictEqual(loads(messages[0].payload), {"Small device": {"firmware": "1.0"}})
+
+    def test_protobuf_messages_are_parsed_by_gateway_schema(self):
+        devices_telemetry = {"Device": [{"ts": 1700000000000, "values": {
+            "temperature": 21.5, "count": -3, "enabled": True, "state": "on", "config": {"mode": 1}}}]}
+        messages, _ = DeviceDataPacker(1000000, payload_type=PROTOBUF_PAYLOAD_TYPE).pack_telemetry(devices_telemetry)
+        gateway_telemetry_msg = GatewayTelemetryMsg()
+        gateway_telemetry_msg.ParseFromString(messages[0].payload)
+        telemetry_msg = gateway_telemetry_msg.msg[0]
+        self.assertEqual(telemetry_msg.deviceName, "Device")
+        ts_kv_list = telemetry_msg.msg.tsKvList[0]
+        self.assertEqual(ts_kv_list.ts, 1700000000000)
+        values = {kv.key: getattr(kv, VALUE_FIELDS[kv.type]) for kv in ts_kv_list.kv}
+        values["config"] = json_loads(values["config"])
+        self.assertDictEqual(values, devices_telemetry["Device"][0]["values"])
+
+        messages, _ = DeviceDataPacker(1000000, payload_type=PROTOBUF_PAYLOAD_TYPE).pack_attributes(
+            {"Device %i" % index: {"firmware": "1.%i" % index} for index in range(3)})
+        gateway_attributes_msg = GatewayAttributesMsg()
+        gateway_attributes_msg.ParseFromString(messages[0].payload)
+        self.assertListEqual([(msg.deviceName, msg.msg.kv[0].string_v) for msg in gateway_attributes_msg.msg],
+                             [("Device %i" % index, "1.%i" % index) for index in range(3)])
+
+    def test_protobuf_data_bigger_than_maximal_payload_size_is_split(self):
+        max_payload_size = 4096
+        devices_telemetry = {"Device": [{"ts": 1700000000000 + ts, "values": {"temperature": ts}}
+                                        for ts in range(1000)]}
+        messages, oversized_devices = DeviceDataPacker(max_payload_size, payload_type=PROTOBUF_PAYLOAD_TYPE)\
+            .pack_telemetry(devices_telemetry)
+        self.assertListEqual(oversized_devices, [])
+        self.assertGreater(len(messages), 1)
+        timestamps = []
+        for message in messages:
+            self.assertLessEqual(len(message.payload), max_payload_size)
+            gateway_telemetry_msg = GatewayTelemetryMsg()
+            gateway_telemetry_msg.ParseFromString(message.payload)
+            timestamps.extend(ts_kv_list.ts for msg in gateway_telemetry_msg.msg for ts_kv_list in msg.msg.tsKvList)
+        self.assertListEqual(timestamps, [1700000000000 + ts for ts in range(1000)])
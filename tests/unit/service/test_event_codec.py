@@ -0,0 +1,155 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from threading import Event
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.storage.event_codec import BinaryEventCodec, JsonEventCodec, ObjectEventCodec, \
+    StoredEvent, get_event_codec, is_binary_event
+from thingsboard_gateway.storage.memory.memory_event_storage import MemoryEventStorage
+from thingsboard_gateway.storage.sqlite.sqlite_event_storage import SQLiteEventStorage
+
+LOG = getLogger("TEST")
+
+
+class TestEventCodec(TestCase):
+    def setUp(self):
+        self.data = ConvertedData("Test Device", "default", metadata={"receivedTs": 1700000000000})
+        self.data.add_to_attributes(DatapointKey("model"), "TH-01")
+        self.data.add_to_attributes("enabled", True)
+        self.data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 21.5,
+                                                   DatapointKey("humidity"): 40,
+                                                   DatapointKey("status"): "OK",
+                                                   DatapointKey("error"): None,
+                                                   DatapointKey("raw"): [1, 2, {"a": 3}]}, 1700000000000))
+        self.data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 22.0}, 1700000001000))
+
+    def test_binary_codec_round_trip(self):
+        codec = BinaryEventCodec()
+        event = codec.encode(self.data)
+        self.assertTrue(is_binary_event(event))
+        self.assertDictEqual(codec.decode(event), self.data.to_dict())
+
+    def test_binary_codec_keeps_metadata_in_debug_mode(self):
+        codec = BinaryEventCodec()
+        decoded = codec.decode(codec.encode(self.data, with_metadata=True))
+        self.assertDictEqual(decoded["metadata"], {"receivedTs": 1700000000000})
+
+    def test_binary_codec_encodes_old_format_dict(self):
+        codec = BinaryEventCodec()
+        data = {"deviceName": "Old Device", "deviceType": "default",
+                "attributes": [{"a": 1}, {"b": "text"}],
+                "telemetry": {"ts": 1700000000000, "values": {"c": 1.5}}}
+        decoded = codec.decode(codec.encode(data))
+        self.assertDictEqual(decoded["attributes"], {"a": 1, "b": "text"})
+        self.assertListEqual(decoded["telemetry"], [{"ts": 1700000000000, "values": {"c": 1.5}}])
+
+    def test_binary_codec_falls_back_to_json_for_unsupported_data(self):
+        codec = BinaryEventCodec()
+        data = {"deviceName": "Old Device", "telemetry": [{"c": 1}], "attributes": {}}
+        event = codec.encode(data)
+        self.assertFalse(is_binary_event(event))
+        self.assertDictEqual(codec.decode(event), data)
+
+    def test_any_codec_decodes_both_formats(self):
+        json_event = JsonEventCodec().encode(self.data)
+        binary_event = BinaryEventCodec().encode(self.data)
+        for codec in (JsonEventCodec(), BinaryEventCodec()):
+            self.assertDictEqual(codec.decode(json_event), codec.decode(binary_event))
+
+    def test_decode_into_pack_groups_by_device(self):
+        codec = get_event_codec("binary")
+        other_device_data = ConvertedData("Other Device")
+        other_device_data.add_to_telemetry(TelemetryEntry({DatapointKey("pressure"): 1.2}, 1700000000000))
+        events = [codec.encode(self.data), JsonEventCodec().encode(other_device_data), codec.encode(self.data)]
+
+        devices_data_in_event_pack = {}
+        telemetry_dp_count = 0
+        for event in events:
+            event_telemetry_dp_count, _ = codec.decode_into_pack(event, devices_data_in_event_pack)
+            telemetry_dp_count += event_telemetry_dp_count
+
+        self.assertSetEqual(set(devices_data_in_event_pack), {"Test Device", "Other Device"})
+        self.assertEqual(len(devices_data_in_event_pack["Test Device"]["telemetry"]), 4)
+        self.assertDictEqual(devices_data_in_event_pack["Test Device"]["attributes"],
+                             {"model": "TH-01", "enabled": True})
+        self.assertEqual(telemetry_dp_count, 13)
+
+    def test_unknown_event_format(self):
+        with self.assertRaises(ValueError):
+            get_event_codec("xml")
+
+    def test_storage_provides_configured_codec(self):
+        storage = MemoryEventStorage({"event_format": "binary"}, LOG, Event())
+        self.assertIsInstance(storage.get_event_codec(), BinaryEventCodec)
+        storage = MemoryEventStorage({}, LOG, Event())
+        self.assertIsInstance(storage.get_event_codec(), JsonEventCodec)
+
+    def test_object_codec_keeps_snapshot_of_converted_data(self):
+        codec = ObjectEventCodec()
+        event = codec.encode(self.data)
+        self.assertIsInstance(event, StoredEvent)
+        self.data.add_to_attributes("changed", "after put")
+        self.data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 30.0}, 1700000002000))
+        self.assertDictEqual(codec.decode(event), self._build_expected_data().to_dict())
+
+    def test_object_codec_decode_into_pack(self):
+        codec = ObjectEventCodec()
+        events = [codec.encode(self.data, with_metadata=True), JsonEventCodec().encode(self.data)]
+
+        devices_data_in_event_pack = {}
+        counts = [codec.decode_into_pack(event, devices_data_in_event_pack) for event in events]
+
+        self.assertListEqual(counts, [(6, 1), (6, 1)])
+        device_telemetry = devices_data_in_event_pack["Test Device"]["telemetry"]
+        self.assertEqual(len(device_telemetry), 4)
+        self.assertDictEqual(device_telemetry[0]["metadata"], {"receivedTs": 1700000000000})
+        self.assertDictEqual(devices_data_in_event_pack["Test Device"]["attributes"],
+                             {"model": "TH-01", "enabled": True})
+
+    def test_object_codec_decode_into_pack_does_not_change_stored_event(self):
+        codec = ObjectEventCodec()
+        event = codec.encode(self.data, with_metadata=True)
+        decoded_data = codec.decode(event)
+
+        codec.decode_into_pack(event, {})
+
+        self.assertTrue(all("metadata" not in item for item in event.telemetry))
+        self.assertDictEqual(codec.decode(event), decoded_data)
+
+    def test_object_format_is_used_only_by_memory_storage(self):
+        storage = MemoryEventStorage({"event_format": "object"}, LOG, Event())
+        self.assertIsInstance(storage.get_event_codec(), ObjectEventCodec)
+        event = storage.get_event_codec().encode(self.data)
+        storage.put(event)
+        self.assertIs(storage.get_event_pack()[0], event)
+
+        self.assertFalse(ObjectEventCodec.persistent)
+        self.assertTrue(SQLiteEventStorage.PERSISTENT)
+
+    def _build_expected_data(self):
+        expected_data = ConvertedData("Test Device", "default")
+        expected_data.add_to_attributes(DatapointKey("model"), "TH-01")
+        expected_data.add_to_attributes("enabled", True)
+        expected_data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 21.5,
+                                                       DatapointKey("humidity"): 40,
+                                                       DatapointKey("status"): "OK",
+                                                       DatapointKey("error"): None,
+                                                       DatapointKey("raw"): [1, 2, {"a": 3}]}, 1700000000000))
+        expected_data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 22.0}, 1700000001000))
+        return expected_data
@@ -0,0 +1,90 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+from time import sleep
+from unittest import TestCase
+
+from thingsboard_gateway.storage.event_codec import get_event_codec
+from thingsboard_gateway.storage.event_compression import EventCompressor, get_event_compressor, \
+    is_compressed_event
+from thingsboard_gateway.storage.file.file_event_storage import FileEventStorage
+from thingsboard_gateway.storage.segmented_log.segmented_log_event_storage import SegmentedLogEventStorage
+from thingsboard_gateway.storage.sqlite.sqlite_event_storage import SQLiteEventStorage
+
+LOG = getLogger("TEST")
+LOG.trace = LOG.debug
+
+EVENT = ('{"deviceName":"Device 1","deviceType":"default","telemetry":[{"ts":1700000000000,'
+         '"values":{"temperature":21.5,"humidity":40}}],"attributes":{}}')
+
+
+class TestEventCompression(TestCase):
+    def test_events_are_compressed_and_restored(self):
+        binary_event = get_event_codec("binary").encode({"deviceName": "Device 1",
+                                                         "telemetry": [{"ts": 1, "values": {"temperature": 1}}]})
+        for compression in ("zlib", "zstd"):
+            compressor = get_event_compressor({"compression": compression}, LOG)
+            compressed_event = compressor.compress(EVENT)
+            self.assertTrue(is_compressed_event(compressed_event))
+            self.assertLess(len(compressed_event), len(EVENT) // 2)
+            self.assertEqual(compressor.decompress(compressed_event), EVENT)
+            self.assertEqual(compressor.decompress(compressor.compress(binary_event)), binary_event)
+
+    def test_events_stored_without_compression_are_readable(self):
+        compressor = get_event_compressor({"compression": "zlib"}, LOG)
+        self.assertListEqual(compressor.decompress_pack([EVENT, compressor.compress(EVENT)]), [EVENT, EVENT])
+        # Compressed events are readable after the compression is disabled
+        self.assertEqual(EventCompressor().decompress(compressor.compress(EVENT)), EVENT)
+
+    def test_unknown_compression_is_rejected(self):
+        with self.assertRaises(ValueError):
+            get_event_compressor({"compression": "unknown"}, LOG)
+
+
+class TestCompressedEventStorages(TestCase):
+    def setUp(self):
+        self.data_folder_path = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.data_folder_path)
+
+    def assert_events_are_restored(self, storage, write_delay=0):
+        events = [EVENT.replace("Device 1", "Device %i" % index) for index in range(10)]
+        for event in events:
+            self.assertTrue(storage.put(event))
+        sleep(write_delay)
+        self.assertListEqual(storage.get_event_pack(), events)
+        storage.event_pack_processing_done()
+        storage.stop()
+
+    def test_file_storage_compresses_events(self):
+        self.assert_events_are_restored(FileEventStorage({"data_folder_path": self.data_folder_path + path.sep,
+                                                          "max_read_records_count": 10,
+                                                          "compression": "zlib"}, LOG, Event()))
+
+    def test_segmented_log_storage_compresses_events(self):
+        self.assert_events_are_restored(SegmentedLogEventStorage({"data_folder_path": self.data_folder_path,
+                                                                  "max_read_records_count": 10,
+                                                                  "compression": "zlib"}, LOG, Event()))
+
+    def test_sqlite_storage_compresses_events(self):
+        data_file_path = path.join(self.data_folder_path, "data.db")
+        self.assert_events_are_restored(SQLiteEventStorage({"data_file_path": data_file_path,
+                                                            "max_read_records_count": 10,
+                                                            "compression": "zlib"}, LOG, Event()), write_delay=1)
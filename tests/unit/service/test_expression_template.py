@@ -0,0 +1,71 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from thingsboard_gateway.tb_utility.expression_template import ExpressionTemplate
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+DATA = {
+    "temperature": 21.5,
+    "humidity": None,
+    "serial number": "SN-1",
+    "device": {"name": "Thermostat", "location": {"floor": 3}},
+    "sensors": [{"value": 10}, {"value": 20}],
+    "enabled": False,
+}
+
+EXPRESSIONS = [
+    "temperature",
+    "${temperature}",
+    "${humidity}",
+    "${missing}",
+    "${serial number}",
+    "${device.name}",
+    "${device.location.floor}",
+    "${sensors[1].value}",
+    "${enabled}",
+    "Device ${device.name} on floor ${device.location.floor}",
+    "${device.name}_${missing}",
+    "${device/name}",
+    "${}",
+]
+
+
+def render_by_tags_replacement(expression, data, value_type, expression_instead_none=False):
+    values = TBUtility.get_values(expression, data, value_type, expression_instead_none=expression_instead_none)
+    values_tags = TBUtility.get_values(expression, data, value_type, get_tag=True)
+    result = expression
+    for (value, value_tag) in zip(values, values_tags):
+        is_valid_value = "${" in expression and "}" in expression
+        result = result.replace('${' + str(value_tag) + '}', str(value)) if is_valid_value else value_tag
+    return result
+
+
+class TestExpressionTemplate(TestCase):
+    def test_rendering_is_same_as_tags_replacement(self):
+        for expression in EXPRESSIONS:
+            template = ExpressionTemplate(expression)
+            for value_type in ("string", "double"):
+                with self.subTest(expression=expression, value_type=value_type):
+                    self.assertEqual(template.render(DATA), render_by_tags_replacement(expression, DATA, value_type))
+            with self.subTest(expression=expression, expression_instead_none=True):
+                self.assertEqual(template.render(DATA, keep_missing_placeholders=True),
+                                 render_by_tags_replacement(expression, DATA, "string", expression_instead_none=True))
+
+    def test_expression_without_placeholders_is_constant(self):
+        self.assertTrue(ExpressionTemplate("temperature").is_constant)
+        self.assertTrue(ExpressionTemplate("${device/name}").is_constant)
+        self.assertFalse(ExpressionTemplate("prefix_${temperature}").is_constant)
+        self.assertEqual(ExpressionTemplate("prefix_${temperature}_suffix").render(DATA), "prefix_21.5_suffix")
@@ -0,0 +1,99 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+from unittest import TestCase
+
+from thingsboard_gateway.storage.hybrid.hybrid_event_storage import HybridEventStorage
+
+LOG = getLogger("TEST")
+
+
+class TestHybridEventStorage(TestCase):
+    def setUp(self):
+        self.data_folder_path = mkdtemp()
+        self.config = {
+            "max_records_count": 20,
+            "read_records_count": 10,
+            "persistent_storage": {
+                "type": "segmented_log",
+                "data_folder_path": self.data_folder_path,
+                "max_segments_count": 3,
+                "max_segment_size_bytes": 1024,
+                "max_read_records_count": 10,
+            },
+        }
+        self.storages = []
+
+    def tearDown(self):
+        for storage in self.storages:
+            storage.stop()
+        rmtree(self.data_folder_path)
+
+    def create_storage(self):
+        storage = HybridEventStorage(self.config, LOG, Event())
+        self.storages.append(storage)
+        return storage
+
+    def read_all(self, storage):
+        events = []
+        while True:
+            batch = storage.get_event_pack()
+            if not batch:
+                return events
+            events.extend(batch)
+            storage.event_pack_processing_done()
+
+    def test_events_are_kept_in_memory_while_ring_is_not_full(self):
+        storage = self.create_storage()
+        for index in range(20):
+            self.assertTrue(storage.put("event %i" % index))
+        self.assertEqual(storage.len(), 20)
+        self.assertEqual(storage._HybridEventStorage__persistent_storage.len(), 0)
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(20)])
+        self.assertEqual(storage.len(), 0)
+
+    def test_oldest_events_are_spilled_and_read_first(self):
+        storage = self.create_storage()
+        for index in range(50):
+            self.assertTrue(storage.put("event %i" % index))
+        self.assertEqual(storage.len(), 50)
+
+        events = storage.get_event_pack()
+        storage.event_pack_processing_done()
+        # Events are put while the spilled ones are read
+        for index in range(50, 60):
+            self.assertTrue(storage.put("event %i" % index))
+        events.extend(self.read_all(storage))
+        self.assertListEqual(events, ["event %i" % index for index in range(60)])
+
+    def test_events_from_memory_are_saved_on_stop(self):
+        storage = self.create_storage()
+        for index in range(30):
+            storage.put("event %i" % index)
+        self.assertListEqual(storage.get_event_pack(), ["event %i" % index for index in range(10)])
+        storage.stop()
+
+        storage = self.create_storage()
+        self.assertEqual(storage.len(), 30)
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(30)])
+
+    def test_event_is_rejected_when_persistent_storage_is_full(self):
+        storage = self.create_storage()
+        results = [storage.put("event %i" % index) for index in range(300)]
+        self.assertFalse(all(results))
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(results.count(True))])
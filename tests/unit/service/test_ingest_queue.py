@@ -0,0 +1,147 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from queue import Empty
+from threading import Thread, current_thread
+from time import sleep
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.ingest_queue import AdaptiveBatchSize, IngestQueue, PartitionedWorkerPool
+
+
+class TestIngestQueue(TestCase):
+    def setUp(self):
+        self.queue = IngestQueue({"maxSize": 10, "highWatermark": 6, "lowWatermark": 2})
+
+    def test_backpressure_is_released_at_low_watermark(self):
+        for item in range(5):
+            self.assertTrue(self.queue.put(item))
+        self.assertFalse(self.queue.is_backpressure_active())
+        self.queue.put(5)
+        self.assertTrue(self.queue.is_backpressure_active())
+
+        self.assertListEqual(self.queue.get_batch(3), [0, 1, 2])
+        self.assertTrue(self.queue.is_backpressure_active())
+        self.assertEqual(self.queue.get_nowait(), 3)
+        self.assertFalse(self.queue.is_backpressure_active())
+
+    def test_items_are_rejected_when_queue_is_full(self):
+        for item in range(10):
+            self.assertTrue(self.queue.put(item))
+        self.assertFalse(self.queue.put(10))
+        self.assertEqual(self.queue.get_statistics()["rejected"], 1)
+        self.assertEqual(self.queue.qsize(), 10)
+
+    def test_several_items_are_put_at_once(self):
+        self.assertEqual(self.queue.put_many(list(range(4))), 4)
+        self.assertFalse(self.queue.is_backpressure_active())
+        self.assertEqual(self.queue.put_many(list(range(4, 12))), 6)
+        self.assertTrue(self.queue.is_backpressure_active())
+        self.assertEqual(self.queue.get_statistics()["rejected"], 2)
+        self.assertListEqual(self.queue.get_batch(20), list(range(10)))
+
+    def test_queue_does_not_grow_over_max_size_with_several_producers(self):
+        def produce():
+            for item in range(1000):
+                self.queue.put(item)
+                self.queue.put_many([item, item])
+
+        producers = [Thread(target=produce) for _ in range(8)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+
+        self.assertEqual(self.queue.qsize(), 10)
+        self.assertEqual(self.queue.get_statistics()["rejected"], 8 * 1000 * 3 - 10)
+
+    def test_queue_is_not_bounded_by_default(self):
+        queue = IngestQueue()
+        self.assertEqual(queue.put_many(list(range(200000))), 200000)
+        self.assertTrue(queue.put(200000))
+        self.assertTrue(queue.is_backpressure_active())
+        self.assertEqual(queue.get_statistics()["rejected"], 0)
+
+    def test_empty_queue(self):
+        self.assertTrue(self.queue.empty())
+        self.assertListEqual(self.queue.get_batch(10), [])
+        with self.assertRaises(Empty):
+            self.queue.get_nowait()
+
+
+class TestAdaptiveBatchSize(TestCase):
+    def test_batch_size_follows_processing_time(self):
+        batch_size = AdaptiveBatchSize({"batchSize": 1000, "minBatchSize": 10, "maxBatchSize": 5000,
+                                        "targetBatchProcessingTimeMs": 100})
+
+        self.assertEqual(batch_size.update(1000, 400, 50000), 500)
+        self.assertEqual(batch_size.update(500, 400, 50000), 250)
+        self.assertEqual(batch_size.update(250, 50, 50000), 350)
+        # The queue is drained, there is no need for larger batches
+        self.assertEqual(batch_size.update(100, 10, 0), 350)
+
+        for _ in range(100):
+            batch_size.update(batch_size.size, 1000, 50000)
+        self.assertEqual(batch_size.size, 10)
+
+
+class TestPartitionedWorkerPool(TestCase):
+    def setUp(self):
+        self.workers = None
+
+    def tearDown(self):
+        if self.workers is not None:
+            self.workers.stop(timeout=5)
+
+    def test_tasks_of_partition_are_processed_in_order_by_one_worker(self):
+        processed_tasks = {}
+
+        def process_task(task):
+            device_name, index = task
+            processed_tasks.setdefault(device_name, []).append((index, current_thread().name))
+            sleep(0.001)
+
+        self.workers = PartitionedWorkerPool(4, process_task, lambda task: task[0], getLogger("TEST"),
+                                             max_worker_queue_size=10)
+        for index in range(50):
+            for device_index in range(8):
+                self.workers.submit(("Device %i" % device_index, index))
+        for _ in range(500):
+            if sum(len(tasks) for tasks in processed_tasks.values()) == 400 and not self.workers.qsize():
+                break
+            sleep(0.01)
+
+        worker_names = set()
+        for device_name, tasks in processed_tasks.items():
+            self.assertListEqual([index for index, _ in tasks], list(range(50)))
+            self.assertEqual(len({worker_name for _, worker_name in tasks}), 1)
+            worker_names.add(tasks[0][1])
+        self.assertEqual(len(processed_tasks), 8)
+        self.assertGreater(len(worker_names), 1)
+
+    def test_submitted_tasks_are_processed_before_workers_are_stopped(self):
+        processed_tasks = []
+
+        def process_task(task):
+            sleep(0.001)
+            processed_tasks.append(task)
+
+        workers = PartitionedWorkerPool(2, process_task, lambda task: task % 2, getLogger("TEST"))
+        for task in range(200):
+            workers.submit(task)
+        workers.stop()
+
+        self.assertListEqual(sorted(processed_tasks), list(range(200)))
+        self.assertEqual(workers.qsize(), 0)
@@ -0,0 +1,86 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase
+
+from jsonpath_rw import parse
+
+from thingsboard_gateway.tb_utility.json_path import JsonPath, get_json_path
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+DATA = {
+    "sensor": {"values": [{"temp": 21.5}, {"temp": None}], "serial": "SN-1"},
+    "field name": {"inner-key": 1},
+    "quoted\"key": 2,
+    "@meta": {"id": 3},
+    "where": "reserved",
+    "list": [[1, 2], [3, 4]],
+    "text": "abc",
+    "number": 5,
+}
+
+SIMPLE_PATHS = [
+    "sensor", "sensor.serial", "sensor.values[0].temp", "sensor.values[1].temp", "sensor.values[-1]",
+    "sensor.values[5].temp", "$", "$.sensor.serial", "$['sensor']", "$[0]", "sensor . values [ 0 ] . temp",
+    '"field name".inner-key', "'field name'.'inner-key'", '"quoted\\"key"', "@meta.id", "'where'", "list[1][0]",
+    "text[1]", "text.length", "number.value", "number[0]", "missing", "missing.key", "sensor[0]", "sensor['serial']",
+    "['sensor'].serial",
+]
+FALLBACK_PATHS = [
+    "sensor.values[*].temp", "sensor.values[0:1]", "sensor..temp", "sensor.*", "sensor.serial,values", "where",
+    "sensor.$", "sensor.[0]", "`this`", "sensor['serial','values']",
+]
+
+
+class TestJsonPath(TestCase):
+    def assert_same_result_as_jsonpath_rw(self, path, data):
+        try:
+            jsonpath_match = parse(path).find(data)
+            expected = jsonpath_match[0].value if jsonpath_match else None
+        except Exception:
+            # TBUtility.get_value gives None on errors of jsonpath_rw
+            expected = None
+        try:
+            actual = JsonPath(path).find_first(data)
+        except Exception:
+            actual = None
+        self.assertEqual(actual, expected)
+
+    def test_simple_paths_are_resolved_without_jsonpath_rw(self):
+        for path in SIMPLE_PATHS:
+            with self.subTest(path=path):
+                self.assertTrue(JsonPath(path).is_simple)
+                self.assert_same_result_as_jsonpath_rw(path, DATA)
+                self.assert_same_result_as_jsonpath_rw(path, [DATA])
+
+    def test_other_paths_are_resolved_by_jsonpath_rw(self):
+        for path in FALLBACK_PATHS:
+            with self.subTest(path=path):
+                try:
+                    self.assertFalse(JsonPath(path).is_simple)
+                except Exception:
+                    # Not parsed by jsonpath_rw
+                    continue
+                self.assert_same_result_as_jsonpath_rw(path, DATA)
+
+    def test_compiled_paths_are_cached(self):
+        self.assertIs(get_json_path("sensor.serial"), get_json_path("sensor.serial"))
+        self.assertEqual(get_json_path.cache_info().maxsize, 10000)
+
+    def test_get_value_resolves_paths(self):
+        self.assertEqual(TBUtility.get_value("${sensor.values[0].temp}", DATA, "double"), 21.5)
+        self.assertEqual(TBUtility.get_value("${field name.inner-key}", DATA), 1)
+        self.assertIsNone(TBUtility.get_value("${sensor.values[1].temp}", DATA))
+        self.assertEqual(TBUtility.get_value("${sensor.unknown}", DATA, expression_instead_none=True),
+                         "${sensor.unknown}")
@@ -0,0 +1,114 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from threading import Event
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.storage.memory.memory_event_storage import MemoryEventStorage
+from thingsboard_gateway.storage.priority_lanes import ATTRIBUTES_LANE, LIVE_LANE, PriorityLanes, get_event_lane
+
+LOG = getLogger("TEST")
+
+
+class PersistentMemoryEventStorage(MemoryEventStorage):
+    PERSISTENT = True
+
+
+class TestPriorityLanes(TestCase):
+    def setUp(self):
+        self.storage = MemoryEventStorage({"read_records_count": 10, "max_records_count": 1000}, LOG, Event())
+        self.config = {
+            "read_records_count": 10,
+            "max_records_count": 20,
+            "live_backlog_threshold": 50,
+            "attributes_weight": 4,
+            "live_weight": 2,
+            "backlog_weight": 1,
+        }
+
+    def read_packs(self, lanes):
+        packs = []
+        while True:
+            pack = lanes.get_event_pack()
+            if not pack:
+                return packs
+            # The pack is returned again until it is processed
+            self.assertListEqual(lanes.get_event_pack(), pack)
+            lanes.event_pack_processing_done()
+            packs.append(pack)
+
+    def test_event_lane_is_detected_by_data(self):
+        converted_data = ConvertedData("Device")
+        converted_data.add_to_attributes("model", "A1")
+        self.assertEqual(get_event_lane(converted_data), ATTRIBUTES_LANE)
+        converted_data.add_to_telemetry({"ts": 1, "values": {"temperature": 1}})
+        self.assertEqual(get_event_lane(converted_data), LIVE_LANE)
+        self.assertEqual(get_event_lane({"deviceName": "Device", "attributes": {"model": "A1"}, "telemetry": []}),
+                         ATTRIBUTES_LANE)
+
+    def test_telemetry_is_put_into_storage_without_backlog(self):
+        lanes = PriorityLanes(self.config, self.storage, LOG)
+        for index in range(10):
+            self.assertTrue(lanes.put("telemetry %i" % index, LIVE_LANE))
+        self.assertEqual(self.storage.len(), 10)
+        self.assertEqual(lanes.len(), 0)
+
+    def test_attributes_are_read_before_backlog(self):
+        for index in range(100):
+            self.storage.put("backlog %i" % index)
+        lanes = PriorityLanes(self.config, self.storage, LOG)
+        for index in range(30):
+            self.assertTrue(lanes.put("attributes %i" % index, ATTRIBUTES_LANE))
+        for index in range(30):
+            self.assertTrue(lanes.put("live %i" % index, LIVE_LANE))
+        # Memory lanes are full, the rest of events is put into the storage
+        self.assertEqual(lanes.len(), 40)
+        self.assertEqual(self.storage.len(), 120)
+
+        packs = self.read_packs(lanes)
+        self.assertListEqual(packs[0], ["attributes %i" % index for index in range(10)])
+        self.assertListEqual(packs[1], ["live %i" % index for index in range(10)])
+        self.assertListEqual(packs[2], ["attributes %i" % index for index in range(10, 20)])
+        first_backlog_pack_index = next(index for index, pack in enumerate(packs) if pack[0].startswith("backlog"))
+        self.assertLess(first_backlog_pack_index, 5)
+        events = [event for pack in packs for event in pack]
+        self.assertEqual(len(events), 160)
+        self.assertListEqual([event for event in events if event.startswith("backlog")],
+                             ["backlog %i" % index for index in range(100)])
+
+    def test_events_from_lanes_are_put_into_storage_on_stop(self):
+        for index in range(100):
+            self.storage.put("backlog %i" % index)
+        lanes = PriorityLanes(self.config, self.storage, LOG)
+        lanes.put("attributes", ATTRIBUTES_LANE)
+        lanes.put("live", LIVE_LANE)
+        lanes.stop()
+        self.assertEqual(lanes.len(), 0)
+        self.assertEqual(self.storage.len(), 102)
+
+    def test_events_are_put_into_persistent_storage(self):
+        storage = PersistentMemoryEventStorage({"read_records_count": 10, "max_records_count": 1000}, LOG, Event())
+        for index in range(100):
+            storage.put("backlog %i" % index)
+        lanes = PriorityLanes(self.config, storage, LOG)
+        lanes.put("attributes", ATTRIBUTES_LANE)
+        lanes.put("live", LIVE_LANE)
+        self.assertEqual(lanes.len(), 0)
+        self.assertEqual(storage.len(), 102)
+
+        lanes = PriorityLanes(dict(self.config, volatile_lanes=True), storage, LOG)
+        lanes.put("attributes", ATTRIBUTES_LANE)
+        self.assertEqual(lanes.len(), 1)
@@ -0,0 +1,136 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from queue import SimpleQueue, Empty
+from threading import Event
+from types import SimpleNamespace
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.gateway.report_strategy.report_schedule import ReportSchedule
+from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
+
+
+class TestReportSchedule(TestCase):
+    def setUp(self):
+        self.schedule = ReportSchedule()
+
+    def test_only_due_keys_are_popped_in_deadline_order(self):
+        self.schedule.schedule((DatapointKey("a"), "Device", "connector"), 300)
+        self.schedule.schedule((DatapointKey("b"), "Device", "connector"), 100)
+        self.schedule.schedule((DatapointKey("c"), "Device", "connector"), 200)
+
+        self.assertListEqual([key[0].key for key in self.schedule.pop_due(250)], ["b", "c"])
+        self.assertListEqual(self.schedule.pop_due(250), [])
+        self.assertEqual(len(self.schedule), 3)
+        self.assertEqual(self.schedule.get_next_deadline(), 300)
+
+    def test_rescheduled_key_is_popped_once(self):
+        key = (DatapointKey("a"), "Device", "connector")
+        self.schedule.schedule(key, 100)
+        self.schedule.schedule(key, 500)
+        self.assertListEqual(self.schedule.pop_due(200), [])
+        self.assertListEqual(self.schedule.pop_due(500), [key])
+
+    def test_removed_keys_are_not_popped(self):
+        first_key = (DatapointKey("a"), "Device", "first")
+        second_key = (DatapointKey("b"), "Device", "second")
+        third_key = (DatapointKey("c"), "Device", "first")
+        for key in (first_key, second_key, third_key):
+            self.schedule.schedule(key, 100)
+
+        self.schedule.remove(second_key)
+        self.schedule.remove_connector("first")
+
+        self.assertListEqual(self.schedule.pop_due(100), [])
+        self.assertEqual(len(self.schedule), 0)
+
+    def test_heap_is_compacted(self):
+        self.schedule.COMPACTION_MIN_HEAP_SIZE = 10
+        keys = [(DatapointKey("key_%i" % index), "Device", "connector") for index in range(100)]
+        for key in keys:
+            self.schedule.schedule(key, 100)
+        for key in keys[:90]:
+            self.schedule.remove(key)
+        self.assertListEqual(self.schedule.pop_due(100), keys[90:])
+
+    def test_popped_keys_are_rescheduled(self):
+        first_key = (DatapointKey("a"), "Device", "connector")
+        second_key = (DatapointKey("b"), "Device", "connector")
+        for key in (first_key, second_key):
+            self.schedule.schedule(key, 100)
+        due_keys = self.schedule.pop_due(100)
+        self.schedule.schedule(first_key, 300)
+
+        self.schedule.reschedule_popped(due_keys, 200)
+
+        self.assertListEqual(self.schedule.pop_due(200), [second_key])
+        self.assertListEqual(self.schedule.pop_due(300), [first_key])
+
+
+class TestReportStrategyServicePeriodicalReporting(TestCase):
+    def setUp(self):
+        self.gateway = SimpleNamespace(stop_event=Event())
+        self.send_data_queue = SimpleQueue()
+        self.service = ReportStrategyService({}, self.gateway, self.send_data_queue, getLogger("TEST"))
+
+    def tearDown(self):
+        self.gateway.stop_event.set()
+
+    def test_key_is_reported_by_period(self):
+        report_strategy = ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 200})
+        data = ConvertedData("Test Device")
+        data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature", report_strategy): 21.5}))
+
+        self.service.filter_data_and_send(data, "connector", "connector_id")
+        self.send_data_queue.get(timeout=1)
+
+        # The reporting thread checks for new keys once a second while it has no keys to report
+        _, _, reported_data = self.send_data_queue.get(timeout=2)
+        self.assertEqual(reported_data.telemetry[0].values[DatapointKey("temperature", report_strategy)], 21.5)
+
+        self.service.delete_all_records_for_connector_by_connector_id_and_connector_name("connector_id",
+                                                                                         "connector")
+        self.gateway.stop_event.wait(0.5)
+        while not self.send_data_queue.empty():
+            self.send_data_queue.get_nowait()
+        with self.assertRaises(Empty):
+            self.send_data_queue.get(timeout=0.5)
+
+    def test_keys_are_reported_after_failed_reporting(self):
+        report_strategy = ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 200})
+        failing_key = DatapointKey("failing", report_strategy)
+        other_key = DatapointKey("other", report_strategy)
+        data = ConvertedData("Test Device")
+        data.add_to_telemetry(TelemetryEntry({failing_key: 1, other_key: 2}))
+        self.service.filter_data_and_send(data, "connector", "connector_id")
+        self.send_data_queue.get(timeout=1)
+
+        # Reporting of the first due key fails, before the other due key is processed
+        failing_record = self.service._report_strategy_data_cache.get(failing_key, "Test Device", "connector_id")
+        failing_record._report_strategy = None
+        self.gateway.stop_event.wait(1.5)
+        failing_record._report_strategy = report_strategy
+
+        reported_keys = set()
+        for _ in range(10):
+            _, _, reported_data = self.send_data_queue.get(timeout=2)
+            reported_keys.update(reported_data.telemetry[0].values)
+            if reported_keys == {failing_key, other_key}:
+                break
+        self.assertSetEqual(reported_keys, {failing_key, other_key})
@@ -0,0 +1,115 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from queue import SimpleQueue, Empty
+from threading import Event
+from types import SimpleNamespace
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import AggregationFunction, ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataRecord
+from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
+
+
+def create_record(aggregation_function, first_value):
+    report_strategy = ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 10000,
+                                            "aggregationFunction": aggregation_function})
+    return ReportStrategyDataRecord(first_value, "Test Device", "default", "connector", "connector_id",
+                                    report_strategy, True)
+
+
+class TestReportStrategyAggregationConfig(TestCase):
+    def test_aggregation_function_is_parsed(self):
+        report_strategy = ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 1000,
+                                                "aggregationFunction": "average"})
+        self.assertEqual(report_strategy.aggregation_function, AggregationFunction.AVERAGE)
+
+    def test_none_aggregation_function_disables_aggregation(self):
+        report_strategy = ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 1000,
+                                                "aggregationFunction": "NONE"})
+        self.assertIsNone(report_strategy.aggregation_function)
+
+    def test_invalid_aggregation_config(self):
+        with self.assertRaises(ValueError):
+            ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 1000, "aggregationFunction": "MEDIAN"})
+        with self.assertRaises(ValueError):
+            ReportStrategyConfig({"type": "ON_CHANGE", "aggregationFunction": "SUM"})
+
+
+class TestReportStrategyDataRecordAggregation(TestCase):
+    def test_aggregation_functions(self):
+        values = [3, 1.5, 7, -2, 4]
+        expected_results = {
+            "SUM": 13.5,
+            "COUNT": 5,
+            "MIN": -2,
+            "MAX": 7,
+            "AVERAGE": 2.7
+        }
+        for aggregation_function, expected_result in expected_results.items():
+            record = create_record(aggregation_function, values[0])
+            for value in values[1:]:
+                record.aggregate(value)
+            self.assertAlmostEqual(record.pop_aggregated_value(), expected_result, msg=aggregation_function)
+
+    def test_window_is_reset_after_report(self):
+        record = create_record("MAX", 10)
+        self.assertEqual(record.pop_aggregated_value(), 10)
+        record.aggregate(5)
+        self.assertEqual(record.pop_aggregated_value(), 5)
+
+    def test_empty_window(self):
+        for aggregation_function, expected_result in (("SUM", 0), ("COUNT", 0), ("MIN", None), ("AVERAGE", None)):
+            record = create_record(aggregation_function, 1)
+            record.pop_aggregated_value()
+            self.assertEqual(record.pop_aggregated_value(), expected_result, msg=aggregation_function)
+
+    def test_non_numeric_values_are_counted_only(self):
+        record = create_record("MAX", "on")
+        record.aggregate(True)
+        self.assertIsNone(record.pop_aggregated_value())
+
+        record = create_record("COUNT", "on")
+        record.aggregate(True)
+        self.assertEqual(record.pop_aggregated_value(), 2)
+
+
+class TestReportStrategyServiceAggregation(TestCase):
+    def setUp(self):
+        self.gateway = SimpleNamespace(stop_event=Event())
+        self.send_data_queue = SimpleQueue()
+        self.service = ReportStrategyService({}, self.gateway, self.send_data_queue, getLogger("TEST"))
+
+    def tearDown(self):
+        self.gateway.stop_event.set()
+
+    def test_only_aggregate_is_reported(self):
+        report_strategy = ReportStrategyConfig({"type": "ON_REPORT_PERIOD", "reportPeriod": 500,
+                                                "aggregationFunction": "MAX"})
+        datapoint_key = DatapointKey("temperature", report_strategy)
+        for value in (21.5, 25.0, 22.0):
+            data = ConvertedData("Test Device")
+            data.add_to_telemetry(TelemetryEntry({datapoint_key: value}))
+            self.service.filter_data_and_send(data, "connector", "connector_id")
+
+        with self.assertRaises(Empty):
+            self.send_data_queue.get(timeout=0.2)
+        # The reporting thread checks for new keys once a second while it has no keys to report
+        _, _, reported_data = self.send_data_queue.get(timeout=2)
+        self.assertEqual(len(reported_data.telemetry), 1)
+        self.assertEqual(reported_data.telemetry[0].values[datapoint_key], 25.0)
@@ -0,0 +1,96 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from time import sleep
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+
+
+class TestReportStrategyDataCache(TestCase):
+    REPORT_STRATEGY = ReportStrategyConfig({"type": "ON_CHANGE"})
+
+    def setUp(self):
+        self.cache = None
+
+    def tearDown(self):
+        if self.cache is not None:
+            self.cache.stop()
+
+    def create_cache(self, config=None):
+        self.cache = ReportStrategyDataCache(config or {}, getLogger("TEST"))
+        return self.cache
+
+    def put(self, key, device_name="Device", connector_id="connector_id", report_strategy=REPORT_STRATEGY):
+        self.cache.put(DatapointKey(key), 1, device_name, "default", "connector", connector_id, report_strategy, True)
+
+    def test_records_of_connector_are_deleted(self):
+        self.create_cache()
+        self.put("first", connector_id="first_connector")
+        self.put("second", connector_id="second_connector")
+
+        self.cache.delete_all_records_for_connector_by_connector_id("first_connector")
+
+        self.assertIsNone(self.cache.get(DatapointKey("first"), "Device", "first_connector"))
+        self.assertIsNotNone(self.cache.get(DatapointKey("second"), "Device", "second_connector"))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_least_recently_updated_records_are_evicted(self):
+        self.create_cache()
+        self.cache._max_records_count = 3
+        for key in ("a", "b", "c"):
+            self.put(key, connector_id=key)
+            # Cache time is updated by the cleanup thread once a second
+            self.cache._ReportStrategyDataCache__data_cache_current_ts += 1
+        self.cache.update_key_value(DatapointKey("a"), "Device", "a", 2)
+
+        self.put("d")
+
+        self.assertIsNone(self.cache.get(DatapointKey("b"), "Device", "b"))
+        for key, connector_id in (("a", "a"), ("c", "c"), ("d", "connector_id")):
+            self.assertIsNotNone(self.cache.get(DatapointKey(key), "Device", connector_id))
+        self.assertEqual(self.cache.get_statistics()["evicted"], 1)
+        self.assertEqual(self.cache.get_statistics()["records"], 3)
+
+    def test_expired_records_are_removed(self):
+        self.create_cache({"reportStrategyDataCacheCleanupInterval": 1})
+        short_ttl_strategy = ReportStrategyConfig({"type": "ON_CHANGE", "ttl": 1})
+        long_ttl_strategy = ReportStrategyConfig({"type": "ON_CHANGE", "ttl": 3600})
+        self.put("short", report_strategy=short_ttl_strategy)
+        self.put("long", report_strategy=long_ttl_strategy)
+
+        sleep(3.5)
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertIsNotNone(self.cache.get(DatapointKey("long"), "Device", "connector_id"))
+        self.assertEqual(self.cache.get_statistics()["expired"], 1)
+
+    def test_records_count_is_kept_on_updates_and_removals(self):
+        self.create_cache()
+        for connector_id in ("first_connector", "second_connector"):
+            for key in ("a", "b", "c"):
+                self.put(key, connector_id=connector_id)
+        # Putting a record with the same key replaces it
+        self.put("a", connector_id="first_connector")
+        self.assertEqual(len(self.cache), 6)
+
+        self.cache.delete_all_records_for_connector_by_connector_id("first_connector")
+        self.assertEqual(len(self.cache), 3)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.put("a")
+        self.assertEqual(self.cache.get_statistics()["records"], 1)
@@ -0,0 +1,111 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from math import sin
+from queue import SimpleQueue
+from threading import Event
+from types import SimpleNamespace
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
+
+
+class TestReportStrategyDeadband(TestCase):
+    def setUp(self):
+        self.gateway = SimpleNamespace(stop_event=Event())
+        self.send_data_queue = SimpleQueue()
+        self.service = ReportStrategyService({}, self.gateway, self.send_data_queue, getLogger("TEST"))
+
+    def tearDown(self):
+        self.gateway.stop_event.set()
+
+    def send_telemetry(self, datapoint_key, values):
+        # Returns the reported points in the order they were sent
+        reported_points = []
+        for ts, value in values:
+            data = ConvertedData("Test Device")
+            data.add_to_telemetry(TelemetryEntry({datapoint_key: value}, ts))
+            self.service.filter_data_and_send(data, "connector", "connector_id")
+            while not self.send_data_queue.empty():
+                _, _, reported_data = self.send_data_queue.get_nowait()
+                for telemetry_entry in reported_data.telemetry:
+                    reported_points.append((telemetry_entry.ts, telemetry_entry.values[datapoint_key]))
+        return reported_points
+
+    def test_invalid_deadband(self):
+        with self.assertRaises(ValueError):
+            ReportStrategyConfig({"type": "DEADBAND"})
+        with self.assertRaises(ValueError):
+            ReportStrategyConfig({"type": "PERCENT_DEADBAND", "deadband": -1})
+
+    def test_absolute_deadband(self):
+        report_strategy = ReportStrategyConfig({"type": "DEADBAND", "deadband": 0.5})
+        datapoint_key = DatapointKey("temperature", report_strategy)
+        values = [(1000, 20.0), (2000, 20.3), (3000, 20.6), (4000, 20.2), (5000, 21.2), (6000, "error")]
+
+        self.assertListEqual(self.send_telemetry(datapoint_key, values),
+                             [(1000, 20.0), (3000, 20.6), (5000, 21.2), (6000, "error")])
+
+    def test_percent_deadband(self):
+        report_strategy = ReportStrategyConfig({"type": "PERCENT_DEADBAND", "deadband": 10})
+        datapoint_key = DatapointKey("pressure", report_strategy)
+        values = [(1000, 100), (2000, 109), (3000, 111), (4000, 101), (5000, 99)]
+
+        self.assertListEqual(self.send_telemetry(datapoint_key, values), [(1000, 100), (3000, 111), (5000, 99)])
+
+    def test_swinging_door_reports_line_breaks(self):
+        report_strategy = ReportStrategyConfig({"type": "SWINGING_DOOR", "deadband": 0.1})
+        datapoint_key = DatapointKey("level", report_strategy)
+        # A ramp up, then a plateau, the last point is held until the next line starts
+        values = [(ts, float(ts // 1000)) for ts in range(0, 10001, 1000)]
+        values += [(ts, 10.0) for ts in range(11000, 20001, 1000)]
+        values.append((21000, 0.0))
+
+        self.assertListEqual(self.send_telemetry(datapoint_key, values),
+                             [(0, 0.0), (10000, 10.0), (20000, 10.0)])
+
+    def test_swinging_door_error_is_bounded(self):
+        deadband = 0.05
+        report_strategy = ReportStrategyConfig({"type": "SWINGING_DOOR", "deadband": deadband})
+        datapoint_key = DatapointKey("signal", report_strategy)
+        values = [(ts, sin(ts / 5000)) for ts in range(0, 100000, 100)]
+        values.append((100000, 100.0))
+
+        reported_points = self.send_telemetry(datapoint_key, values)
+
+        self.assertLess(len(reported_points), len(values) / 10)
+        for (start_ts, start_value), (end_ts, end_value) in zip(reported_points, reported_points[1:]):
+            for ts, value in values:
+                if start_ts < ts < end_ts:
+                    interpolated_value = start_value + (end_value - start_value) * (ts - start_ts) / (end_ts - start_ts)
+                    self.assertLessEqual(abs(interpolated_value - value), deadband + 1e-9)
+
+    def test_deadband_is_applied_to_attributes(self):
+        report_strategy = ReportStrategyConfig({"type": "SWINGING_DOOR", "deadband": 1})
+        datapoint_key = DatapointKey("setpoint", report_strategy)
+        reported_values = []
+        for value in (10, 10.5, 11.5):
+            data = ConvertedData("Test Device")
+            data.add_to_attributes(datapoint_key, value)
+            self.service.filter_data_and_send(data, "connector", "connector_id")
+            while not self.send_data_queue.empty():
+                _, _, reported_data = self.send_data_queue.get_nowait()
+                reported_values.append(reported_data.attributes[datapoint_key])
+
+        self.assertListEqual(reported_values, [10, 11.5])
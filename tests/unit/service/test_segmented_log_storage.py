@@ -0,0 +1,162 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from os import listdir
+from os.path import getsize, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+from unittest import TestCase
+
+from thingsboard_gateway.storage.event_codec import get_event_codec
+from thingsboard_gateway.storage.segmented_log.segmented_log import SEGMENT_FILE_PREFIX
+from thingsboard_gateway.storage.segmented_log.segmented_log_event_storage import SegmentedLogEventStorage
+
+LOG = getLogger("TEST")
+
+
+class TestSegmentedLogEventStorage(TestCase):
+    def setUp(self):
+        self.data_folder_path = mkdtemp()
+        self.config = {
+            "data_folder_path": self.data_folder_path,
+            "max_segments_count": 3,
+            "max_segment_size_bytes": 1024,
+            "max_read_records_count": 10,
+        }
+        self.storages = []
+
+    def tearDown(self):
+        for storage in self.storages:
+            storage.stop()
+        rmtree(self.data_folder_path)
+
+    def create_storage(self):
+        storage = SegmentedLogEventStorage(self.config, LOG, Event())
+        self.storages.append(storage)
+        return storage
+
+    def read_all(self, storage):
+        events = []
+        while True:
+            batch = storage.get_event_pack()
+            if not batch:
+                return events
+            events.extend(batch)
+            storage.event_pack_processing_done()
+
+    def get_segment_files(self):
+        return sorted(file for file in listdir(self.data_folder_path) if file.startswith(SEGMENT_FILE_PREFIX))
+
+    def test_events_are_read_in_order_across_segments(self):
+        storage = self.create_storage()
+        events = ["event %i" % index for index in range(100)]
+        binary_event = get_event_codec("binary").encode({"deviceName": "Device",
+                                                         "telemetry": [{"ts": 1, "values": {"key": 1}}]})
+        for event in events:
+            self.assertTrue(storage.put(event))
+        self.assertTrue(storage.put(binary_event))
+        self.assertGreater(len(self.get_segment_files()), 1)
+        self.assertEqual(storage.len(), 101)
+
+        self.assertListEqual(self.read_all(storage), events + [binary_event])
+        self.assertEqual(storage.len(), 0)
+        # Read segments are deleted, the active one is kept for new events
+        self.assertEqual(len(self.get_segment_files()), 1)
+
+    def test_reading_is_resumed_after_restart(self):
+        storage = self.create_storage()
+        for index in range(30):
+            storage.put("event %i" % index)
+        storage.get_event_pack()
+        storage.event_pack_processing_done()
+        # The batch read but not confirmed before the stop is read again
+        storage.get_event_pack()
+        storage.stop()
+
+        storage = self.create_storage()
+        self.assertEqual(storage.len(), 20)
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(10, 30)])
+
+    def test_next_batches_are_returned_before_first_is_processed(self):
+        storage = self.create_storage()
+        for index in range(40):
+            storage.put("event %i" % index)
+        self.assertListEqual(storage.get_event_pack(), ["event %i" % index for index in range(10)])
+        self.assertListEqual(storage.get_next_event_pack(), ["event %i" % index for index in range(10, 20)])
+        self.assertListEqual(storage.get_next_event_pack(), ["event %i" % index for index in range(20, 30)])
+        storage.event_pack_processing_done()
+        storage.stop()
+
+        # Only the processed batch is confirmed, the batches read ahead are read again
+        storage = self.create_storage()
+        self.assertEqual(storage.len(), 30)
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(10, 40)])
+
+    def test_incomplete_record_is_truncated_on_start(self):
+        storage = self.create_storage()
+        for index in range(5):
+            storage.put("event %i" % index)
+        storage.stop()
+        segment_path = join(self.data_folder_path, self.get_segment_files()[-1])
+        valid_size = getsize(segment_path)
+        # The gateway was stopped while the record was written
+        with open(segment_path, "ab") as segment_file:
+            segment_file.write(b"\x20\x00\x00\x00\x01")
+
+        storage = self.create_storage()
+        self.assertEqual(getsize(segment_path), valid_size)
+        storage.put("event 5")
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(6)])
+
+    def test_records_written_after_checkpoint_are_recovered(self):
+        self.config["fsync_interval_ms"] = 60000
+        storage = self.create_storage()
+        segmented_log = storage._SegmentedLogEventStorage__segmented_log
+        for index in range(5):
+            storage.put("event %i" % index)
+        segmented_log.commit()
+        for index in range(5, 8):
+            storage.put("event %i" % index)
+        # The gateway is stopped after the records were written, but before they were synced
+        segmented_log.commit(sync=False)
+
+        storage = self.create_storage()
+        self.assertEqual(storage.len(), 8)
+        self.assertListEqual(self.read_all(storage), ["event %i" % index for index in range(8)])
+
+    def test_corrupted_record_is_skipped(self):
+        storage = self.create_storage()
+        for index in range(100):
+            storage.put("event %i" % index)
+        storage.stop()
+        first_segment_path = join(self.data_folder_path, self.get_segment_files()[0])
+        with open(first_segment_path, "r+b") as segment_file:
+            segment_file.seek(getsize(first_segment_path) // 2)
+            segment_file.write(b"\xff\xff")
+
+        storage = self.create_storage()
+        events = self.read_all(storage)
+        self.assertEqual(events[0], "event 0")
+        self.assertEqual(events[-1], "event 99")
+        self.assertLess(len(events), 100)
+
+    def test_events_are_rejected_when_segments_count_is_exceeded(self):
+        storage = self.create_storage()
+        results = [storage.put("event %i" % index) for index in range(200)]
+        self.assertFalse(all(results))
+        self.assertEqual(len(self.get_segment_files()), self.config["max_segments_count"])
+        self.assertEqual(len(self.read_all(storage)), results.count(True))
+        self.assertTrue(storage.put("new event"))
@@ -12,9 +12,12 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from contextlib import closing
 from logging import getLogger
 from os import listdir, remove, removedirs, path
 from random import randint
+from sqlite3 import connect
+from tempfile import mkdtemp
 from threading import Event
 from time import sleep
 from unittest import TestCase
@@ -59,6 +62,21 @@ class TestStorage(TestCase):
 
         stop_event.set()
 
+    def test_memory_storage_returns_next_packs_before_first_is_processed(self):
+        storage = MemoryEventStorage({"read_records_count": 10, "max_records_count": 100}, LOG, Event())
+        for test_value in range(40):
+            storage.put(test_value)
+
+        self.assertListEqual(storage.get_event_pack(), list(range(10)))
+        self.assertListEqual(storage.get_next_event_pack(), list(range(10, 20)))
+        self.assertListEqual(storage.get_next_event_pack(), list(range(20, 30)))
+        storage.event_pack_processing_done()
+        # Packs which are not processed are returned again starting from the oldest one
+        self.assertListEqual(storage.get_event_pack(), list(range(10, 20)))
+        self.assertListEqual(storage.get_next_event_pack(), list(range(20, 30)))
+        self.assertListEqual(storage.get_next_event_pack(), list(range(30, 40)))
+        self.assertListEqual(storage.get_next_event_pack(), [])
+
     def test_file_storage(self):
 
         storage_test_config = {
@@ -139,6 +157,96 @@ class TestStorage(TestCase):
 
         stop_event.set()
 
+    def test_sqlite_storage_deletes_acknowledged_rows_in_write_transaction(self):
+        data_folder_path = mkdtemp()
+        storage_test_config = {
+            "data_file_path": path.join(data_folder_path, "data.db"),
+            "max_read_records_count": 10,
+        }
+        stop_event = Event()
+        storage = SQLiteEventStorage(storage_test_config, LOG, stop_event)
+        try:
+            for test_value in range(30):
+                storage.put(str(test_value))
+            sleep(1)
+
+            self.assertListEqual(storage.get_event_pack(), [str(value) for value in range(10)])
+            storage.event_pack_processing_done()
+            # Acknowledged rows are not read again before they are deleted
+            self.assertListEqual(storage.get_event_pack(), [str(value) for value in range(10, 20)])
+            self.assertEqual(storage.len(), 20)
+
+            storage.put("30")
+            sleep(1)
+            with closing(connect(storage_test_config["data_file_path"])) as connection:
+                stored_rows_count = connection.execute("SELECT COUNT(*) FROM messages;").fetchone()[0]
+            self.assertEqual(stored_rows_count, 21)
+        finally:
+            storage.stop()
+            stop_event.set()
+            rmtree(data_folder_path)
+
+    def test_sqlite_storage_reads_ahead_configured_batches_count(self):
+        data_folder_path = mkdtemp()
+        storage_test_config = {
+            "data_file_path": path.join(data_folder_path, "data.db"),
+            "max_read_records_count": 10,
+            "read_ahead_batches_count": 3,
+        }
+        stop_event = Event()
+        storage = SQLiteEventStorage(storage_test_config, LOG, stop_event)
+        try:
+            for test_value in range(100):
+                storage.put(str(test_value))
+            sleep(1)
+            read_ahead_batches = storage._SQLiteEventStorage__read_database._Database__read_ahead_batches
+            self.assertEqual(len(read_ahead_batches), 3)
+
+            result = []
+            for pack_number in range(10):
+                pack = storage.get_event_pack()
+                # The pack is returned again until it is acknowledged
+                self.assertListEqual(storage.get_event_pack(), pack)
+                storage.event_pack_processing_done()
+                result.extend(pack)
+                self.assertEqual(storage.len(), 90 - pack_number * 10)
+                self.assertLessEqual(len(read_ahead_batches), 3)
+            self.assertListEqual(result, [str(value) for value in range(100)])
+        finally:
+            storage.stop()
+            stop_event.set()
+            rmtree(data_folder_path)
+
+    def test_sqlite_storage_returns_next_packs_before_first_is_processed(self):
+        data_folder_path = mkdtemp()
+        storage_test_config = {
+            "data_file_path": path.join(data_folder_path, "data.db"),
+            "max_read_records_count": 10,
+        }
+        stop_event = Event()
+        storage = SQLiteEventStorage(storage_test_config, LOG, stop_event)
+        try:
+            for test_value in range(40):
+                storage.put(str(test_value))
+            sleep(1)
+
+            self.assertListEqual(storage.get_event_pack(), [str(value) for value in range(10)])
+            self.assertListEqual(storage.get_next_event_pack(), [str(value) for value in range(10, 20)])
+            self.assertListEqual(storage.get_next_event_pack(), [str(value) for value in range(20, 30)])
+            storage.event_pack_processing_done()
+            self.assertEqual(storage.len(), 30)
+            # Packs which are not processed are returned again starting from the oldest one
+            self.assertListEqual(storage.get_event_pack(), [str(value) for value in range(10, 20)])
+            self.assertListEqual(storage.get_next_event_pack(), [str(value) for value in range(20, 30)])
+            storage.event_pack_processing_done()
+            storage.event_pack_processing_done()
+            self.assertListEqual(storage.get_event_pack(), [str(value) for value in range(30, 40)])
+            self.assertEqual(storage.len(), 10)
+        finally:
+            storage.stop()
+            stop_event.set()
+            rmtree(data_folder_path)
+
 
 class TestSQLiteEventStorageRotation(TestCase):
 
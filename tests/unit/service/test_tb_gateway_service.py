@@ -0,0 +1,36 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from signal import SIGINT, getsignal, signal
+from unittest import TestCase
+
+from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
+
+
+class TestTBGatewayServiceStop(TestCase):
+    def setUp(self):
+        self.sigint_handler = getsignal(SIGINT)
+
+    def tearDown(self):
+        signal(SIGINT, self.sigint_handler)
+
+    def test_gateway_that_failed_to_start_is_stopped(self):
+        gateway = TBGatewayService.__new__(TBGatewayService)
+        with self.assertRaises(Exception):
+            gateway.__init__("/nonexistent/tb_gateway.json")
+
+        self.assertIsNone(gateway._TBGatewayService__coalescing_index)
+        self.assertIsNone(gateway._TBGatewayService__priority_lanes)
+        gateway._TBGatewayService__stop_gateway()
+        self.assertTrue(gateway.stopped)
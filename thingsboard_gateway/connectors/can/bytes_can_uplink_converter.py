@@ -17,7 +17,7 @@ import struct
 from thingsboard_gateway.connectors.can.can_converter import CanConverter
 from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
-from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.datapoint_key_registry import DatapointKeyRegistry
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
@@ -27,6 +27,7 @@ from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 class BytesCanUplinkConverter(CanConverter):
     def __init__(self, logger):
         self._log = logger
+        self.__key_registry = DatapointKeyRegistry()
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -36,11 +37,8 @@ class BytesCanUplinkConverter(CanConverter):
 
         converted_data = ConvertedData(device_name=device_name, device_type=device_type)
 
-        device_report_strategy = None
-        try:
-            device_report_strategy = ReportStrategyConfig(configs.get(REPORT_STRATEGY_PARAMETER))
-        except ValueError as e:
-            self._log.trace("Report strategy config is not specified for device %s: %s", device_name, e)
+        device_report_strategy = self.__key_registry.get_report_strategy(configs.get(REPORT_STRATEGY_PARAMETER),
+                                                                         self._log, device_name)
 
         for config in configs.get('configs', []):
             try:
@@ -77,7 +75,7 @@ class BytesCanUplinkConverter(CanConverter):
                                                    {"value": value, "can_data": can_data})
 
                 datapoint_key = TBUtility.convert_key_to_datapoint_key(tb_key, device_report_strategy,
-                                                                       configs, self._log)
+                                                                       configs, self._log, self.__key_registry)
                 if tb_item == "attributes":
                     converted_data.add_to_attributes(datapoint_key, value)
                 else:
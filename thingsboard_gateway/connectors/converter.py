@@ -23,3 +23,7 @@ class Converter(ABC):
     @abstractmethod
     def convert(self, config, data) -> Union[dict, ConvertedData]:
         pass
+
+    # A converter may also implement "convert_batch(topic, data_list) -> List[ConvertedData]" to convert several
+    # messages of one topic at once, the MQTT connector uses it instead of "convert" when it is present.
+    # The result is the same as of "convert" called for every message.
@@ -22,7 +22,7 @@ from pymodbus.pdu import ExceptionResponse
 from thingsboard_gateway.connectors.modbus.entities.bytes_uplink_converter_config import BytesUplinkConverterConfig
 from thingsboard_gateway.connectors.modbus.modbus_converter import ModbusConverter
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
-from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.datapoint_key_registry import DatapointKeyRegistry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
@@ -32,6 +32,7 @@ class BytesModbusUplinkConverter(ModbusConverter):
     def __init__(self, config: BytesUplinkConverterConfig, logger):
         self._log = logger
         self.__config = config
+        self.__key_registry = DatapointKeyRegistry()
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -58,7 +59,8 @@ class BytesModbusUplinkConverter(ModbusConverter):
 
                         if decoded_data is not None:
                             datapoint_key = TBUtility.convert_key_to_datapoint_key(config['tag'], device_report_strategy,
-                                                                                   config, self._log)
+                                                                                   config, self._log,
+                                                                                   self.__key_registry)
                             converted_data_append_methods[config_section]({datapoint_key: decoded_data})
 
             self._log.trace("Decoded data: %s", result)
@@ -202,7 +204,4 @@ class BytesModbusUplinkConverter(ModbusConverter):
         return result_data
 
     def _get_device_report_strategy(self, report_strategy, device_name):
-        try:
-            return ReportStrategyConfig(report_strategy)
-        except ValueError as e:
-            self._log.trace("Report strategy config is not specified for device %s: %s", device_name, e)
+        return self.__key_registry.get_report_strategy(report_strategy, self._log, device_name)
@@ -14,7 +14,7 @@
 
 from re import search
 from time import time
-from typing import Dict
+from typing import Dict, List
 
 from simplejson import dumps
 
@@ -23,9 +23,11 @@ from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_PARAMETER, \
     RECEIVED_TS_PARAMETER, CONVERTED_TS_PARAMETER
 from thingsboard_gateway.gateway.entities.attributes import Attributes
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key_registry import DatapointKeyRegistry
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.expression_template import get_expression_template
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
@@ -37,6 +39,7 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
 
     def __init__(self, config, logger):
         self._log = logger
+        self.__key_registry = DatapointKeyRegistry()
         self.__device_report_strategy = None
         try:
             self.__device_report_strategy = ReportStrategyConfig(config.get(REPORT_STRATEGY_PARAMETER))
@@ -44,6 +47,7 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
             pass
         self.__config = config.get('converter')
         self.__use_eval = self.__config.get(self.CONFIGURATION_OPTION_USE_EVAL, False)
+        self.__datatypes_plan = self.__compile_datatypes_plan(self.__config)
 
     @property
     def config(self):
@@ -52,6 +56,24 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
     @config.setter
     def config(self, value):
         self.__config = value
+        self.__datatypes_plan = self.__compile_datatypes_plan(value)
+
+    @staticmethod
+    def __compile_datatypes_plan(config):
+        """
+        Returns (datatype, key config, key template, value template) for every configured key,
+        templates are None for the "*" key config.
+        """
+        datatypes_plan = []
+        for datatype in ("attributes", "timeseries"):
+            for datatype_config in config.get(datatype, []):
+                if isinstance(datatype_config, str) and datatype_config == "*":
+                    datatypes_plan.append((datatype, datatype_config, None, None))
+                else:
+                    datatypes_plan.append((datatype, datatype_config,
+                                           get_expression_template(datatype_config["key"]),
+                                           get_expression_template(datatype_config["value"])))
+        return datatypes_plan
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -59,23 +81,65 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
         StatisticsService.count_connector_message(self._log.name, 'convertersMsgProcessed')
 
         if isinstance(data, list):
-            converted_data_devices: Dict[str, ConvertedData] = {}
-            for item in data:
-                converted_item = self._convert_single_item(topic, item)
-                if converted_item.device_name not in converted_data_devices:
-                    converted_data_devices[converted_item.device_name] = converted_item
-                else:
-                    existing_item = converted_data_devices[converted_item.device_name]
-                    existing_item.extend(converted_item)
+            converted_data_devices = self.__group_by_device(self._convert_single_item(topic, item) for item in data)
             self._log.debug("Converted data for %s devices", len(converted_data_devices))
-            return list(converted_data_devices.values())
+            return converted_data_devices
         else:
             return self._convert_single_item(topic, data)
 
+    def convert_batch(self, topic, data_list) -> List[ConvertedData]:
+        """
+        Converts several messages of the topic, statistics are counted once for all of them.
+        Returns converted data of every message in order, the same as "convert" of every message gives.
+        """
+        CollectStatistics.collect('receivedBytesFromDevices', data_list)
+        StatisticsService.count_connector_message(self._log.name, 'convertersMsgProcessed', count=len(data_list))
+
+        converted_data_list = []
+        attributes_datapoints_count = 0
+        telemetry_datapoints_count = 0
+        for data in data_list:
+            message_converted_data = [self.__convert_item(topic, item)
+                                      for item in (data if isinstance(data, list) else (data,))]
+            for converted_data in message_converted_data:
+                attributes_datapoints_count += converted_data.attributes_datapoints_count
+                telemetry_datapoints_count += converted_data.telemetry_datapoints_count
+            if isinstance(data, list):
+                converted_data_list.extend(self.__group_by_device(message_converted_data))
+            else:
+                converted_data_list.extend(message_converted_data)
+        self._log.debug("Converted %i messages", len(data_list))
+
+        StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced',
+                                                  count=attributes_datapoints_count)
+        StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced',
+                                                  count=telemetry_datapoints_count)
+        CollectStatistics.collect('convertedBytesFromDevice', converted_data_list)
+        return converted_data_list
+
+    @staticmethod
+    def __group_by_device(converted_data_items) -> List[ConvertedData]:
+        converted_data_devices: Dict[str, ConvertedData] = {}
+        for converted_item in converted_data_items:
+            if converted_item.device_name not in converted_data_devices:
+                converted_data_devices[converted_item.device_name] = converted_item
+            else:
+                existing_item = converted_data_devices[converted_item.device_name]
+                existing_item.extend(converted_item)
+        return list(converted_data_devices.values())
+
     def _convert_single_item(self, topic, data):
-        datatypes = {"attributes": "attributes",
-                     "timeseries": "telemetry"}
+        converted_data = self.__convert_item(topic, data)
+
+        self._log.debug("Converted data: %s", converted_data)
+
+        StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced',
+                                                  count=converted_data.attributes_datapoints_count)
+        StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced',
+                                                  count=converted_data.telemetry_datapoints_count)
+        return converted_data
 
+    def __convert_item(self, topic, data) -> ConvertedData:
         device_name = self.parse_device_name(topic, data, self.__config)
 
         converted_data = ConvertedData(device_name=device_name,
@@ -83,59 +147,39 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
                                        metadata={RECEIVED_TS_PARAMETER: int(time() * 1000)})
 
         try:
-            for datatype in datatypes:
-                timestamp = None
-                if self.__config.get(USE_RECEIVED_TS_PARAMETER, False) is True:
-                    timestamp = converted_data.metadata["receivedTs"]
+            use_received_ts = self.__config.get(USE_RECEIVED_TS_PARAMETER, False) is True
+            current_datatype = None
+            timestamp = None
+            for datatype, datatype_config, key_template, value_template in self.__datatypes_plan:
+                # Keys of a datatype are next to each other in the plan, the timestamp is resolved once for them
+                if datatype != current_datatype:
+                    current_datatype = datatype
+                    timestamp = converted_data.metadata["receivedTs"] if use_received_ts else None
+
+                if key_template is None:
+                    if datatype == "attributes":
+                        converted_data.add_to_attributes(Attributes(data))
+                    else:
+                        telemetry_entry = TelemetryEntry(data, timestamp)
+                        converted_data.add_to_telemetry(telemetry_entry)
+                else:
+                    full_key = key_template.render(data)
+                    full_value = value_template.render(data)
 
-                for datatype_config in self.__config.get(datatype, []):
-                    if isinstance(datatype_config, str) and datatype_config == "*":
+                    if full_key != 'None' and full_value != 'None':
+                        converted_key = TBUtility.convert_key_to_datapoint_key(full_key, self.__device_report_strategy, datatype_config, self._log, self.__key_registry)
+                        converted_value = TBUtility.convert_data_type(full_value, datatype_config["type"], self.__use_eval)
                         if datatype == "attributes":
-                            converted_data.add_to_attributes(Attributes(data))
+                            converted_data.add_to_attributes(converted_key, converted_value)
                         else:
-                            telemetry_entry = TelemetryEntry(data, timestamp)
+                            if timestamp is None:
+                                timestamp = TBUtility.resolve_different_ts_formats(data=data, config=datatype_config, logger=self._log)
+                            telemetry_entry = TelemetryEntry({converted_key: converted_value}, timestamp)
                             converted_data.add_to_telemetry(telemetry_entry)
-                    else:
-                        values = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                      expression_instead_none=False)
-                        values_tags = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                           get_tag=True)
-
-                        keys = TBUtility.get_values(datatype_config["key"], data, datatype_config["type"],
-                                                    expression_instead_none=False)
-                        keys_tags = TBUtility.get_values(datatype_config["key"], data, get_tag=True)
-
-                        full_key = datatype_config["key"]
-                        for (key, key_tag) in zip(keys, keys_tags):
-                            is_valid_key = "${" in datatype_config["key"] and "}" in datatype_config["key"]
-                            full_key = full_key.replace('${' + str(key_tag) + '}', str(key)) if is_valid_key else key_tag
-
-                        full_value = datatype_config["value"]
-                        for (value, value_tag) in zip(values, values_tags):
-                            is_valid_value = "${" in datatype_config["value"] and "}" in datatype_config["value"]
-                            full_value = full_value.replace('${' + str(value_tag) + '}', str(value)) if is_valid_value else value
-
-                        if full_key != 'None' and full_value != 'None':
-                            converted_key = TBUtility.convert_key_to_datapoint_key(full_key, self.__device_report_strategy, datatype_config, self._log)
-                            converted_value = TBUtility.convert_data_type(full_value, datatype_config["type"], self.__use_eval)
-                            if datatype == "attributes":
-                                converted_data.add_to_attributes(converted_key, converted_value)
-                            else:
-                                if timestamp is None:
-                                    timestamp = TBUtility.resolve_different_ts_formats(data=data, config=datatype_config, logger=self._log)
-                                telemetry_entry = TelemetryEntry({converted_key: converted_value}, timestamp)
-                                converted_data.add_to_telemetry(telemetry_entry)
         except Exception as e:
             self._log.error('Error in converter, for config: \n%s\n and message: \n%s\n %s', dumps(self.__config),
                             str(data), e)
             StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
-
-        self._log.debug("Converted data: %s", converted_data)
-
-        StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced',
-                                                  count=converted_data.attributes_datapoints_count)
-        StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced',
-                                                  count=converted_data.telemetry_datapoints_count)
         return converted_data
 
     @staticmethod
@@ -160,14 +204,7 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
 
         try:
             if device_info.get(expression_source) == 'message' or device_info.get(expression_source) == 'constant':
-                result_tags = TBUtility.get_values(expression, data, get_tag=True)
-                result_values = TBUtility.get_values(expression, data, expression_instead_none=True)
-
-                result = expression
-                for (result_tag, result_value) in zip(result_tags, result_values):
-                    is_valid_key = "${" in expression and "}" in expression
-                    result = result.replace('${' + str(result_tag) + '}',
-                                            str(result_value)) if is_valid_key else result_tag
+                result = get_expression_template(expression).render(data, keep_missing_placeholders=True)
             elif device_info.get(expression_source) == 'topic':
                 search_result = search(expression, topic)
                 if search_result is not None:
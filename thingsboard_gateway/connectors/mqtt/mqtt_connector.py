@@ -12,12 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-import random
 import socket
 import ssl
-import string
-from queue import Queue, Empty
-from re import fullmatch, match, search
+from os import cpu_count
+from queue import Queue, Empty, Full
+from re import match, search
 from threading import Thread, Event
 from time import sleep, time
 from typing import List, Union
@@ -28,9 +27,11 @@ from thingsboard_gateway.connectors.mqtt.backward_compatibility_adapter import B
 from thingsboard_gateway.gateway.constant_enums import Status
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.connectors.mqtt.mqtt_decorators import CustomCollectStatistics
+from thingsboard_gateway.connectors.mqtt.topic_trie import TopicTrie
 from thingsboard_gateway.gateway.constants import DATA_RETRIEVING_STARTED, CONVERTED_TS_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.decorators import CollectAllReceivedBytesStatistics
+from thingsboard_gateway.tb_utility.expression_template import get_expression_template
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
@@ -47,6 +48,9 @@ except ImportError:
 
 from paho.mqtt.client import MQTTv31, MQTTv311, MQTTv5
 
+# Blocking queue reads wake up with this period only to check if the connector is stopped
+QUEUE_WAIT_TIMEOUT = 1.0
+
 
 MQTT_VERSIONS = {
     3: MQTTv31,
@@ -190,9 +194,11 @@ class MqttConnector(Connector, Thread):
 
         # Setup topic substitution lists for each class of handlers ----------------------------------------------------
         self.__mapping_sub_topics = {}
-        self.__connect_requests_sub_topics = {}
-        self.__disconnect_requests_sub_topics = {}
-        self.__attribute_requests_sub_topics = {}
+        # Topic tries are built on connect, they match topics of incoming messages with handlers of every class
+        self.__mapping_topic_trie = TopicTrie()
+        self.__connect_requests_topic_trie = TopicTrie()
+        self.__disconnect_requests_topic_trie = TopicTrie()
+        self.__attribute_requests_topic_trie = TopicTrie()
 
         # Set up external MQTT broker connection -----------------------------------------------------------------------
         client_id = self.__broker.get("clientId", ''.join(random.choice(string.ascii_lowercase) for _ in range(23)))
@@ -258,12 +264,23 @@ class MqttConnector(Connector, Thread):
         self._client.on_disconnect = self._on_disconnect
         # self._client.on_log = self._on_log
 
-        self.__msg_queue = Queue(self.__broker.get('maxMessageQueue', 1000000000))
-        self.__workers_thread_pool = []
-        self.__max_msg_number_for_worker = self.__broker.get('maxMessageNumberPerWorker', 10)
-        self.__max_number_of_workers = self.__broker.get('maxNumberOfWorkers', 100)
-
-        self._on_message_queue = Queue(self.__broker.get('maxProcessingMessageQueue', 1000000000))
+        # Messages of a device are always converted by the same worker, so they are sent in the order of receiving
+        if 'maxMessageNumberPerWorker' in self.__broker:
+            self.__log.warning('"maxMessageNumberPerWorker" is not used anymore, the connector has a fixed number '
+                               'of workers, set by "numberOfWorkers"')
+        max_number_of_workers = max(1, self.__broker.get('maxNumberOfWorkers', 100))
+        number_of_workers = self.__broker.get('numberOfWorkers', min(max_number_of_workers, cpu_count() or 1))
+        number_of_workers = max(1, min(number_of_workers, max_number_of_workers))
+        # Queues are bounded, so when the storage applies backpressure and the workers pause, receiving of messages
+        # is paused too and the broker stops getting acknowledgements instead of the backlog growing in memory
+        worker_queue_size = max(1, self.__broker.get('maxMessageQueue', 100000) // number_of_workers)
+        self.__workers_thread_pool = [
+            MqttConnector.ConverterWorker("Worker %i" % worker_number, Queue(worker_queue_size),
+                                          self._save_converted_msgs, self.__log,
+                                          is_backpressure_active=self.__gateway.is_storage_backpressure_active)
+            for worker_number in range(number_of_workers)]
+
+        self._on_message_queue = Queue(self.__broker.get('maxProcessingMessageQueue', 10000))
         self._on_message_thread = Thread(name='On Message', target=self._process_on_message, daemon=True)
         self._on_message_thread.start()
 
@@ -332,6 +349,9 @@ class MqttConnector(Connector, Thread):
         self.start()
 
     def run(self):
+        for worker in self.__workers_thread_pool:
+            worker.start()
+
         try:
             self.__connect()
         except Exception as e:
@@ -342,8 +362,6 @@ class MqttConnector(Connector, Thread):
                 if not self._connected:
                     self.__connect()
 
-                self.__threads_manager()
-
                 self.__stop_event.wait(timeout=0.2)
             except TimeoutError:
                 pass
@@ -415,7 +433,8 @@ class MqttConnector(Connector, Thread):
                              str(flags),
                              extra_params)
 
-            self.__mapping_sub_topics = {}
+            mapping_sub_topics = {}
+            mapping_topic_trie = TopicTrie()
 
             # Setup data upload requests handling ----------------------------------------------------------------------
             for mapping in self.__mapping:
@@ -474,10 +493,11 @@ class MqttConnector(Connector, Thread):
                         regex_topic = TBUtility.topic_to_regex(regex_topic)
 
                     # There may be more than one converter per topic, so I'm using vectors
-                    if not self.__mapping_sub_topics.get(regex_topic):
-                        self.__mapping_sub_topics[regex_topic] = []
+                    if not mapping_sub_topics.get(regex_topic):
+                        mapping_sub_topics[regex_topic] = []
 
-                    self.__mapping_sub_topics[regex_topic].append(converter)
+                    mapping_sub_topics[regex_topic].append(converter)
+                    mapping_topic_trie.add(mapping["topicFilter"], converter)
 
                     # Subscribe to appropriate topic -------------------------------------------------------------------
                     self.__subscribe(mapping["topicFilter"], mapping.get("subscriptionQos", 1))
@@ -489,26 +509,17 @@ class MqttConnector(Connector, Thread):
                 except Exception as e:
                     self.__log.exception(e)
 
+            self.__mapping_sub_topics = mapping_sub_topics
+            self.__mapping_topic_trie = mapping_topic_trie
+
             # Setup connection requests handling -----------------------------------------------------------------------
-            for request in [entry for entry in self.__connect_requests if entry is not None]:
-                # requests are guaranteed to have topicFilter field. See __init__
-                self.__subscribe(request["topicFilter"], request.get("subscriptionQos", 1))
-                topic_filter = TBUtility.topic_to_regex(request.get("topicFilter"))
-                self.__connect_requests_sub_topics[topic_filter] = request
+            self.__connect_requests_topic_trie = self.__subscribe_requests(self.__connect_requests)
 
             # Setup disconnection requests handling --------------------------------------------------------------------
-            for request in [entry for entry in self.__disconnect_requests if entry is not None]:
-                # requests are guaranteed to have topicFilter field. See __init__
-                self.__subscribe(request["topicFilter"], request.get("subscriptionQos", 1))
-                topic_filter = TBUtility.topic_to_regex(request.get("topicFilter"))
-                self.__disconnect_requests_sub_topics[topic_filter] = request
+            self.__disconnect_requests_topic_trie = self.__subscribe_requests(self.__disconnect_requests)
 
             # Setup attributes requests handling -----------------------------------------------------------------------
-            for request in [entry for entry in self.__attribute_requests if entry is not None]:
-                # requests are guaranteed to have topicFilter field. See __init__
-                self.__subscribe(request["topicFilter"], request.get("subscriptionQos", 1))
-                topic_filter = TBUtility.topic_to_regex(request.get("topicFilter"))
-                self.__attribute_requests_sub_topics[topic_filter] = request
+            self.__attribute_requests_topic_trie = self.__subscribe_requests(self.__attribute_requests)
         else:
             result_codes = RESULT_CODES_V5 if self._mqtt_version == 5 else RESULT_CODES_V3
             rc = result_code.value if self._mqtt_version == 5 else result_code
@@ -517,6 +528,18 @@ class MqttConnector(Connector, Thread):
             else:
                 self.__log.error("%s connection FAIL with unknown error!", self.get_name())
 
+    def __subscribe_requests(self, requests) -> TopicTrie:
+        topic_trie = TopicTrie()
+        # Requests with the same topic filter replace each other
+        requests_by_topic_filter = {}
+        for request in [entry for entry in requests if entry is not None]:
+            # requests are guaranteed to have topicFilter field. See __init__
+            self.__subscribe(request["topicFilter"], request.get("subscriptionQos", 1))
+            requests_by_topic_filter[request["topicFilter"]] = request
+        for topic_filter, request in requests_by_topic_filter.items():
+            topic_trie.add(topic_filter, request)
+        return topic_trie
+
     def _on_disconnect(self, *args):
         self._connected = False
         self.__log.debug('"%s" was disconnected. %s', self.get_name(), str(args))
@@ -543,44 +566,68 @@ class MqttConnector(Connector, Thread):
             del self.__subscribes_sent[mid]
 
     def put_data_to_convert(self, converter, message, content) -> bool:
-        if not self.__msg_queue.full():
-            if not hasattr(converter, 'SUPPORTS_BYTES_PAYLOAD'):
-                content = TBUtility.decode(content)
-            self.__msg_queue.put((converter.convert, message.topic, content), True, 100)
-            return True
+        if not hasattr(converter, 'SUPPORTS_BYTES_PAYLOAD'):
+            content = TBUtility.decode(content)
+        partition_key = self._get_partition_key(converter, message.topic, content)
+        worker_queue = self.__workers_thread_pool[hash(partition_key) % len(self.__workers_thread_pool)].queue
+        # Waits while the worker queue is full, processing of the next messages waits too
+        return self.__put_until_stopped(worker_queue, (converter, message.topic, content))
+
+    def __put_until_stopped(self, queue: Queue, item) -> bool:
+        while not self.__stopped:
+            try:
+                queue.put(item, timeout=QUEUE_WAIT_TIMEOUT)
+                return True
+            except Full:
+                continue
         return False
 
-    def _save_converted_msg(self, topic, data):
-        data.add_to_metadata({DATA_RETRIEVING_STARTED: int(time() * 1000)})
-        if self.__gateway.send_to_storage(self.name, self.get_id(), data) == Status.SUCCESS:
-            StatisticsService.count_connector_message(self.name, stat_parameter_name='storageMsgPushed')
-            self.statistics['MessagesSent'] += 1
-            self.__log.debug("Successfully converted message from topic %s", topic)
-
-    def __threads_manager(self):
-        if len(self.__workers_thread_pool) == 0:
-            worker = MqttConnector.ConverterWorker("Main Worker", self.__msg_queue, self._save_converted_msg)
-            self.__workers_thread_pool.append(worker)
-            worker.start()
-
-        number_of_needed_threads = round(self.__msg_queue.qsize() / self.__max_msg_number_for_worker, 0)
-        threads_count = len(self.__workers_thread_pool)
-        if number_of_needed_threads > threads_count < self.__max_number_of_workers:
-            thread = MqttConnector.ConverterWorker(
-                "Worker " + ''.join(random.choice(string.ascii_lowercase) for _ in range(5)), self.__msg_queue,
-                self._save_converted_msg)
-            self.__workers_thread_pool.append(thread)
-            thread.start()
-        elif number_of_needed_threads < threads_count and threads_count > 1:
-            worker: MqttConnector.ConverterWorker = self.__workers_thread_pool[-1]
-            worker.stopped = True
-            self.__workers_thread_pool.remove(worker)
+    @staticmethod
+    def _get_partition_key(converter, topic, content):
+        """
+        Returns the name of the device the message belongs to, if the converter configuration allows to find it
+        before the conversion, otherwise the topic. The device name is found the same way as the JSON converter
+        does, so a device publishing to several topics has all its messages converted by one worker.
+        """
+        converter_config = getattr(converter, 'config', None)
+        device_info = converter_config.get('deviceInfo') if isinstance(converter_config, dict) else None
+        if not device_info:
+            return topic
+        expression_source = device_info.get('deviceNameExpressionSource')
+        expression = device_info.get('deviceNameExpression')
+        if expression is None:
+            return topic
+        if expression_source == 'constant':
+            return expression
+        if expression_source == 'topic':
+            device_name_match = search(expression, topic)
+            return device_name_match.group(0) if device_name_match is not None else expression
+        if expression_source == 'message' and isinstance(content, dict):
+            return get_expression_template(expression).render(content, keep_missing_placeholders=True)
+        return topic
+
+    def _save_converted_msgs(self, data_list: List[ConvertedData]):
+        data_retrieving_started = {DATA_RETRIEVING_STARTED: int(time() * 1000)}
+        for data in data_list:
+            data.add_to_metadata(data_retrieving_started)
+        status = self.__gateway.send_to_storage_many(self.name, self.get_id(), data_list)
+        if status in (Status.SUCCESS, Status.BACKPRESSURE):
+            StatisticsService.count_connector_message(self.name, stat_parameter_name='storageMsgPushed',
+                                                      count=len(data_list))
+            self.statistics['MessagesSent'] += len(data_list)
+            self.__log.debug("Successfully converted data of %i devices", len(data_list))
+        else:
+            # Dropped items are counted in the "storageMsgDropped" statistic by the gateway
+            self.__log.error("Failed to put converted data of %i devices to storage, status: %s",
+                             len(data_list), status)
 
     def _on_message(self, client, userdata, message):
         StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
         StatisticsService.count_connector_bytes(self.name, message.payload,
                                                 stat_parameter_name='connectorBytesReceived')
-        self._on_message_queue.put((client, userdata, message))
+        # Called by the network loop of the client, while the queue is full the client does not read
+        # and acknowledge next messages
+        self.__put_until_stopped(self._on_message_queue, (client, userdata, message))
 
     @staticmethod
     def _parse_device_info(device_info, topic, content):
@@ -613,181 +660,173 @@ class MqttConnector(Connector, Thread):
 
     def _process_on_message(self):
         while not self.__stopped:
-            if not self._on_message_queue.empty():
-                client, userdata, message = self._on_message_queue.get_nowait()
-
-                self.statistics['MessagesReceived'] += 1
-                content = None
-
-                # Check if message topic exists in mappings "i.e., I'm posting telemetry/attributes" -------------------
-                topic_handlers = [regex for regex in self.__mapping_sub_topics if fullmatch(regex, message.topic)]
-
-                if topic_handlers:
-                    # Note: every topic may be associated to one or more converter.
-                    # This means that a single MQTT message
-                    # may produce more than one message towards ThingsBoard. This also means that I cannot return after
-                    # the first successful conversion: I got to use all the available ones.
-                    # I will use a flag to understand whether at least one converter succeeded
-                    request_handled = False
-
-                    for topic in topic_handlers:
-                        available_converters = self.__mapping_sub_topics[topic]
-                        for converter in available_converters:
-                            try:
-                                request_handled = self.put_data_to_convert(converter, message, message.payload)
-                            except Exception as e:
-                                self.__log.exception(e)
-
-                    if not request_handled:
-                        self.__log.error('Cannot find converter for the topic:"%s"! Client: %s, User data: %s',
-                                         message.topic,
-                                         str(client),
-                                         str(userdata))
-
-                    # Note: if I'm in this branch, this was for sure a telemetry/attribute push message
-                    # => Execution must end here both in case of failure and success
-                    continue
+            # Storage backpressure is applied by the converter workers, so requests which do not go to storage
+            # (RPC responses, connect, disconnect and attribute requests) are processed without delay
+            # until the queues of the workers are full
+            try:
+                client, userdata, message = self._on_message_queue.get(timeout=QUEUE_WAIT_TIMEOUT)
+            except Empty:
+                continue
 
-                # Check if message topic exists in connection handlers "i.e., I'm connecting a device" -----------------
-                topic_handlers = [regex for regex in self.__connect_requests_sub_topics if
-                                  fullmatch(regex, message.topic)]
+            self.statistics['MessagesReceived'] += 1
+            content = None
 
-                if topic_handlers:
-                    if content is None:
-                        content = TBUtility.decode(message)
-                    for topic in topic_handlers:
-                        handler = self.__connect_requests_sub_topics[topic]
+            # Check if message topic exists in mappings "i.e., I'm posting telemetry/attributes" -------------------
+            available_converters = self.__mapping_topic_trie.match(message.topic)
 
-                        # Get device name, either from topic or from content
-                        device_info = handler.get("deviceInfo", {})
+            if available_converters:
+                # Note: every topic may be associated to one or more converter.
+                # This means that a single MQTT message
+                # may produce more than one message towards ThingsBoard. This also means that I cannot return after
+                # the first successful conversion: I got to use all the available ones.
+                # I will use a flag to understand whether at least one converter succeeded
+                request_handled = False
 
-                        found_device_name, found_device_type = MqttConnector._parse_device_info(device_info,
-                                                                                                message.topic, content)
+                for converter in available_converters:
+                    try:
+                        request_handled = self.put_data_to_convert(converter, message, message.payload)
+                    except Exception as e:
+                        self.__log.exception(e)
 
-                        if found_device_name is None:
-                            self.__log.error("Device name missing from connection request")
-                            continue
+                if not request_handled:
+                    self.__log.error('Cannot find converter for the topic:"%s"! Client: %s, User data: %s',
+                                     message.topic,
+                                     str(client),
+                                     str(userdata))
 
-                        # Note: device must be added even if it is already known locally: else ThingsBoard
-                        # will not send RPCs and attribute updates
-                        self.__log.info("Connecting device %s of type %s", found_device_name, found_device_type)
-                        self.__gateway.add_device(found_device_name, {"connector": self}, device_type=found_device_type)
+                # Note: if I'm in this branch, this was for sure a telemetry/attribute push message
+                # => Execution must end here both in case of failure and success
+                continue
 
-                    # Note: if I'm in this branch, this was for sure a connection message
-                    # => Execution must end here both in case of failure and success
-                    continue
+            # Check if message topic exists in connection handlers "i.e., I'm connecting a device" -----------------
+            handlers = self.__connect_requests_topic_trie.match(message.topic)
 
-                # Check if message topic exists in disconnection handlers "i.e., I'm disconnecting a device" -----------
-                topic_handlers = [regex for regex in self.__disconnect_requests_sub_topics if
-                                  fullmatch(regex, message.topic)]
-                if topic_handlers:
-                    if content is None:
-                        content = TBUtility.decode(message)
-                    for topic in topic_handlers:
-                        handler = self.__disconnect_requests_sub_topics[topic]
+            if handlers:
+                if content is None:
+                    content = TBUtility.decode(message)
+                for handler in handlers:
+                    # Get device name, either from topic or from content
+                    device_info = handler.get("deviceInfo", {})
+
+                    found_device_name, found_device_type = MqttConnector._parse_device_info(device_info,
+                                                                                            message.topic, content)
+
+                    if found_device_name is None:
+                        self.__log.error("Device name missing from connection request")
+                        continue
+
+                    # Note: device must be added even if it is already known locally: else ThingsBoard
+                    # will not send RPCs and attribute updates
+                    self.__log.info("Connecting device %s of type %s", found_device_name, found_device_type)
+                    self.__gateway.add_device(found_device_name, {"connector": self}, device_type=found_device_type)
+
+                # Note: if I'm in this branch, this was for sure a connection message
+                # => Execution must end here both in case of failure and success
+                continue
+
+            # Check if message topic exists in disconnection handlers "i.e., I'm disconnecting a device" -----------
+            handlers = self.__disconnect_requests_topic_trie.match(message.topic)
+            if handlers:
+                if content is None:
+                    content = TBUtility.decode(message)
+                for handler in handlers:
+                    # Get device name, either from topic or from content
+                    device_info = handler.get("deviceInfo", {})
+                    found_device_name, found_device_type = MqttConnector._parse_device_info(device_info,
+                                                                                            message.topic, content)
+
+                    if found_device_name is None:
+                        self.__log.error("Device name missing from disconnection request")
+                        continue
+
+                    if found_device_name in self.__gateway.get_devices():
+                        self.__log.info("Disconnecting device %s of type %s", found_device_name, found_device_type)
+                        self.__gateway.del_device(found_device_name)
+                    else:
+                        self.__log.info("Device %s was not connected", found_device_name)
+
+                    break
+
+                # Note: if I'm in this branch, this was for sure a disconnection message
+                # => Execution must end here both in case of failure and success
+                continue
+
+            # Check if message topic exists in attribute request handlers "i.e., I'm asking for a shared attribute"
+            handlers = self.__attribute_requests_topic_trie.match(message.topic)
+            if handlers:
+                if content is None:
+                    content = TBUtility.decode(message)
+                try:
+                    for handler in handlers:
+                        found_attribute_names = None
 
                         # Get device name, either from topic or from content
                         device_info = handler.get("deviceInfo", {})
-                        found_device_name, found_device_type = MqttConnector._parse_device_info(device_info,
-                                                                                                message.topic, content)
+                        found_device_name, _ = MqttConnector._parse_device_info(device_info, message.topic, content)
+
+                        # Get attribute name, either from topic or from content
+                        if handler.get("attributeNameExpressionSource") == "topic":
+                            attribute_name_match = search(handler["attributeNameExpression"], message.topic)
+                            if attribute_name_match is not None:
+                                found_attribute_names = attribute_name_match.group(0)
+                        elif handler.get("attributeNameExpressionSource") == "message" or handler.get(
+                                "attributeNameExpressionSource") == "constant":
+                            found_attribute_names = list(filter(lambda x: x is not None,
+                                                                TBUtility.get_values(
+                                                                    handler["attributeNameExpression"],
+                                                                    content)))
 
                         if found_device_name is None:
-                            self.__log.error("Device name missing from disconnection request")
+                            self.__log.error("Device name missing from attribute request")
                             continue
 
-                        if found_device_name in self.__gateway.get_devices():
-                            self.__log.info("Disconnecting device %s of type %s", found_device_name, found_device_type)
-                            self.__gateway.del_device(found_device_name)
-                        else:
-                            self.__log.info("Device %s was not connected", found_device_name)
-
-                        break
-
-                    # Note: if I'm in this branch, this was for sure a disconnection message
-                    # => Execution must end here both in case of failure and success
-                    continue
+                        if found_attribute_names is None:
+                            self.__log.error("Attribute name missing from attribute request")
+                            continue
 
-                # Check if message topic exists in attribute request handlers "i.e., I'm asking for a shared attribute"
-                topic_handlers = [regex for regex in self.__attribute_requests_sub_topics if
-                                  fullmatch(regex, message.topic)]
-                if topic_handlers:
-                    if content is None:
-                        content = TBUtility.decode(message)
-                    try:
-                        for topic in topic_handlers:
-                            handler = self.__attribute_requests_sub_topics[topic]
-
-                            found_attribute_names = None
-
-                            # Get device name, either from topic or from content
-                            device_info = handler.get("deviceInfo", {})
-                            found_device_name, _ = MqttConnector._parse_device_info(device_info, message.topic, content)
-
-                            # Get attribute name, either from topic or from content
-                            if handler.get("attributeNameExpressionSource") == "topic":
-                                attribute_name_match = search(handler["attributeNameExpression"], message.topic)
-                                if attribute_name_match is not None:
-                                    found_attribute_names = attribute_name_match.group(0)
-                            elif handler.get("attributeNameExpressionSource") == "message" or handler.get(
-                                    "attributeNameExpressionSource") == "constant":
-                                found_attribute_names = list(filter(lambda x: x is not None,
-                                                                    TBUtility.get_values(
-                                                                        handler["attributeNameExpression"],
-                                                                        content)))
-
-                            if found_device_name is None:
-                                self.__log.error("Device name missing from attribute request")
-                                continue
-
-                            if found_attribute_names is None:
-                                self.__log.error("Attribute name missing from attribute request")
-                                continue
-
-                            self.__log.info("Will retrieve attribute %s of %s", found_attribute_names,
-                                            found_device_name)
-                            scope = 'shared'
-                            if handler.get('scope') is not None:
-                                scope = handler.get('scope')
-                            if content and TBUtility.get_value(f'${scope}', content, get_tag=True) is not None:
-                                scope = TBUtility.get_value(f'${scope}', content, get_tag=True)
-
-                            request_arguments = (
-                                    found_device_name,
+                        self.__log.info("Will retrieve attribute %s of %s", found_attribute_names,
+                                        found_device_name)
+                        scope = 'shared'
+                        if handler.get('scope') is not None:
+                            scope = handler.get('scope')
+                        if content and TBUtility.get_value(f'${scope}', content, get_tag=True) is not None:
+                            scope = TBUtility.get_value(f'${scope}', content, get_tag=True)
+
+                        request_arguments = (
+                                found_device_name,
+                                found_attribute_names,
+                                lambda data, *args: self.notify_attribute(
+                                    data,
                                     found_attribute_names,
-                                    lambda data, *args: self.notify_attribute(
-                                        data,
-                                        found_attribute_names,
-                                        handler.get("topicExpression"),
-                                        handler.get("valueExpression"),
-                                        handler.get('retain', False),
-                                        handler.get('qos', 0)))
-
-                            if scope == 'client':
-                                self.__gateway.tb_client.client.gw_request_client_attributes(*request_arguments)
-                            else:
-                                self.__gateway.tb_client.client.gw_request_shared_attributes(*request_arguments)
-                            break
+                                    handler.get("topicExpression"),
+                                    handler.get("valueExpression"),
+                                    handler.get('retain', False),
+                                    handler.get('qos', 0)))
 
-                    except Exception as e:
-                        self.__log.exception(e)
+                        if scope == 'client':
+                            self.__gateway.tb_client.client.gw_request_client_attributes(*request_arguments)
+                        else:
+                            self.__gateway.tb_client.client.gw_request_shared_attributes(*request_arguments)
+                        break
 
-                    # Note: if I'm in this branch, this was for sure an attribute request message
-                    # => Execution must end here both in case of failure and success
-                    continue
+                except Exception as e:
+                    self.__log.exception(e)
 
-                # Check if message topic exists in RPC handlers --------------------------------------------------------
-                # The gateway is expecting for this message => no wildcards here, the topic must be evaluated as is
+                # Note: if I'm in this branch, this was for sure an attribute request message
+                # => Execution must end here both in case of failure and success
+                continue
 
-                if self.__gateway.is_rpc_in_progress(message.topic):
-                    self.__log.info("RPC response arrived. Forwarding it to thingsboard.")
-                    self.__gateway.rpc_with_reply_processing(message.topic, content)
-                    continue
+            # Check if message topic exists in RPC handlers --------------------------------------------------------
+            # The gateway is expecting for this message => no wildcards here, the topic must be evaluated as is
 
-                self.__log.debug("Received message to topic \"%s\" with unknown interpreter data: \n\n\"%s\"",
-                                 message.topic,
-                                 content)
-            else:
-                sleep(.2)
+            if self.__gateway.is_rpc_in_progress(message.topic):
+                self.__log.info("RPC response arrived. Forwarding it to thingsboard.")
+                self.__gateway.rpc_with_reply_processing(message.topic, content)
+                continue
+
+            self.__log.debug("Received message to topic \"%s\" with unknown interpreter data: \n\n\"%s\"",
+                             message.topic,
+                             content)
 
     def notify_attribute(self, incoming_data, attribute_name, topic_expression, value_expression, retain, qos):
         if incoming_data.get("device") is None or incoming_data.get("value", incoming_data.get('values')) is None:
@@ -1021,46 +1060,86 @@ class MqttConnector(Connector, Thread):
         self.__gateway.send_attributes({name: config})
 
     class ConverterWorker(Thread):
-        def __init__(self, name, incoming_queue, send_result, batch_size=100):
+        """
+        Converts messages of its queue in batches. Consecutive messages of a topic are converted together by
+        "convert_batch" of the converter, if it has one, otherwise one by one. Converted data of every message of the batch is sent
+        in one call, data of different messages is never merged, so no datapoints are lost.
+        """
+
+        def __init__(self, name, incoming_queue, send_result, logger, batch_size=100, is_backpressure_active=None):
             super().__init__()
             self.stopped = False
             self.name = name
             self.daemon = True
-            self.__msg_queue = incoming_queue
+            self.queue = incoming_queue
             self.__send_result = send_result
+            self.__log = logger
             self.__batch_size = batch_size
+            self.__is_backpressure_active = is_backpressure_active
             self.__stop_event = Event()
 
         def run(self):
             while not self.stopped:
+                if self.__is_backpressure_active is not None and self.__is_backpressure_active():
+                    # Messages wait in the worker queue until the gateway drains the queue to storage
+                    self.__stop_event.wait(.01)
+                    continue
                 try:
-                    batch = []
-                    for _ in range(self.__batch_size):
-                        try:
-                            batch.append(self.__msg_queue.get_nowait())
-                        except Empty:
-                            break
+                    batch = [self.queue.get(timeout=QUEUE_WAIT_TIMEOUT)]
+                except Empty:
+                    continue
+                for _ in range(self.__batch_size - 1):
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except Empty:
+                        break
 
-                    if not batch:
-                        self.__stop_event.wait(0.01)
-                        continue
+                # Only consecutive messages of a topic are converted together, so the order of the batch is kept
+                # also for devices publishing to several topics
+                topics_messages = []
+                for converter, topic, incoming_data in batch:
+                    if topics_messages and topics_messages[-1][0] is converter and topics_messages[-1][1] == topic:
+                        topics_messages[-1][2].append(incoming_data)
+                    else:
+                        topics_messages.append((converter, topic, [incoming_data]))
+
+                converted_data = []
+                for converter, topic, messages in topics_messages:
+                    converted_data.extend(self.__convert(converter, topic, messages))
+
+                converted_ts = {CONVERTED_TS_PARAMETER: int(time() * 1000)}
+                data_to_send = []
+                for data in converted_data:
+                    if data.telemetry_datapoints_count > 0 or data.attributes_datapoints_count > 0:
+                        data.add_to_metadata(converted_ts)
+                        data_to_send.append(data)
+                if data_to_send:
+                    try:
+                        self.__send_result(data_to_send)
+                    except Exception as e:
+                        self.__log.exception("Error in worker %s: %s", self.name, e)
 
-                    for convert_function, config, incoming_data in batch:
-                        converted_data: Union[ConvertedData, List[ConvertedData]] = convert_function(config, incoming_data)
-                        if isinstance(converted_data, ConvertedData):
-                            converted_data.add_to_metadata({CONVERTED_TS_PARAMETER: int(time() * 1000)})
-                            if converted_data and (converted_data.telemetry_datapoints_count > 0 or
-                                                   converted_data.attributes_datapoints_count > 0):
-                                self.__send_result(config, converted_data)
-                        else:
-                            for data in converted_data:
-                                data.add_to_metadata({CONVERTED_TS_PARAMETER: int(time() * 1000)})
-                                if data.telemetry_datapoints_count > 0 or data.attributes_datapoints_count > 0:
-                                    self.__send_result(config, data)
+        def __convert(self, converter, topic, messages) -> List[ConvertedData]:
+            convert_batch = getattr(converter, 'convert_batch', None)
+            if convert_batch is not None and len(messages) > 1:
+                try:
+                    return convert_batch(topic, messages)
                 except Exception as e:
-                    # Log the exception if needed
-                    print("Error in worker: ", e)
-                    pass
+                    self.__log.exception("Error in worker %s, messages will be converted one by one: %s",
+                                         self.name, e)
+
+            converted_data = []
+            for incoming_data in messages:
+                try:
+                    result: Union[ConvertedData, List[ConvertedData]] = converter.convert(topic, incoming_data)
+                except Exception as e:
+                    self.__log.exception("Error in worker %s: %s", self.name, e)
+                    continue
+                if isinstance(result, ConvertedData):
+                    converted_data.append(result)
+                elif result:
+                    converted_data.extend(result)
+            return converted_data
 
         def stop(self):
             self.stopped = True
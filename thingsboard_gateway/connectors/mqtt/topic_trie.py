@@ -0,0 +1,90 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from typing import Any, List
+
+SINGLE_LEVEL_WILDCARD = "+"
+MULTI_LEVEL_WILDCARD = "#"
+SHARED_SUBSCRIPTION_PREFIX = "$share/"
+QUEUE_SUBSCRIPTION_PREFIX = "$queue/"
+
+
+def get_subscription_topic_filter(topic_filter: str) -> str:
+    """Returns the topic filter which messages are matched with, without the shared subscription prefix."""
+    if topic_filter.startswith(SHARED_SUBSCRIPTION_PREFIX):
+        # $share/{group}/{topic filter}
+        return topic_filter.split("/", 2)[2] if topic_filter.count("/") > 1 else ""
+    if topic_filter.startswith(QUEUE_SUBSCRIPTION_PREFIX):
+        return topic_filter[len(QUEUE_SUBSCRIPTION_PREFIX):]
+    return topic_filter
+
+
+class _TopicTrieNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children = {}
+        self.values = []
+
+
+class TopicTrie:
+    """
+    Matches topics of incoming messages with the subscription topic filters by the MQTT rules:
+    "+" matches exactly one topic level, "#" matches the parent level and any number of child levels,
+    wildcards on the first level do not match topics starting with "$". Topic filters are split into levels
+    once, so matching takes time proportional to the topic depth instead of the topic filters count.
+    Values of all matched topic filters are returned in the order they were added.
+    """
+
+    def __init__(self):
+        self.__root = _TopicTrieNode()
+        self.__values_count = 0
+
+    def add(self, topic_filter: str, value: Any):
+        node = self.__root
+        for level in get_subscription_topic_filter(topic_filter).split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = _TopicTrieNode()
+                node.children[level] = child
+            node = child
+        node.values.append((self.__values_count, value))
+        self.__values_count += 1
+
+    def match(self, topic: str) -> List[Any]:
+        matched = []
+        self.__match(self.__root, topic.split("/"), 0, matched, topic.startswith("$"))
+        if len(matched) > 1:
+            matched.sort(key=lambda item: item[0])
+        return [value for _, value in matched]
+
+    def __len__(self):
+        return self.__values_count
+
+    def __match(self, node: _TopicTrieNode, levels: List[str], index: int, matched: list, system_topic: bool):
+        wildcards_allowed = index > 0 or not system_topic
+        if wildcards_allowed:
+            multi_level_node = node.children.get(MULTI_LEVEL_WILDCARD)
+            if multi_level_node is not None:
+                matched.extend(multi_level_node.values)
+        if index == len(levels):
+            matched.extend(node.values)
+            return
+        child = node.children.get(levels[index])
+        if child is not None:
+            self.__match(child, levels, index + 1, matched, system_topic)
+        if wildcards_allowed:
+            single_level_node = node.children.get(SINGLE_LEVEL_WILDCARD)
+            if single_level_node is not None:
+                self.__match(single_level_node, levels, index + 1, matched, system_topic)
@@ -20,7 +20,7 @@ from asyncua.ua.uatypes import VariantType
 from thingsboard_gateway.connectors.opcua.opcua_converter import OpcUaConverter
 from thingsboard_gateway.gateway.constants import TELEMETRY_PARAMETER, ATTRIBUTES_PARAMETER, REPORT_STRATEGY_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
-from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.datapoint_key_registry import DatapointKeyRegistry
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
@@ -52,6 +52,7 @@ class OpcUaUplinkConverter(OpcUaConverter):
     def __init__(self, config, logger):
         self._log = logger
         self.__config = config
+        self.__key_registry = DatapointKeyRegistry()
 
     def process_datapoint(self, config, val, basic_timestamp, device_report_strategy):
         try:
@@ -75,7 +76,8 @@ class OpcUaUplinkConverter(OpcUaConverter):
                 timestamp = val.ServerTimestamp.timestamp() * 1000
 
             section = DATA_TYPES[config['section']]
-            datapoint_key = TBUtility.convert_key_to_datapoint_key(config['key'], device_report_strategy, config, self._log)
+            datapoint_key = TBUtility.convert_key_to_datapoint_key(config['key'], device_report_strategy, config, self._log,
+                                                                   self.__key_registry)
             if section == TELEMETRY_PARAMETER:
                 return TelemetryEntry({datapoint_key: data}, ts=timestamp), error
             elif section == ATTRIBUTES_PARAMETER:
@@ -95,11 +97,8 @@ class OpcUaUplinkConverter(OpcUaConverter):
 
             converted_data = ConvertedData(device_name=self.__config['device_name'], device_type=self.__config['device_type'])
 
-            device_report_strategy = None
-            try:
-                device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
-            except ValueError as e:
-                self._log.trace("Report strategy config is not specified for device %s: %s", self.__config['device_name'], e)
+            device_report_strategy = self.__key_registry.get_report_strategy(
+                self.__config.get(REPORT_STRATEGY_PARAMETER), self._log, self.__config['device_name'])
 
             telemetry_batch = []
             attributes_batch = []
@@ -37,3 +37,4 @@ class Status(Enum):
     SUCCESS = 3,
     NO_NEW_DATA = 4
     FORBIDDEN_DEVICE = 5
+    BACKPRESSURE = 6
@@ -80,6 +80,7 @@ REPORT_PERIOD_PARAMETER = "reportPeriod"
 TYPE_PARAMETER = "type"
 AGGREGATION_FUNCTION_PARAMETER = "aggregationFunction"
 TTL_PARAMETER = "ttl"
+DEADBAND_PARAMETER = "deadband"
 
 
 class ReportStrategy(Enum):
@@ -87,6 +88,9 @@ class ReportStrategy(Enum):
     ON_CHANGE = "ON_CHANGE"
     ON_CHANGE_OR_REPORT_PERIOD = "ON_CHANGE_OR_REPORT_PERIOD"
     ON_RECEIVED = "ON_RECEIVED"
+    DEADBAND = "DEADBAND"
+    PERCENT_DEADBAND = "PERCENT_DEADBAND"
+    SWINGING_DOOR = "SWINGING_DOOR"
     DISABLED = "DISABLED"
 
     @classmethod
@@ -104,6 +108,7 @@ DEFAULT_REPORT_STRATEGY_CONFIG = {
 }
 
 STRATEGIES_WITH_REPORT_PERIOD = (ReportStrategy.ON_REPORT_PERIOD, ReportStrategy.ON_CHANGE_OR_REPORT_PERIOD)
+STRATEGIES_WITH_DEADBAND = (ReportStrategy.DEADBAND, ReportStrategy.PERCENT_DEADBAND, ReportStrategy.SWINGING_DOOR)
 
 # RPC parameter constants
 
@@ -145,4 +150,14 @@ DEFAULT_DEVICE_FILTER = {
     'enable': False
 }
 
+DEFAULT_INGEST_QUEUE_CONFIG = {
+    # 0 - the queue to storage is not bounded, data is never rejected
+    'maxSize': 0,
+    'highWatermark': 10000,
+    'lowWatermark': 5000,
+    'batchSize': 1000,
+    'targetBatchProcessingTimeMs': 100,
+    'workers': 1
+}
+
 CUSTOM_RPC_DIR = "/etc/thingsboard-gateway/rpc"
\ No newline at end of file
@@ -0,0 +1,216 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from struct import Struct
+from time import time
+from typing import List, Tuple
+
+from orjson import OPT_NON_STR_KEYS, dumps
+from simplejson import dumps as json_dumps
+
+from thingsboard_gateway.gateway.constants import TELEMETRY_TIMESTAMP_PARAMETER, TELEMETRY_VALUES_PARAMETER
+from thingsboard_gateway.gateway.proto.messages_pb2 import KeyValueType
+
+JSON_PAYLOAD_TYPE = "json"
+PROTOBUF_PAYLOAD_TYPE = "protobuf"
+
+# The maximal value of int64 fields
+MAX_LONG_VALUE = 2 ** 63 - 1
+DOUBLE_STRUCT = Struct("<d")
+
+
+# Messages of gateway/proto/messages.proto are encoded by hand, it is much faster than building them with
+# the generated classes. Tags are (field number << 3) | wire type.
+def _write_varint(buffer: bytearray, value: int):
+    if value < 0:
+        value += 1 << 64
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_field(buffer: bytearray, tag: bytes, value):
+    buffer += tag
+    _write_varint(buffer, len(value))
+    buffer += value
+
+
+def _encode_key_value(key, value) -> bytearray:
+    """Encodes KeyValueProto."""
+    key_value = bytearray()
+    _write_field(key_value, b"\x0a", str(key).encode("utf-8"))
+    if isinstance(value, bool):
+        key_value += b"\x10" + bytes((KeyValueType.BOOLEAN_V,)) + b"\x18" + (b"\x01" if value else b"\x00")
+    elif isinstance(value, int) and -MAX_LONG_VALUE - 1 <= value <= MAX_LONG_VALUE:
+        key_value += b"\x10" + bytes((KeyValueType.LONG_V,)) + b"\x20"
+        _write_varint(key_value, value)
+    elif isinstance(value, float):
+        key_value += b"\x10" + bytes((KeyValueType.DOUBLE_V,)) + b"\x29" + DOUBLE_STRUCT.pack(value)
+    elif isinstance(value, str):
+        key_value += b"\x10" + bytes((KeyValueType.STRING_V,))
+        _write_field(key_value, b"\x32", value.encode("utf-8"))
+    else:
+        key_value += b"\x10" + bytes((KeyValueType.JSON_V,))
+        _write_field(key_value, b"\x3a", json_dumps(value).encode("utf-8"))
+    return key_value
+
+
+class PackedMessage:
+    __slots__ = ("payload", "datapoints", "devices")
+
+    def __init__(self, payload: bytes, datapoints: int, devices: List[str]):
+        self.payload = payload
+        self.datapoints = datapoints
+        self.devices = devices
+
+
+class DeviceDataPacker:
+    """
+    Packs data of several devices into one message for the gateway telemetry or attributes topic.
+    Every device entry is serialized once, the size of the message is tracked by the sizes of its entries,
+    so the message is closed as soon as the next entry does not fit into the maximal payload size or
+    the maximal datapoints count.
+
+    JSON messages are objects with the device names as keys. Data of a device which does not fit
+    into an empty JSON message is returned separately, to be split by the client.
+    Protobuf messages are GatewayTelemetryMsg and GatewayAttributesMsg, a serialized message with one entry of
+    their repeated field is an entry itself, so entries are just concatenated. Data of a device which does
+    not fit into an empty protobuf message is split into several entries of the same device.
+    """
+
+    def __init__(self, max_payload_size: int, max_datapoints: int = 0, payload_type: str = JSON_PAYLOAD_TYPE):
+        self.__max_payload_size = max_payload_size
+        self.__max_datapoints = max_datapoints
+        self.__protobuf = payload_type == PROTOBUF_PAYLOAD_TYPE
+        if self.__protobuf:
+            self.__prefix, self.__separator, self.__suffix = b"", b"", b""
+        else:
+            self.__prefix, self.__separator, self.__suffix = b"{", b",", b"}"
+        # The first entry has no separator before it
+        self.__empty_message_size = len(self.__prefix) + len(self.__suffix) - len(self.__separator)
+        self.__entries = []
+        self.__devices = []
+        self.__size = self.__empty_message_size
+        self.__datapoints = 0
+        self.__messages = []
+
+    def pack_telemetry(self, devices_telemetry: dict) -> Tuple[List[PackedMessage], List[str]]:
+        """Returns packed messages and names of the devices which telemetry should be sent separately."""
+        if self.__protobuf:
+            return self.__pack(devices_telemetry, self.__encode_protobuf_telemetry,
+                               self.__count_telemetry_datapoints, self.__split_telemetry)
+        return self.__pack(devices_telemetry, self.__encode_json, self.__count_telemetry_datapoints)
+
+    def pack_attributes(self, devices_attributes: dict) -> Tuple[List[PackedMessage], List[str]]:
+        """Returns packed messages and names of the devices which attributes should be sent separately."""
+        if self.__protobuf:
+            return self.__pack(devices_attributes, self.__encode_protobuf_attributes, len, self.__split_attributes)
+        return self.__pack(devices_attributes, self.__encode_json, len)
+
+    def __pack(self, devices_data: dict, encode, count_datapoints, split=None) -> Tuple[List[PackedMessage],
+                                                                                        List[str]]:
+        oversized_devices = []
+        for device_name, data in devices_data.items():
+            entry = encode(device_name, data)
+            datapoints = count_datapoints(data)
+            if not self.__is_oversized(entry, datapoints):
+                self.__add(device_name, entry, datapoints)
+            elif split is None:
+                oversized_devices.append(device_name)
+            else:
+                for data_part in split(data):
+                    self.__add(device_name, encode(device_name, data_part), count_datapoints(data_part))
+        self.__flush()
+        messages, self.__messages = self.__messages, []
+        return messages, oversized_devices
+
+    def __is_oversized(self, entry: bytes, datapoints: int) -> bool:
+        return (self.__empty_message_size + len(entry) + len(self.__separator) > self.__max_payload_size
+                or 0 < self.__max_datapoints < datapoints)
+
+    def __add(self, device_name, entry: bytes, datapoints: int):
+        entry_size = len(entry) + len(self.__separator)
+        if self.__entries and (self.__size + entry_size > self.__max_payload_size
+                               or 0 < self.__max_datapoints < self.__datapoints + datapoints):
+            self.__flush()
+        self.__entries.append(entry)
+        self.__devices.append(device_name)
+        self.__size += entry_size
+        self.__datapoints += datapoints
+
+    def __flush(self):
+        if self.__entries:
+            self.__messages.append(PackedMessage(self.__prefix + self.__separator.join(self.__entries) + self.__suffix,
+                                                 self.__datapoints, self.__devices))
+        self.__entries = []
+        self.__devices = []
+        self.__size = self.__empty_message_size
+        self.__datapoints = 0
+
+    @staticmethod
+    def __encode_json(device_name, data) -> bytes:
+        return dumps(device_name) + b":" + dumps(data, option=OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def __encode_protobuf_telemetry(device_name, telemetry) -> bytes:
+        if isinstance(telemetry, dict):
+            telemetry = [telemetry]
+        post_telemetry_msg = bytearray()
+        for telemetry_entry in telemetry:
+            if TELEMETRY_VALUES_PARAMETER in telemetry_entry:
+                ts = telemetry_entry.get(TELEMETRY_TIMESTAMP_PARAMETER) or int(time() * 1000)
+                values = telemetry_entry[TELEMETRY_VALUES_PARAMETER]
+            else:
+                ts = int(time() * 1000)
+                values = telemetry_entry
+            ts_kv_list = bytearray(b"\x08")
+            _write_varint(ts_kv_list, ts)
+            for key, value in values.items():
+                _write_field(ts_kv_list, b"\x12", _encode_key_value(key, value))
+            _write_field(post_telemetry_msg, b"\x0a", ts_kv_list)
+        telemetry_msg = bytearray()
+        _write_field(telemetry_msg, b"\x0a", device_name.encode("utf-8"))
+        _write_field(telemetry_msg, b"\x1a", post_telemetry_msg)
+        gateway_telemetry_msg = bytearray()
+        _write_field(gateway_telemetry_msg, b"\x0a", telemetry_msg)
+        return bytes(gateway_telemetry_msg)
+
+    @staticmethod
+    def __encode_protobuf_attributes(device_name, attributes) -> bytes:
+        post_attribute_msg = bytearray()
+        for key, value in attributes.items():
+            _write_field(post_attribute_msg, b"\x0a", _encode_key_value(key, value))
+        attributes_msg = bytearray()
+        _write_field(attributes_msg, b"\x0a", device_name.encode("utf-8"))
+        _write_field(attributes_msg, b"\x12", post_attribute_msg)
+        gateway_attributes_msg = bytearray()
+        _write_field(gateway_attributes_msg, b"\x0a", attributes_msg)
+        return bytes(gateway_attributes_msg)
+
+    @staticmethod
+    def __split_telemetry(telemetry) -> list:
+        if isinstance(telemetry, dict):
+            telemetry = [telemetry]
+        return [[telemetry_entry] for telemetry_entry in telemetry]
+
+    @staticmethod
+    def __split_attributes(attributes) -> list:
+        return [{key: value} for key, value in attributes.items()]
+
+    @staticmethod
+    def __count_telemetry_datapoints(telemetry) -> int:
+        if isinstance(telemetry, dict):
+            telemetry = [telemetry]
+        return sum(len(entry.get(TELEMETRY_VALUES_PARAMETER, entry)) for entry in telemetry)
@@ -14,12 +14,15 @@
 
 from typing import Dict, Any, Union
 
+from thingsboard_gateway.gateway.entities.data_size import get_object_size, get_updated_object_size
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 
 
 class Attributes:
     def __init__(self, values: Dict[DatapointKey, Any] = None):
         self.values: Dict[DatapointKey, Any] = values or {}
+        # Size of the serialized attributes, calculated on the first request and kept up to date by the setters
+        self._data_size = None
 
     def __str__(self):
         return f"Attributes(values={self.values})"
@@ -37,13 +40,25 @@ class Attributes:
         return iter(self.values)
 
     def __setitem__(self, key: DatapointKey, value):
+        if self._data_size is not None:
+            self._data_size = get_updated_object_size(self._data_size, self.values, {key: value})
         self.values[key] = value
 
     def __len__(self):
         return len(self.values)
 
     def update(self, attributes: Union[Dict[DatapointKey, Any], 'Attributes']):
-        self.values.update(attributes if isinstance(attributes, dict) else attributes.values)
+        values = attributes if isinstance(attributes, dict) else attributes.values
+        if self._data_size is not None:
+            self._data_size = get_updated_object_size(self._data_size, self.values, values)
+        self.values.update(values)
+
+    @property
+    def data_size(self) -> int:
+        # Size of the serialized attributes, see "to_dict"
+        if self._data_size is None:
+            self._data_size = get_object_size(self.values)
+        return self._data_size
 
     def items(self):
         return self.values.items()
@@ -17,20 +17,31 @@ from typing import List, Union
 from thingsboard_gateway.gateway.constants import ATTRIBUTES_PARAMETER, TELEMETRY_PARAMETER, TIMESERIES_PARAMETER, \
     METADATA_PARAMETER
 from thingsboard_gateway.gateway.entities.attributes import Attributes
+from thingsboard_gateway.gateway.entities.data_size import TS_ENTRY_OVERHEAD_SIZE, get_entry_sizes, get_value_size
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
-from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+# Sizes of the constant parts of the serialized ConvertedData, see "to_dict"
+DEVICE_NAME_PREFIX_SIZE = len('{"deviceName":')
+DEVICE_TYPE_PREFIX_SIZE = len(',"deviceType":')
+METADATA_PREFIX_SIZE = len(',"metadata":')
+TELEMETRY_PREFIX_SIZE = len(',"telemetry":')
+ATTRIBUTES_PREFIX_SIZE = len(',"attributes":')
+EMPTY_TELEMETRY_AND_ATTRIBUTES_SIZE = len(',"telemetry":[],"attributes":{}}')
 
 
 def split_large_entries(entries: dict, first_item_max_data_size: int, max_data_size: int, ts=None, ts_size=None):
     split_chunks = []
     split_chunk_sizes = []
-    current_chunk = {}
+    items = list(entries.items())
+    current_chunk_start = 0
     current_size = 0
     ts_check = False
 
-    for original_key, value in entries.items():
-        entry_size = TBUtility.get_data_size({original_key.key: value}) + 1
+    # Chunk bounds are found with the sizes only, chunks are created by slices of the entries
+    for index, entry_size in enumerate(get_entry_sizes(entries)):
+        # Each entry is measured as a separate object with the separator
+        entry_size += 3
         if ts is not None and not ts_check:
             entry_size += ts_size
             ts_check = True
@@ -38,21 +49,20 @@ def split_large_entries(entries: dict, first_item_max_data_size: int, max_data_s
         # Recalculate size after each addition and check if it exceeds the max size
         if current_size + entry_size >= (first_item_max_data_size if not split_chunks else max_data_size):
             # Append current chunk if it exceeds the max size
-            if current_chunk:
-                split_chunks.append(current_chunk)
+            if index > current_chunk_start:
+                split_chunks.append(dict(items[current_chunk_start:index]))
                 split_chunk_sizes.append(current_size)
                 ts_check = False
             # Start a new chunk
-            current_chunk = {original_key: value}  # New dict is created to avoid modifying the original dict
+            current_chunk_start = index
             current_size = entry_size
         else:
             # Add to current chunk
-            current_chunk[original_key] = value
             current_size += entry_size
 
     # Add the last chunk if any
-    if current_chunk:
-        split_chunks.append(current_chunk)
+    if current_chunk_start < len(items):
+        split_chunks.append(dict(items[current_chunk_start:]))
         split_chunk_sizes.append(current_size)
 
     return zip(split_chunks, split_chunk_sizes)
@@ -114,8 +124,7 @@ class ConvertedData:
         for telemetry_entry in self.telemetry:
             if telemetry_entry.ts in self.ts_index:
                 index = self.ts_index[telemetry_entry.ts]
-                existing_values = self.telemetry[index].values
-                existing_values.update(telemetry_entry.values)
+                self.telemetry[index].update(telemetry_entry.values)
             else:
                 self.ts_index[telemetry_entry.ts] = len(self.telemetry) - 1
 
@@ -132,10 +141,9 @@ class ConvertedData:
 
         if telemetry_entry.ts in self.ts_index:
             index = self.ts_index[telemetry_entry.ts]
-            existing_values = self.telemetry[index].values
-            old_values_len = len(existing_values)
+            old_values_len = len(self.telemetry[index].values)
 
-            self.telemetry[index].values.update(telemetry_entry.values)
+            self.telemetry[index].update(telemetry_entry.values)
             self._telemetry_datapoints_count -= old_values_len
             self._telemetry_datapoints_count += len(self.telemetry[index].values)
         else:
@@ -161,7 +169,16 @@ class ConvertedData:
         self.metadata.update(key_value_entry)
 
     def get_size(self):
-        return TBUtility.get_data_size(self.to_dict())
+        # Size of the serialized data (see "to_dict"), calculated from the running sizes of the entries
+        telemetry_size = 2
+        for telemetry_entry in self.telemetry:
+            telemetry_size += telemetry_entry.data_size + 1
+        if self.telemetry:
+            telemetry_size -= 1
+        return (DEVICE_NAME_PREFIX_SIZE + get_value_size(self.device_name)
+                + DEVICE_TYPE_PREFIX_SIZE + get_value_size(self.device_type)
+                + TELEMETRY_PREFIX_SIZE + telemetry_size
+                + ATTRIBUTES_PREFIX_SIZE + self.attributes.data_size + 1)
 
     @property
     def telemetry_datapoints_count(self):
@@ -173,13 +190,10 @@ class ConvertedData:
 
     # Methods for getting data
     def convert_to_objects_with_maximal_size(self, max_data_size) -> List['ConvertedData']:
-        general_info_bytes_size = TBUtility.get_data_size({
-            "deviceName": self.device_name,
-            "deviceType": self.device_type,
-            "metadata": self.metadata,
-            "telemetry": [],
-            "attributes": {}
-        })
+        general_info_bytes_size = (DEVICE_NAME_PREFIX_SIZE + get_value_size(self.device_name)
+                                   + DEVICE_TYPE_PREFIX_SIZE + get_value_size(self.device_type)
+                                   + METADATA_PREFIX_SIZE + (get_value_size(self.metadata) if self.metadata else 2)
+                                   + EMPTY_TELEMETRY_AND_ATTRIBUTES_SIZE)
 
         if general_info_bytes_size > max_data_size:
             raise ValueError("Maximal data size is too small even for general info, please adjust maxPayloadSize")
@@ -190,14 +204,13 @@ class ConvertedData:
         current_data = ConvertedData(self.device_name, self.device_type, self.metadata)
         current_data_size = general_info_bytes_size
 
-        attributes_dict = self.attributes.to_dict()
-        if attributes_dict:
-            attributes_bytes_size = TBUtility.get_data_size(attributes_dict)
+        if self.attributes:
+            attributes_bytes_size = self.attributes.data_size
             if current_data_size + attributes_bytes_size <= max_data_size:
-                current_data.add_to_attributes(attributes_dict)
+                current_data.add_to_attributes(self.attributes.to_dict())
                 current_data_size += attributes_bytes_size
             else:
-                split_attributes_and_sizes = split_large_entries(attributes_dict,
+                split_attributes_and_sizes = split_large_entries(self.attributes.values,
                                                                  max_data_size - current_data_size,
                                                                  available_data_size)
                 for data_chunk, chunk_size in split_attributes_and_sizes:
@@ -210,10 +223,9 @@ class ConvertedData:
 
         for telemetry_entry in self.telemetry:
             telemetry_values = telemetry_entry.values
-            ts_data_size = TBUtility.get_data_size({"ts": telemetry_entry.ts}) + 1
+            ts_data_size = TS_ENTRY_OVERHEAD_SIZE + get_value_size(telemetry_entry.ts)
 
-            telemetry_obj_size = TBUtility.get_data_size(
-                {datapoint_key.key: value for datapoint_key, value in telemetry_values.items()}) + ts_data_size
+            telemetry_obj_size = telemetry_entry.values_size + ts_data_size
 
             if telemetry_obj_size <= max_data_size - current_data_size:
                 current_data.add_to_telemetry(telemetry_entry)
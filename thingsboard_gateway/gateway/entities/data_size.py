@@ -0,0 +1,105 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Sizes of the JSON representation of data entries, the same as TBUtility.get_data_size returns.
+
+Sizes are calculated in bulk: orjson is called through "map" for the whole collection, so no Python code runs
+per value. In CPython this is several times faster than any per-value arithmetic (even len(str(value))), so
+entities calculate their sizes once, when they are requested, and then only adjust them for the changed keys.
+"""
+
+from typing import Any, Dict, List
+
+from orjson import OPT_NON_STR_KEYS, JSONEncodeError, dumps
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+
+# len('{"ts":') + len('}') + 1 (separator between telemetry entries, see split_large_entries)
+TS_ENTRY_OVERHEAD_SIZE = 8
+# len('{"ts":') + len(',"values":') + len('}')
+TELEMETRY_ENTRY_OVERHEAD_SIZE = 17
+
+# Sizes of string keys, a device reports the same keys again and again
+MAX_KEY_SIZE_CACHE_LENGTH = 100000
+_key_size_cache: Dict[str, int] = {}
+
+
+def get_value_size(value) -> int:
+    return len(dumps(value, option=OPT_NON_STR_KEYS))
+
+
+def get_key_size(key) -> int:
+    if isinstance(key, DatapointKey):
+        key = key.key
+    if type(key) is str:
+        size = _key_size_cache.get(key)
+        if size is None:
+            size = len(dumps(key))
+            if len(_key_size_cache) >= MAX_KEY_SIZE_CACHE_LENGTH:
+                _key_size_cache.clear()
+            _key_size_cache[key] = size
+        return size
+    # Non-string keys are converted by orjson itself: '{' + key + ':0}'
+    return len(dumps({key: 0}, option=OPT_NON_STR_KEYS)) - 4
+
+
+def get_entry_size(key, value) -> int:
+    """Size of the '"key":value' pair inside a JSON object."""
+    return get_key_size(key) + 1 + get_value_size(value)
+
+
+def get_entry_sizes(entries: Dict[Any, Any]) -> List[int]:
+    """Sizes of the '"key":value' pairs, in the order of the entries."""
+    keys = [key.key if isinstance(key, DatapointKey) else key for key in entries]
+    if set(map(type, keys)) == {str}:
+        try:
+            key_sizes = list(map(_key_size_cache.__getitem__, keys))
+        except KeyError:
+            if len(_key_size_cache) >= MAX_KEY_SIZE_CACHE_LENGTH:
+                _key_size_cache.clear()
+            _key_size_cache.update(zip(keys, map(len, map(dumps, keys))))
+            key_sizes = list(map(_key_size_cache.__getitem__, keys))
+    else:
+        key_sizes = map(get_key_size, keys)
+    try:
+        # Options are not passed on the fast path, calls with keyword arguments are much slower from "map"
+        value_sizes = list(map(len, map(dumps, entries.values())))
+    except JSONEncodeError:
+        value_sizes = list(map(get_value_size, entries.values()))
+    return [key_size + value_size + 1 for key_size, value_size in zip(key_sizes, value_sizes)]
+
+
+def get_object_size(entries: Dict[Any, Any]) -> int:
+    """Size of the JSON object with the entries, DatapointKeys are written as their keys."""
+    return get_value_size({key.key if isinstance(key, DatapointKey) else key: value
+                           for key, value in entries.items()})
+
+
+def get_updated_object_size(object_size: int, entries: Dict[Any, Any], updated_entries: Dict[Any, Any]) -> int:
+    """
+    Size of the JSON object after "entries.update(updated_entries)", calculated from its size before the update.
+    Only the updated entries are measured.
+    """
+    entries_count = len(entries)
+    for key, value in updated_entries.items():
+        if key in entries:
+            object_size -= get_entry_size(key, entries[key])
+        else:
+            # Separator before the new entry, the first entry has none
+            if entries_count:
+                object_size += 1
+            entries_count += 1
+        object_size += get_entry_size(key, value)
+    return object_size
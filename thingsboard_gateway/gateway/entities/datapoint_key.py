@@ -19,9 +19,17 @@ from thingsboard_gateway.gateway.entities.report_strategy_config import ReportSt
 
 
 class DatapointKey:
+    """
+    Key of the converted value. Keys are immutable and are interned by DatapointKeyRegistry, so the same object
+    is used for all values of the configured key and the hash is calculated only once.
+    """
+
+    __slots__ = ["key", "report_strategy", "__hash"]
+
     def __init__(self, key, report_strategy: ReportStrategyConfig = None):
         self.key = key
         self.report_strategy = report_strategy
+        self.__hash = hash((key, report_strategy))
 
     def __str__(self):
         return f"DatapointKey(key={self.key}, report_strategy={self.report_strategy})"
@@ -30,9 +38,11 @@ class DatapointKey:
         return self.__str__()
 
     def __hash__(self):
-        return hash((self.key, self.report_strategy))
+        return self.__hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, DatapointKey):
             return self.key == other.key and self.report_strategy == other.report_strategy
         return False
@@ -0,0 +1,107 @@
+# ------------------------------------------------------------------------------
+#      Copyright 2025. ThingsBoard
+#  #
+#      Licensed under the Apache License, Version 2.0 (the "License");
+#      you may not use this file except in compliance with the License.
+#      You may obtain a copy of the License at
+#  #
+#          http://www.apache.org/licenses/LICENSE-2.0
+#  #
+#      Unless required by applicable law or agreed to in writing, software
+#      distributed under the License is distributed on an "AS IS" BASIS,
+#      WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#      See the License for the specific language governing permissions and
+#      limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_PARAMETER
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+
+
+class DatapointKeyRegistry:
+    """
+    Interns DatapointKey objects and parsed report strategies of the key configurations.
+    Every key is created once, on its first value, all later values of the key are converted by dict lookups.
+    Report strategy configurations are parsed once per configuration object, so configurations should not be
+    changed in place (the connectors create new configuration objects on the configuration update).
+
+    Converters keep their own registry, so the keys are released together with the connector.
+    The registry can be shared by converters of several threads: lookups do not lock, adding and clearing
+    are done under a lock.
+    """
+
+    # Keys built from the data (e.g. "${key}" expressions) are not limited, the registry is cleared on overflow.
+    # Parsed report strategies are counted too, as configuration objects can be created for every message
+    MAX_KEYS_COUNT = 100000
+
+    def __init__(self):
+        self.__keys: Dict[Optional[ReportStrategyConfig], Dict[str, DatapointKey]] = {}
+        self.__keys_count = 0
+        # Configuration id -> (configuration, parsed report strategy), the configuration is kept with the result,
+        # so its id cannot be reused by another object while the entry exists
+        self.__report_strategies: Dict[int, Tuple[dict, Optional[ReportStrategyConfig]]] = {}
+        self.__lock = Lock()
+
+    def get_report_strategy(self, report_strategy_config, logger=None, name=None) -> Optional[ReportStrategyConfig]:
+        if report_strategy_config is None or isinstance(report_strategy_config, ReportStrategyConfig):
+            return report_strategy_config
+        parsed = self.__report_strategies.get(id(report_strategy_config))
+        if parsed is None or parsed[0] is not report_strategy_config:
+            report_strategy = None
+            try:
+                report_strategy = ReportStrategyConfig(report_strategy_config)
+            except ValueError as e:
+                if logger is not None:
+                    logger.trace("Report strategy config is not specified for %s: %s", name, e)
+            parsed = (report_strategy_config, report_strategy)
+            with self.__lock:
+                if self.__keys_count >= self.MAX_KEYS_COUNT:
+                    self.__clear()
+                if id(report_strategy_config) not in self.__report_strategies:
+                    self.__keys_count += 1
+                self.__report_strategies[id(report_strategy_config)] = parsed
+        return parsed[1]
+
+    def get_datapoint_key(self, key, device_report_strategy=None, key_config=None, logger=None) -> DatapointKey:
+        key_report_strategy = device_report_strategy
+        if key_config:
+            key_report_strategy_config = key_config.get(REPORT_STRATEGY_PARAMETER)
+            if key_report_strategy_config is not None:
+                key_report_strategy = self.get_report_strategy(key_report_strategy_config, logger, key) \
+                    or device_report_strategy
+
+        keys = self.__keys.get(key_report_strategy)
+        datapoint_key = keys.get(key) if keys is not None else None
+        if datapoint_key is None:
+            with self.__lock:
+                if self.__keys_count >= self.MAX_KEYS_COUNT:
+                    self.__clear()
+                keys = self.__keys.get(key_report_strategy)
+                if keys is None:
+                    keys = self.__keys[key_report_strategy] = {}
+                datapoint_key = keys.get(key)
+                if datapoint_key is None:
+                    datapoint_key = keys[key] = DatapointKey(key, key_report_strategy)
+                    self.__keys_count += 1
+        return datapoint_key
+
+    def clear(self):
+        with self.__lock:
+            self.__clear()
+
+    def __clear(self):
+        self.__keys = {}
+        self.__keys_count = 0
+        self.__report_strategies = {}
+
+    def __len__(self):
+        return self.__keys_count
+
+
+# Registry for the converters that do not keep their own one
+DEFAULT_DATAPOINT_KEY_REGISTRY = DatapointKeyRegistry()
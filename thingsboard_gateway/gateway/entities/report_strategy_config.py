@@ -15,7 +15,8 @@
 from enum import Enum
 
 from thingsboard_gateway.gateway.constants import REPORT_PERIOD_PARAMETER, ReportStrategy, \
-    TYPE_PARAMETER, AGGREGATION_FUNCTION_PARAMETER, TTL_PARAMETER, DEFAULT_REPORT_STRATEGY_CONFIG
+    TYPE_PARAMETER, AGGREGATION_FUNCTION_PARAMETER, TTL_PARAMETER, DEFAULT_REPORT_STRATEGY_CONFIG, \
+    DEADBAND_PARAMETER, STRATEGIES_WITH_DEADBAND
 
 
 class AggregationFunction(Enum):
@@ -35,7 +36,7 @@ class AggregationFunction(Enum):
 
 
 class ReportStrategyConfig:
-    __slots__ = ["report_period", "ttl", "report_strategy", "aggregation_function", "__hash"]
+    __slots__ = ["report_period", "ttl", "report_strategy", "aggregation_function", "deadband", "__hash"]
 
     def __init__(self, config, default_report_strategy_config=None):
         if default_report_strategy_config is None:
@@ -45,6 +46,7 @@ class ReportStrategyConfig:
             self.ttl = config.ttl
             self.report_strategy = config.report_strategy
             self.aggregation_function = config.aggregation_function
+            self.deadband = config.deadband
             self.__hash = config.__hash
             return
 
@@ -63,20 +65,33 @@ class ReportStrategyConfig:
         self.report_strategy = ReportStrategy.from_string(report_strategy_type)
         if self.report_strategy not in (ReportStrategy.ON_REPORT_PERIOD, ReportStrategy.ON_CHANGE_OR_REPORT_PERIOD):
             self.report_period = None
-        self.aggregation_function = config.get(AGGREGATION_FUNCTION_PARAMETER)
+        self.aggregation_function = self.__parse_aggregation_function(config.get(AGGREGATION_FUNCTION_PARAMETER))
+        self.deadband = config.get(DEADBAND_PARAMETER) if self.report_strategy in STRATEGIES_WITH_DEADBAND else None
         self.ttl = config.get(TTL_PARAMETER,
                               default_report_strategy_config.get(TTL_PARAMETER,
                                                                  DEFAULT_REPORT_STRATEGY_CONFIG[TTL_PARAMETER]))
         self.__validate_config()
-        self.__hash = hash((self.report_period, self.report_strategy, self.aggregation_function))
+        self.__hash = hash((self.report_period, self.report_strategy, self.aggregation_function, self.deadband))
+
+    @staticmethod
+    def __parse_aggregation_function(value):
+        if value is None or isinstance(value, AggregationFunction):
+            aggregation_function = value
+        else:
+            aggregation_function = AggregationFunction.from_string(str(value))
+        # NONE means the same as no aggregation, the latest value is reported
+        return None if aggregation_function == AggregationFunction.NONE else aggregation_function
 
     def __validate_config(self):
         if (self.report_strategy in (ReportStrategy.ON_REPORT_PERIOD, ReportStrategy.ON_CHANGE_OR_REPORT_PERIOD)
                 and (self.report_period is None or self.report_period <= 0)):
             raise ValueError("Invalid report period value: %r" % str(self.report_period))
-        if (self.aggregation_function is not None
-                and self.aggregation_function not in AggregationFunction.__members__.values()):
-            raise ValueError("Invalid aggregation function value: %r" % self.aggregation_function)
+        if (self.report_strategy in STRATEGIES_WITH_DEADBAND
+                and (type(self.deadband) not in (int, float) or self.deadband < 0)):
+            raise ValueError("Invalid deadband value: %r" % str(self.deadband))
+        if self.aggregation_function is not None and self.report_strategy != ReportStrategy.ON_REPORT_PERIOD:
+            raise ValueError("Aggregation function is supported only by %s report strategy"
+                             % ReportStrategy.ON_REPORT_PERIOD.value)
 
     def __hash__(self):
         return self.__hash
@@ -89,8 +104,9 @@ class ReportStrategyConfig:
                 and self.report_period == other.report_period
                 and self.report_strategy == other.report_strategy
                 and self.aggregation_function == other.aggregation_function
+                and self.deadband == other.deadband
                 and self.ttl == other.ttl)
 
     def __str__(self):
         return f"ReportStrategyConfig(report_period={self.report_period}, report_strategy={self.report_strategy},\
-            aggregation_function={self.aggregation_function}, ttl={self.ttl})"
+            aggregation_function={self.aggregation_function}, deadband={self.deadband}, ttl={self.ttl})"
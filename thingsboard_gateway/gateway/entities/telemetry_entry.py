@@ -17,8 +17,9 @@ from typing import Dict, Any
 
 from thingsboard_gateway.gateway.constants import TELEMETRY_TIMESTAMP_PARAMETER, TELEMETRY_VALUES_PARAMETER, \
     METADATA_PARAMETER
+from thingsboard_gateway.gateway.entities.data_size import TELEMETRY_ENTRY_OVERHEAD_SIZE, get_object_size, \
+    get_updated_object_size, get_value_size
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
-from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
 class TelemetryEntry:
@@ -31,7 +32,8 @@ class TelemetryEntry:
         self.ts = ts
         self.metadata = {}
         self.values: Dict[DatapointKey, Any] = values
-        self.data_size = TBUtility.get_data_size(self.to_dict())
+        # Size of the serialized values, calculated on the first request and kept up to date by "update"
+        self._values_size = None
 
     def __str__(self):
         return f"TelemetryEntry(ts={self.ts}, metadata={self.metadata}, values={self.values})"
@@ -42,6 +44,23 @@ class TelemetryEntry:
     def __hash__(self):
         return hash((self.ts, tuple(self.metadata.items()), tuple(self.values.items())))
 
+    def update(self, values: Dict[DatapointKey, Any]):
+        if self._values_size is not None:
+            self._values_size = get_updated_object_size(self._values_size, self.values, values)
+        self.values.update(values)
+
+    @property
+    def values_size(self) -> int:
+        # Size of the serialized "values" object
+        if self._values_size is None:
+            self._values_size = get_object_size(self.values)
+        return self._values_size
+
+    @property
+    def data_size(self) -> int:
+        # Size of the serialized entry, see "to_dict"
+        return TELEMETRY_ENTRY_OVERHEAD_SIZE + get_value_size(self.ts) + self.values_size
+
     def to_dict(self, with_metadata=False) -> Dict[str, Any]:
         res = {}
         for datapoint_key, value in self.values.items():
@@ -0,0 +1,196 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, List
+
+
+class IngestQueue:
+    """
+    Queue of converted data between connectors and the storage.
+
+    When the queue grows to the high watermark, backpressure is activated: data is still accepted, but connectors
+    are expected to slow down. Backpressure is released when the queue is drained to the low watermark. Data is
+    rejected only when the queue is full. The queue is not bounded by default ("maxSize" is 0), as not every
+    connector slows down on backpressure or handles rejected data.
+
+    The queue is safe for any number of producers and one consumer: producers check the size and put items under
+    a lock, so the queue never grows over the max size.
+    """
+
+    def __init__(self, config=None):
+        if config is None:
+            config = {}
+        self.max_size = config.get("maxSize", 0) or 0
+        self.high_watermark = config.get("highWatermark", 10000)
+        if self.max_size:
+            self.high_watermark = min(self.high_watermark, self.max_size)
+        self.low_watermark = min(config.get("lowWatermark", 5000), self.high_watermark)
+        # Items are stored with the time they were put, to measure the time they wait in the queue
+        self.__items = deque()
+        self.__put_lock = Lock()
+        self.__backpressure_active = False
+        self.__rejected_count = 0
+        self.__last_wait_time_ms = 0
+
+    def put(self, item) -> bool:
+        """Returns False if the item was rejected because the queue is full."""
+        items = self.__items
+        with self.__put_lock:
+            if self.max_size and len(items) >= self.max_size:
+                self.__rejected_count += 1
+                return False
+            items.append((monotonic(), item))
+            if not self.__backpressure_active and len(items) >= self.high_watermark:
+                self.__backpressure_active = True
+        return True
+
+    def put_many(self, items: list) -> int:
+        """Returns the number of the first items accepted, the rest are rejected because the queue is full."""
+        queue_items = self.__items
+        with self.__put_lock:
+            accepted_count = len(items)
+            if self.max_size:
+                accepted_count = max(0, min(accepted_count, self.max_size - len(queue_items)))
+            if accepted_count < len(items):
+                self.__rejected_count += len(items) - accepted_count
+            if accepted_count:
+                put_time = monotonic()
+                queue_items.extend((put_time, item) for item in items[:accepted_count])
+                if not self.__backpressure_active and len(queue_items) >= self.high_watermark:
+                    self.__backpressure_active = True
+        return accepted_count
+
+    # The same interface as queue.SimpleQueue for the producers
+    put_nowait = put
+
+    def get_nowait(self):
+        try:
+            put_time, item = self.__items.popleft()
+        except IndexError:
+            raise Empty
+        self.__on_taken(put_time)
+        return item
+
+    def get_batch(self, max_count: int, max_collecting_time_ms: int = 500) -> list:
+        """Returns up to "max_count" items, does not wait for new items."""
+        items = self.__items
+        batch = []
+        put_time = None
+        collecting_deadline = monotonic() + max_collecting_time_ms / 1000
+        while items and len(batch) < max_count:
+            try:
+                put_time, item = items.popleft()
+            except IndexError:
+                break
+            batch.append(item)
+            if len(batch) % 100 == 0 and monotonic() > collecting_deadline:
+                break
+        if put_time is not None:
+            self.__on_taken(put_time)
+        return batch
+
+    def is_backpressure_active(self) -> bool:
+        return self.__backpressure_active
+
+    def empty(self) -> bool:
+        return not self.__items
+
+    def qsize(self) -> int:
+        return len(self.__items)
+
+    def get_statistics(self):
+        return {
+            "size": len(self.__items),
+            "waitTimeMs": self.__last_wait_time_ms,
+            "rejected": self.__rejected_count,
+            "backpressure": self.__backpressure_active
+        }
+
+    def __on_taken(self, put_time):
+        self.__last_wait_time_ms = int((monotonic() - put_time) * 1000)
+        if self.__backpressure_active and len(self.__items) <= self.low_watermark:
+            self.__backpressure_active = False
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size for the consumer of the ingest queue, adapted to the time the storage takes to process a batch:
+    decreased by half when a batch takes longer than the target time, increased step by step while batches are
+    processed in time and the queue has more items than a batch.
+    """
+
+    def __init__(self, config=None):
+        if config is None:
+            config = {}
+        self.min_size = config.get("minBatchSize", 10)
+        self.max_size = max(config.get("maxBatchSize", 5000), self.min_size)
+        self.target_processing_time_ms = config.get("targetBatchProcessingTimeMs", 100)
+        self.size = min(max(config.get("batchSize", 1000), self.min_size), self.max_size)
+        self.__increase_step = max(self.min_size, self.max_size // 50)
+
+    def update(self, processed_count: int, processing_time_ms: float, queue_size: int) -> int:
+        if processing_time_ms > self.target_processing_time_ms:
+            self.size = max(self.min_size, self.size // 2)
+        elif processed_count >= self.size and queue_size > 0:
+            self.size = min(self.max_size, self.size + self.__increase_step)
+        return self.size
+
+
+class PartitionedWorkerPool:
+    """
+    Threads that process tasks partitioned by a key: tasks with the same key are processed by the same worker,
+    in the order they were submitted.
+
+    Submitting blocks while the queue of the worker is full, so the backlog stays in the ingest queue, where it
+    is limited and visible to connectors. Workers process all submitted tasks before they are stopped.
+    """
+
+    def __init__(self, workers_count: int, process_task: Callable[[Any], None], get_partition_key: Callable[[Any], Any],
+                 logger, max_worker_queue_size=1000, name="Worker"):
+        self.__process_task = process_task
+        self.__get_partition_key = get_partition_key
+        self.__stop_event = Event()
+        self.__log = logger
+        self.__queues: List[Queue] = [Queue(max_worker_queue_size) for _ in range(workers_count)]
+        self.__threads = [Thread(target=self.__work, args=(queue,), daemon=True, name="%s %i" % (name, index))
+                          for index, queue in enumerate(self.__queues)]
+        for thread in self.__threads:
+            thread.start()
+
+    def submit(self, task):
+        self.__queues[hash(self.__get_partition_key(task)) % len(self.__queues)].put(task)
+
+    def qsize(self) -> int:
+        return sum(queue.qsize() for queue in self.__queues)
+
+    def stop(self, timeout=None):
+        """Waits until the workers process the tasks left in their queues. Tasks must not be submitted after it."""
+        self.__stop_event.set()
+        for thread in self.__threads:
+            thread.join(timeout)
+
+    def __work(self, queue: Queue):
+        while not self.__stop_event.is_set() or not queue.empty():
+            try:
+                task = queue.get(timeout=0.1)
+            except Empty:
+                continue
+            try:
+                self.__process_task(task)
+            except Exception as e:
+                self.__log.error("Error while processing task!", exc_info=e)
@@ -0,0 +1,130 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+
+ScheduledKey = Tuple[DatapointKey, str, str]
+
+
+class ReportSchedule:
+    """
+    Deadline-ordered schedule of the keys that are reported periodically.
+
+    Keys are kept in a min-heap by the time of the next report, so the periodical reporting touches only the keys
+    that are due. Rescheduled and removed keys are not searched in the heap: their old entries are skipped when
+    they are popped (their deadline does not match the current one) and the heap is rebuilt when such entries
+    make up most of it.
+    """
+
+    COMPACTION_MIN_HEAP_SIZE = 1024
+
+    def __init__(self):
+        self.__heap: List[Tuple[int, int, ScheduledKey]] = []
+        # Current deadline of every key in the schedule, None for the keys returned by "pop_due"
+        self.__deadlines: Dict[ScheduledKey, Optional[int]] = {}
+        self.__keys_by_connector: Dict[str, Set[ScheduledKey]] = {}
+        # Order of insertion, keys are never compared by the heap
+        self.__counter = count()
+        self.__lock = Lock()
+
+    def schedule(self, key: ScheduledKey, deadline: int):
+        with self.__lock:
+            if key in self.__deadlines:
+                current_deadline = self.__deadlines[key]
+                if current_deadline == deadline:
+                    return
+            else:
+                current_deadline = None
+                connector_keys = self.__keys_by_connector.get(key[2])
+                if connector_keys is None:
+                    connector_keys = self.__keys_by_connector[key[2]] = set()
+                connector_keys.add(key)
+            self.__deadlines[key] = deadline
+            heappush(self.__heap, (deadline, next(self.__counter), key))
+            if current_deadline is not None:
+                # The previous entry of the key is left in the heap
+                self.__compact_if_needed()
+
+    def pop_due(self, current_time: int) -> List[ScheduledKey]:
+        """
+        Returns the keys with the deadline not later than "current_time". The keys stay in the schedule without
+        a deadline, the caller should schedule them again or remove.
+        """
+        due_keys = []
+        with self.__lock:
+            heap = self.__heap
+            deadlines = self.__deadlines
+            while heap and heap[0][0] <= current_time:
+                deadline, _, key = heappop(heap)
+                if deadlines.get(key) != deadline:
+                    continue
+                deadlines[key] = None
+                due_keys.append(key)
+        return due_keys
+
+    def reschedule_popped(self, keys: List[ScheduledKey], deadline: int):
+        """Schedules the keys returned by "pop_due" that were neither scheduled again nor removed."""
+        with self.__lock:
+            for key in keys:
+                if key in self.__deadlines and self.__deadlines[key] is None:
+                    self.__deadlines[key] = deadline
+                    heappush(self.__heap, (deadline, next(self.__counter), key))
+
+    def remove(self, key: ScheduledKey):
+        with self.__lock:
+            self.__remove(key)
+            self.__compact_if_needed()
+
+    def remove_connector(self, connector_id: str):
+        with self.__lock:
+            for key in self.__keys_by_connector.pop(connector_id, ()):
+                self.__deadlines.pop(key, None)
+            self.__compact_if_needed()
+
+    def clear(self):
+        with self.__lock:
+            self.__heap = []
+            self.__deadlines = {}
+            self.__keys_by_connector = {}
+
+    def get_next_deadline(self) -> Optional[int]:
+        with self.__lock:
+            return self.__heap[0][0] if self.__heap else None
+
+    def __contains__(self, key: ScheduledKey):
+        return key in self.__deadlines
+
+    def __len__(self):
+        return len(self.__deadlines)
+
+    def __remove(self, key: ScheduledKey):
+        if self.__deadlines.pop(key, False) is False:
+            return
+        connector_keys = self.__keys_by_connector.get(key[2])
+        if connector_keys is not None:
+            connector_keys.discard(key)
+            if not connector_keys:
+                del self.__keys_by_connector[key[2]]
+
+    def __compact_if_needed(self):
+        heap_size = len(self.__heap)
+        if heap_size > self.COMPACTION_MIN_HEAP_SIZE and heap_size > 2 * len(self.__deadlines):
+            deadlines = self.__deadlines
+            self.__heap = [entry for entry in self.__heap if deadlines.get(entry[2]) == entry[0]]
+            heapify(self.__heap)
@@ -12,18 +12,20 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from collections import OrderedDict
 from time import monotonic
 from threading import Thread, Event, Lock
 from typing import Optional, Tuple, Dict
 
 from thingsboard_gateway.gateway.constants import ReportStrategy, STRATEGIES_WITH_REPORT_PERIOD
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
-from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.report_strategy_config import AggregationFunction, ReportStrategyConfig
 
 
 class ReportStrategyDataRecord:
     __slots__ = ["_value", "_device_name", "_device_type", "_connector_name",
-                 "_connector_id", "_report_strategy", "_last_report_time", "_is_telemetry", "_ts"]
+                 "_connector_id", "_report_strategy", "_last_report_time", "_is_telemetry", "_ts",
+                 "_touch_ts", "_state"]
 
     def __init__(self, value, device_name, device_type, connector_name, connector_id, report_strategy, is_telemetry):
         self._value = value
@@ -35,14 +37,13 @@ class ReportStrategyDataRecord:
         self._last_report_time = None
         self._is_telemetry = is_telemetry
         self._ts = None
-        # TODO: Add aggregation functionality
-        # self.__aggregated_data = {
-        #     'sum': 0,
-        #     'count': 0,
-        #     'min': None,
-        #     'max': None,
-        #     'median': None,
-        # }
+        # Time of the last update in the cache, in seconds of monotonic time
+        self._touch_ts = 0
+        # State of the aggregation window or of the swinging door compression, only for the records that need it:
+        # [count, sum, min, max] or [held value, held ts, min slope, max slope]
+        self._state = None
+        if report_strategy.aggregation_function is not None:
+            self.aggregate(value)
 
     def get_value(self):
         return self._value
@@ -69,6 +70,124 @@ class ReportStrategyDataRecord:
         else:
             return False
 
+    def get_next_report_time(self):
+        # The earliest time when "should_be_reported_by_period" returns True, None if the key is not reported by period
+        if self._report_strategy.report_strategy not in STRATEGIES_WITH_REPORT_PERIOD:
+            return None
+        if self._last_report_time is None:
+            return 0
+        return self._last_report_time + self._report_strategy.report_period - 50
+
+    def is_aggregated(self):
+        return self._report_strategy.aggregation_function is not None
+
+    def aggregate(self, value):
+        """Adds the value to the aggregation window, the window is closed by "pop_aggregated_value"."""
+        self._value = value
+        state = self._state
+        if state is None:
+            state = self._state = [0, 0, None, None]
+        if self._report_strategy.aggregation_function == AggregationFunction.COUNT:
+            state[0] += 1
+            return
+        # Only numbers are aggregated, booleans are not treated as numbers
+        if type(value) not in (int, float):
+            return
+        if state[0]:
+            state[1] += value
+            if value < state[2]:
+                state[2] = value
+            elif value > state[3]:
+                state[3] = value
+        else:
+            state[1] = state[2] = state[3] = value
+        state[0] += 1
+
+    def pop_aggregated_value(self):
+        """
+        Returns the result of the aggregation function for the values received since the previous call and starts
+        a new window. Returns None if there is nothing to report for the window: no numeric values were received
+        for MIN, MAX and AVERAGE functions.
+        """
+        aggregation_function = self._report_strategy.aggregation_function
+        count, aggregated_sum, aggregated_min, aggregated_max = self._state or (0, 0, None, None)
+        if aggregation_function == AggregationFunction.COUNT:
+            result = count
+        elif aggregation_function == AggregationFunction.SUM:
+            result = aggregated_sum
+        elif not count:
+            result = None
+        elif aggregation_function == AggregationFunction.MIN:
+            result = aggregated_min
+        elif aggregation_function == AggregationFunction.MAX:
+            result = aggregated_max
+        else:
+            result = aggregated_sum / count
+        self._state = None
+        return result
+
+    def is_out_of_deadband(self, value):
+        """Checks the value against the last reported one, for DEADBAND and PERCENT_DEADBAND report strategies."""
+        last_value = self._value
+        if type(value) not in (int, float) or type(last_value) not in (int, float):
+            return value != last_value
+        deadband = self._report_strategy.deadband
+        if self._report_strategy.report_strategy == ReportStrategy.PERCENT_DEADBAND:
+            deadband = abs(last_value) * deadband / 100
+        return abs(value - last_value) > deadband
+
+    def swinging_door(self, value, ts):
+        """
+        Swinging door trending compression for SWINGING_DOOR report strategy.
+
+        The record value and ts are the last reported point. A received point is held while the straight line from
+        the last reported point to it passes within the deadband of all points received after the last reported one.
+        When the line to the new point does not, the previous received point is reported and becomes the start of
+        the next line. The last received point is always held, it is reported when the next line starts.
+
+        Returns the list of (value, ts) points to report.
+        """
+        last_value = self._value
+        last_ts = self._ts
+        state = self._state
+        if type(value) not in (int, float) or type(last_value) not in (int, float) or last_ts is None:
+            # Not a number, the value is reported on change, as well as the point held before it
+            if value == last_value:
+                return []
+            points = [] if state is None else [(state[0], state[1])]
+            points.append((value, ts))
+            self.__archive_point(value, ts)
+            return points
+        if ts <= (last_ts if state is None else state[1]):
+            # Points with the same or earlier timestamp than the last received one are out of order for the line
+            return []
+
+        deadband = self._report_strategy.deadband
+        time_delta = ts - last_ts
+        min_slope = (value - deadband - last_value) / time_delta
+        max_slope = (value + deadband - last_value) / time_delta
+        if state is None:
+            self._state = [value, ts, min_slope, max_slope]
+            return []
+        min_slope = max(state[2], min_slope)
+        max_slope = min(state[3], max_slope)
+        # The line to the point itself must be within the deadband of all held points, so the error is bounded
+        if min_slope <= (value - last_value) / time_delta <= max_slope:
+            state[:] = value, ts, min_slope, max_slope
+            return []
+
+        held_value, held_ts = state[0], state[1]
+        self.__archive_point(held_value, held_ts)
+        time_delta = ts - held_ts
+        self._state = [value, ts, (value - deadband - held_value) / time_delta,
+                       (value + deadband - held_value) / time_delta]
+        return [(held_value, held_ts)]
+
+    def __archive_point(self, value, ts):
+        self._value = value
+        self._ts = ts
+        self._state = None
+
     def to_send_format(self):
         return (self._connector_name, self._connector_id, self._device_name, self._device_type), self._value
 
@@ -77,12 +196,45 @@ class ReportStrategyDataRecord:
         return self._report_strategy
 
 
+class ReportStrategyDataCacheShard:
+    """
+    Records of one connector. Records are ordered by the time of the last update, so the least recently updated
+    records are evicted first and the expired ones are found without scanning the whole shard.
+    """
+    __slots__ = ["lock", "records", "min_ttl", "removed"]
+
+    def __init__(self):
+        self.lock = Lock()
+        self.records: Dict[Tuple, ReportStrategyDataRecord] = OrderedDict()
+        # The shortest TTL of the records, no record updated later than "now - min_ttl" can be expired
+        self.min_ttl = 0
+        # Set when the shard is removed from the cache, its records are not counted anymore
+        self.removed = False
+
+    def get_oldest_touch_ts(self):
+        with self.lock:
+            for record in self.records.values():
+                return record._touch_ts
+        return None
+
+
 class ReportStrategyDataCache:
+    # Approximate memory used by a record in the cache, including its key and the place in the shard,
+    # measured with tracemalloc for numeric values
+    ESTIMATED_RECORD_SIZE = 350
+
     def __init__(self, config, logger):
         self._config = config
-        self._data_cache: Dict[Tuple, Tuple[ReportStrategyDataRecord, float]] = {}
+        self._shards: Dict[str, ReportStrategyDataCacheShard] = {}
         self._lock = Lock()
         self._cleanup_interval = self._config.get("reportStrategyDataCacheCleanupInterval", 3600)
+        self._max_records_count = (self._config.get("reportStrategyDataCacheMaxMemoryMb", 512) * 1024 * 1024
+                                   // self.ESTIMATED_RECORD_SIZE)
+        # Running count of records in all shards, so putting a record does not sum the sizes of the shards
+        self._records_count = 0
+        self._records_count_lock = Lock()
+        self._evicted_records_count = 0
+        self._expired_records_count = 0
         self._stop_event = Event()
         self._cleanup_thread = Thread(target=self._cleanup_loop, daemon=True,
                                       name="Reporting strategy data cache cleanup thread")
@@ -96,23 +248,43 @@ class ReportStrategyDataCache:
             device_type, connector_name, connector_id, report_strategy,
             is_telemetry):
         key = (datapoint_key, device_name, connector_id)
-        expire_ts = self.__data_cache_current_ts + report_strategy.ttl if report_strategy.ttl else 0
         record = ReportStrategyDataRecord(
             data, device_name, device_type, connector_name,
             connector_id, report_strategy, is_telemetry
         )
-        with self._lock:
-            self._data_cache[key] = (record, expire_ts)
+        record._touch_ts = self.__data_cache_current_ts
+        shard = self._shards.get(connector_id)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(connector_id)
+                if shard is None:
+                    shard = self._shards[connector_id] = ReportStrategyDataCacheShard()
+        with shard.lock:
+            is_new_record = key not in shard.records
+            shard.records[key] = record
+            shard.records.move_to_end(key)
+            if report_strategy.ttl and (not shard.min_ttl or report_strategy.ttl < shard.min_ttl):
+                shard.min_ttl = report_strategy.ttl
+            if is_new_record and not shard.removed:
+                self.__change_records_count(1)
+        if self._max_records_count and self._records_count > self._max_records_count:
+            self.__evict_least_recently_updated()
 
     def get(self, datapoint_key: DatapointKey, device_name, connector_id) -> Optional[ReportStrategyDataRecord]:
+        shard = self._shards.get(connector_id)
+        if shard is None:
+            return None
         key = (datapoint_key, device_name, connector_id)
-        with self._lock:
-            item = self._data_cache.get(key)
-            if not item:
+        with shard.lock:
+            record = shard.records.get(key)
+            if record is None:
                 return None
-            record, expire_ts = item
-            if 0 < expire_ts < self.__data_cache_current_ts:
-                del self._data_cache[key]
+            ttl = record._report_strategy.ttl
+            if ttl and record._touch_ts + ttl < self.__data_cache_current_ts:
+                del shard.records[key]
+                self._expired_records_count += 1
+                if not shard.removed:
+                    self.__change_records_count(-1)
                 return None
             return record
 
@@ -125,44 +297,128 @@ class ReportStrategyDataCache:
         record = self.get(datapoint_key, device_name, connector_id)
         if record:
             record.update_value(value)
-            with self._lock:
-                expire_ts = self.__data_cache_current_ts + record.report_strategy.ttl if record.report_strategy.ttl else 0
-                self._data_cache[(datapoint_key, device_name, connector_id)] = (record, expire_ts)
+            self.__touch(record, (datapoint_key, device_name, connector_id))
+
+    def aggregate_key_value(self, datapoint_key: DatapointKey, device_name, connector_id, value):
+        record = self.get(datapoint_key, device_name, connector_id)
+        if record:
+            shard = self._shards[connector_id]
+            with shard.lock:
+                record.aggregate(value)
+            self.__touch(record, (datapoint_key, device_name, connector_id))
+
+    def swinging_door(self, datapoint_key: DatapointKey, device_name, connector_id, value, ts):
+        record = self.get(datapoint_key, device_name, connector_id)
+        if record is None:
+            return []
+        with self._shards[connector_id].lock:
+            points = record.swinging_door(value, ts)
+        self.__touch(record, (datapoint_key, device_name, connector_id))
+        return points
+
+    def pop_aggregated_value(self, record: ReportStrategyDataRecord):
+        # Under the lock, so values aggregated by connectors are not lost between reading and resetting the window
+        shard = self._shards.get(record._connector_id)
+        if shard is None:
+            return record.pop_aggregated_value()
+        with shard.lock:
+            return record.pop_aggregated_value()
 
     def update_ts(self, datapoint_key: DatapointKey, device_name, connector_id, ts):
         record = self.get(datapoint_key, device_name, connector_id)
         if record:
             record.update_ts(ts)
-            with self._lock:
-                expire_ts = self.__data_cache_current_ts + record.report_strategy.ttl if record.report_strategy.ttl else 0
-                self._data_cache[(datapoint_key, device_name, connector_id)] = (record, expire_ts)
+            self.__touch(record, (datapoint_key, device_name, connector_id))
 
     def delete_all_records_for_connector_by_connector_id(self, connector_id):
         with self._lock:
-            keys_to_delete = [key for key in self._data_cache if key[2] == connector_id]
-            for key in keys_to_delete:
-                del self._data_cache[key]
+            shard = self._shards.pop(connector_id, None)
+        if shard is not None:
+            self.__forget_shard(shard)
 
     def clear(self):
         with self._lock:
-            self._data_cache.clear()
+            shards, self._shards = self._shards, {}
+        for shard in shards.values():
+            self.__forget_shard(shard)
+
+    def get_statistics(self):
+        records_count = self._records_count
+        return {
+            "records": records_count,
+            "bytes": records_count * self.ESTIMATED_RECORD_SIZE,
+            "evicted": self._evicted_records_count,
+            "expired": self._expired_records_count
+        }
+
+    def __len__(self):
+        return self._records_count
 
     def stop(self):
         self._stop_event.set()
         self._cleanup_thread.join()
 
+    def __touch(self, record: ReportStrategyDataRecord, key):
+        shard = self._shards.get(key[2])
+        if shard is None:
+            return
+        with shard.lock:
+            record._touch_ts = self.__data_cache_current_ts
+            if key in shard.records:
+                shard.records.move_to_end(key)
+
+    def __change_records_count(self, delta):
+        with self._records_count_lock:
+            self._records_count += delta
+
+    def __forget_shard(self, shard: ReportStrategyDataCacheShard):
+        with shard.lock:
+            shard.removed = True
+            self.__change_records_count(-len(shard.records))
+
+    def __evict_least_recently_updated(self):
+        while self._records_count > self._max_records_count:
+            oldest_shard = None
+            oldest_touch_ts = None
+            for shard in tuple(self._shards.values()):
+                touch_ts = shard.get_oldest_touch_ts()
+                if touch_ts is not None and (oldest_touch_ts is None or touch_ts < oldest_touch_ts):
+                    oldest_shard, oldest_touch_ts = shard, touch_ts
+            if oldest_shard is None:
+                return
+            with oldest_shard.lock:
+                if oldest_shard.records:
+                    key, _ = oldest_shard.records.popitem(last=False)
+                    self._evicted_records_count += 1
+                    if not oldest_shard.removed:
+                        self.__change_records_count(-1)
+                    self.__logger.debug("Evicted the least recently updated record from cache: %s", key)
+
     def _cleanup_loop(self):
         while not self._stop_event.wait(1):
             self.__data_cache_current_ts = monotonic()
-            if self.__previous_cleanup_time - self.__data_cache_current_ts >= self._cleanup_interval:
+            if self.__data_cache_current_ts - self.__previous_cleanup_time >= self._cleanup_interval:
                 self.__previous_cleanup_time = monotonic()
-                with self._lock:
-
-                    keys_to_delete = []
-                    for key, (report_data_record, expire_ts) in self._data_cache.items():
-                        if report_data_record.report_strategy.report_strategy != ReportStrategy.ON_RECEIVED and \
-                                0 < expire_ts < self.__data_cache_current_ts:
-                            keys_to_delete.append(key)
-                    for key in keys_to_delete:
-                        del self._data_cache[key]
-                        self.__logger.debug("Removed expired record from cache: %s", key)
+                for shard in tuple(self._shards.values()):
+                    self.__remove_expired_records(shard)
+
+    def __remove_expired_records(self, shard: ReportStrategyDataCacheShard):
+        current_ts = self.__data_cache_current_ts
+        with shard.lock:
+            if not shard.min_ttl:
+                return
+            keys_to_delete = []
+            for key, record in shard.records.items():
+                if record._touch_ts + shard.min_ttl >= current_ts:
+                    # Records are ordered by the update time, the rest were updated later
+                    break
+                ttl = record._report_strategy.ttl
+                if (record._report_strategy.report_strategy != ReportStrategy.ON_RECEIVED
+                        and ttl and record._touch_ts + ttl < current_ts):
+                    keys_to_delete.append(key)
+            for key in keys_to_delete:
+                del shard.records[key]
+                self.__logger.debug("Removed expired record from cache: %s", key)
+            self._expired_records_count += len(keys_to_delete)
+            if not shard.removed:
+                self.__change_records_count(-len(keys_to_delete))
@@ -15,20 +15,25 @@
 from queue import SimpleQueue
 from threading import Thread, Event
 from time import monotonic, time
-from typing import Dict, Set, Union, TYPE_CHECKING
+from typing import Any, Dict, List, Tuple, Union, TYPE_CHECKING
 
 from thingsboard_gateway.gateway.constants import DEFAULT_REPORT_STRATEGY_CONFIG, \
     ReportStrategy, DEVICE_NAME_PARAMETER, DEVICE_TYPE_PARAMETER, REPORT_STRATEGY_PARAMETER, \
-    STRATEGIES_WITH_REPORT_PERIOD
+    STRATEGIES_WITH_REPORT_PERIOD, STRATEGIES_WITH_DEADBAND
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.gateway.report_strategy.report_schedule import ReportSchedule
 from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.tb_utility.tb_logger import TbLogger
 if TYPE_CHECKING:
     from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
 
+# Delay before keys of a failed periodical reporting are checked again
+FAILED_REPORT_RETRY_DELAY_MS = 1000
+
 
 class ReportStrategyService:
     def __init__(self, config: dict, gateway: 'TBGatewayService', send_data_queue: SimpleQueue, logger: TbLogger):
@@ -40,7 +45,7 @@ class ReportStrategyService:
         self.main_report_strategy = ReportStrategyConfig(report_strategy, DEFAULT_REPORT_STRATEGY_CONFIG)
         self._report_strategy_data_cache = ReportStrategyDataCache(config, self._logger)
         self._connectors_report_strategies: Dict[str, ReportStrategyConfig] = {}
-        self.__keys_to_report_periodically: Set[DatapointKey, str, str] = set()
+        self.__keys_to_report_periodically = ReportSchedule()
         self.__periodical_reporting_thread = Thread(target=self.__periodical_reporting,
                                                     daemon=True,
                                                     name="Periodical Reporting Thread")
@@ -90,6 +95,21 @@ class ReportStrategyService:
 
                     if datapoint_key.report_strategy is not None:
                         report_strategy = datapoint_key.report_strategy
+                    if report_strategy.report_strategy == ReportStrategy.SWINGING_DOOR:
+                        # Compression reports previously received points with their own timestamps
+                        for point_value, point_ts in self.filter_datapoint_by_swinging_door(datapoint_key,
+                                                                                            value,
+                                                                                            ts_kv.ts,
+                                                                                            data_to_send.device_name,
+                                                                                            data_to_send.device_type,
+                                                                                            connector_name,
+                                                                                            connector_id,
+                                                                                            report_strategy):
+                            if point_ts == ts_kv.ts:
+                                kv_to_send[datapoint_key] = point_value
+                            else:
+                                telemetry_to_send.append(TelemetryEntry({datapoint_key: point_value}, point_ts))
+                        continue
                     if self.filter_datapoint_and_cache(datapoint_key,
                                                        (value, ts_kv.ts),
                                                        data_to_send.device_name,
@@ -125,7 +145,10 @@ class ReportStrategyService:
             if attributes_to_send:
                 converted_data_to_send.add_to_attributes(attributes_to_send)
         if converted_data_to_send.telemetry or converted_data_to_send.attributes:
-            self.__send_data_queue.put_nowait((connector_name, connector_id, converted_data_to_send))
+            # The ingest queue returns False when it is full
+            accepted = self.__send_data_queue.put_nowait((connector_name, connector_id, converted_data_to_send))
+            return accepted is not False
+        return True
 
     def filter_datapoint_and_cache(self, datapoint_key: DatapointKey, data, device_name, device_type,
                                    connector_name, connector_id, report_strategy_config: ReportStrategyConfig,
@@ -156,6 +179,20 @@ class ReportStrategyService:
             return True
 
         if report_strategy_data_record is not None:
+            if report_strategy_data_record.is_aggregated():
+                # Every received value gets into the aggregation window, only the aggregate is reported by period
+                self._report_strategy_data_cache.aggregate_key_value(datapoint_key, device_name, connector_id, data)
+                if is_telemetry:
+                    self._report_strategy_data_cache.update_ts(datapoint_key, device_name, connector_id, ts)
+                return False
+            if report_strategy_config.report_strategy in STRATEGIES_WITH_DEADBAND:
+                # Swinging door compression is applied to telemetry only, attributes are reported by deadband
+                if not report_strategy_data_record.is_out_of_deadband(data):
+                    return False
+                self._report_strategy_data_cache.update_key_value(datapoint_key, device_name, connector_id, data)
+                if is_telemetry:
+                    self._report_strategy_data_cache.update_ts(datapoint_key, device_name, connector_id, ts)
+                return True
             if not self.__is_equal(report_strategy_data_record.get_value(), data):
                 if report_strategy_config.report_strategy == ReportStrategy.ON_CHANGE:
                     self._report_strategy_data_cache.update_key_value(datapoint_key, device_name, connector_id, data)
@@ -182,80 +219,113 @@ class ReportStrategyService:
             if report_strategy_config.report_strategy in STRATEGIES_WITH_REPORT_PERIOD:
                 if isinstance(datapoint_key, tuple):
                     datapoint_key, _ = datapoint_key
-                self.__keys_to_report_periodically.add((datapoint_key, device_name, connector_id))
                 self._report_strategy_data_cache.update_last_report_time(datapoint_key, device_name,
                                                                          connector_id, current_time)
+                self.__keys_to_report_periodically.schedule((datapoint_key, device_name, connector_id),
+                                                            current_time + report_strategy_config.report_period - 50)
                 if is_telemetry:
                     self._report_strategy_data_cache.update_ts(datapoint_key, device_name, connector_id, ts)
-            return True
+            # The first value of the aggregated key starts the window and is reported as a part of the aggregate
+            return report_strategy_config.aggregation_function is None
+
+    def filter_datapoint_by_swinging_door(self, datapoint_key: DatapointKey, value, ts, device_name, device_type,
+                                          connector_name, connector_id,
+                                          report_strategy_config: ReportStrategyConfig) -> List[Tuple[Any, int]]:
+        if ts is None:
+            ts = int(time() * 1000)
+        if self._report_strategy_data_cache.get(datapoint_key, device_name, connector_id) is None:
+            self._report_strategy_data_cache.put(datapoint_key, value, device_name, device_type,
+                                                 connector_name, connector_id, report_strategy_config, True)
+            self._report_strategy_data_cache.update_ts(datapoint_key, device_name, connector_id, ts)
+            return [(value, ts)]
+        return self._report_strategy_data_cache.swinging_door(datapoint_key, device_name, connector_id, value, ts)
 
     def __periodical_reporting(self):
         previous_error_printed_time = 0
         occurred_errors = 0
         report_strategy_data_cache_get = self._report_strategy_data_cache.get
+        pop_aggregated_value = self._report_strategy_data_cache.pop_aggregated_value
         send_data_queue_put_nowait = self.__send_data_queue.put_nowait
-        to_removal_by_expiration = []
+        schedule = self.__keys_to_report_periodically
         while not self.__gateway.stop_event.is_set() and not self.stop_event.is_set():
             try:
-                if not self.__keys_to_report_periodically:
+                if not schedule:
                     self.__gateway.stop_event.wait(1)
                     continue
 
                 current_time = int(monotonic() * 1000)
                 data_to_report = {}
-                for item in to_removal_by_expiration:
-                    try:
-                        self.__keys_to_report_periodically.remove(item)
-                    except KeyError:
-                        continue
-                to_removal_by_expiration.clear()
-                keys_set = set(self.__keys_to_report_periodically)
 
                 check_report_strategy_start = int(time() * 1000)
                 reported_data_length = 0
-
-                for key, device_name, connector_id in keys_set:
-                    report_strategy_data_record = report_strategy_data_cache_get(key, device_name, connector_id)
-                    if report_strategy_data_record is None:
-                        if not self.__keys_to_report_periodically:
+                due_keys = schedule.pop_due(current_time)
+
+                try:
+                    for scheduled_key in due_keys:
+                        key, device_name, connector_id = scheduled_key
+                        report_strategy_data_record = report_strategy_data_cache_get(key, device_name, connector_id)
+                        if report_strategy_data_record is None:
+                            schedule.remove(scheduled_key)
                             continue
-                        to_removal_by_expiration.append((key, device_name, connector_id))
-                        continue
-
-                    if not report_strategy_data_record.should_be_reported_by_period(current_time):
-                        continue
-
-                    data_report_key, value = report_strategy_data_record.to_send_format()
-                    if data_report_key not in data_to_report:
-                        connector_name, _, _, device_type = data_report_key
-                        metadata = {"connector": connector_name, "receivedTs": int(time() * 1000)}
-                        data_to_report[data_report_key] = ConvertedData(device_name, device_type, metadata)
-
-                    data_entry = data_to_report[data_report_key]
-                    if report_strategy_data_record.is_telemetry():
-                        # data_entry.add_to_telemetry(TelemetryEntry({key: value}, report_strategy_data_record.get_ts())) # Can be used to keep first ts, instead of overwriting it with current ts # noqa
-                        current_ts = int(time() * 1000)
-                        data_entry.add_to_telemetry(TelemetryEntry({key: value}, current_ts))
-                        report_strategy_data_record.update_ts(current_ts)
 
-                        reported_data_length += 1
-                    else:
-                        data_entry.add_to_attributes(key, value)
-                        reported_data_length += 1
+                        if not report_strategy_data_record.should_be_reported_by_period(current_time):
+                            next_report_time = report_strategy_data_record.get_next_report_time()
+                            if next_report_time is None:
+                                schedule.remove(scheduled_key)
+                            else:
+                                schedule.schedule(scheduled_key, next_report_time)
+                            continue
 
-                    report_strategy_data_record.update_last_report_time(current_time)
+                        data_report_key, value = report_strategy_data_record.to_send_format()
+                        if report_strategy_data_record.is_aggregated():
+                            value = pop_aggregated_value(report_strategy_data_record)
+                            if value is None:
+                                # Nothing to aggregate in the closed window
+                                report_strategy_data_record.update_last_report_time(current_time)
+                                schedule.schedule(scheduled_key, report_strategy_data_record.get_next_report_time())
+                                continue
+
+                        if data_report_key not in data_to_report:
+                            connector_name, _, _, device_type = data_report_key
+                            metadata = {"connector": connector_name, "receivedTs": int(time() * 1000)}
+                            data_to_report[data_report_key] = ConvertedData(device_name, device_type, metadata)
+
+                        data_entry = data_to_report[data_report_key]
+                        if report_strategy_data_record.is_telemetry():
+                            # data_entry.add_to_telemetry(TelemetryEntry({key: value}, report_strategy_data_record.get_ts())) # Can be used to keep first ts, instead of overwriting it with current ts # noqa
+                            current_ts = int(time() * 1000)
+                            data_entry.add_to_telemetry(TelemetryEntry({key: value}, current_ts))
+                            report_strategy_data_record.update_ts(current_ts)
+
+                            reported_data_length += 1
+                        else:
+                            data_entry.add_to_attributes(key, value)
+                            reported_data_length += 1
+
+                        report_strategy_data_record.update_last_report_time(current_time)
+                        schedule.schedule(scheduled_key, report_strategy_data_record.get_next_report_time())
+                except Exception:
+                    # Keys left without a deadline would never be reported again, they are retried later
+                    schedule.reschedule_popped(due_keys, current_time + FAILED_REPORT_RETRY_DELAY_MS)
+                    raise
 
                 if data_to_report:
                     for data_report_key, data in data_to_report.items():
                         connector_name, connector_id, _, _ = data_report_key
-                        send_data_queue_put_nowait((connector_name, connector_id, data))
+                        # The ingest queue returns False when it is full
+                        if send_data_queue_put_nowait((connector_name, connector_id, data)) is False:
+                            self._logger.warning("[%r] Periodical report of device %s from %s connector was dropped, "
+                                                 "the queue to storage is full", connector_id, data.device_name,
+                                                 connector_name)
+                            StatisticsService.count_connector_message(connector_name, 'storageMsgDropped')
                     data_to_report.clear()
 
                 check_report_strategy_end = int(time() * 1000)
                 if check_report_strategy_end - check_report_strategy_start > 100:
                     self._logger.warning("The periodical reporting took too long: %d ms",
                                          check_report_strategy_end - check_report_strategy_start)
-                    self._logger.warning("The number of keys to report periodically: %d", len(keys_set))
+                    self._logger.warning("The number of keys to report periodically: %d", len(schedule))
+                    self._logger.warning("The number of due keys: %d", len(due_keys))
                     self._logger.warning("The number of reported data: %d", reported_data_length)
 
                 self.__gateway.stop_event.wait(0.01)
@@ -274,12 +344,13 @@ class ReportStrategyService:
 
     def delete_all_records_for_connector_by_connector_id_and_connector_name(self, connector_id, connector_name):
         self._report_strategy_data_cache.delete_all_records_for_connector_by_connector_id(connector_id)
-        for key, device_name, _connector_id in self.__keys_to_report_periodically.copy():
-            if connector_id == _connector_id:
-                self.__keys_to_report_periodically.remove((key, device_name, connector_id))
+        self.__keys_to_report_periodically.remove_connector(connector_id)
         self._connectors_report_strategies.pop(connector_id, None)
         self._connectors_report_strategies.pop(connector_name, None)
 
+    def get_cache_statistics(self):
+        return self._report_strategy_data_cache.get_statistics()
+
     def clear_cache(self):
         self._report_strategy_data_cache.clear()
         self.__keys_to_report_periodically.clear()
@@ -49,6 +49,30 @@ SERVICE_STATS_CONFIG = [
     {
         "function": StatisticsServiceFunctions.platform_ts_produced,
         "attributeOnGateway": "platformTsProduced"
+    },
+    {
+        "function": StatisticsServiceFunctions.ingest_queue_size,
+        "attributeOnGateway": "ingestQueueSize"
+    },
+    {
+        "function": StatisticsServiceFunctions.ingest_queue_wait_time,
+        "attributeOnGateway": "ingestQueueWaitTimeMs"
+    },
+    {
+        "function": StatisticsServiceFunctions.ingest_queue_rejected,
+        "attributeOnGateway": "ingestQueueRejected"
+    },
+    {
+        "function": StatisticsServiceFunctions.report_strategy_cache_records,
+        "attributeOnGateway": "reportStrategyCacheRecords"
+    },
+    {
+        "function": StatisticsServiceFunctions.report_strategy_cache_bytes,
+        "attributeOnGateway": "reportStrategyCacheBytes"
+    },
+    {
+        "function": StatisticsServiceFunctions.report_strategy_cache_evicted,
+        "attributeOnGateway": "reportStrategyCacheEvicted"
     }
 ]
 
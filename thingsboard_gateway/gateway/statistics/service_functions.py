@@ -108,3 +108,34 @@ class StatisticsServiceFunctions:
     @staticmethod
     def platform_ts_produced(_):
         return statistics_service.StatisticsService.STATISTICS_STORAGE.get('platformTsProduced')
+
+    @staticmethod
+    def ingest_queue_size(gateway):
+        return gateway.get_ingest_queue_statistics()['size']
+
+    @staticmethod
+    def ingest_queue_wait_time(gateway):
+        return gateway.get_ingest_queue_statistics()['waitTimeMs']
+
+    @staticmethod
+    def ingest_queue_rejected(gateway):
+        return gateway.get_ingest_queue_statistics()['rejected']
+
+    @staticmethod
+    def report_strategy_cache_records(gateway):
+        return StatisticsServiceFunctions.__get_report_strategy_cache_statistics(gateway).get('records', 0)
+
+    @staticmethod
+    def report_strategy_cache_bytes(gateway):
+        return StatisticsServiceFunctions.__get_report_strategy_cache_statistics(gateway).get('bytes', 0)
+
+    @staticmethod
+    def report_strategy_cache_evicted(gateway):
+        return StatisticsServiceFunctions.__get_report_strategy_cache_statistics(gateway).get('evicted', 0)
+
+    @staticmethod
+    def __get_report_strategy_cache_statistics(gateway):
+        report_strategy_service = gateway.get_report_strategy_service()
+        if report_strategy_service is None:
+            return {}
+        return report_strategy_service.get_cache_statistics()
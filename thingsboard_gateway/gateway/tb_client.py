@@ -27,6 +27,8 @@ from copy import deepcopy
 from time import sleep, time
 from typing import Union
 
+from paho.mqtt.client import MQTT_ERR_QUEUE_SIZE
+
 from simplejson import dumps, load
 
 from thingsboard_gateway.gateway.constants import DEV_MODE_PARAMETER_NAME
@@ -36,7 +38,7 @@ try:
     if environ.get(DEV_MODE_PARAMETER_NAME) is not None and environ.get(DEV_MODE_PARAMETER_NAME).lower() == 'true':
         raise ImportError
     from tb_gateway_mqtt import TBGatewayMqttClient, TBDeviceMqttClient, \
-        GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC
+        GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC, GATEWAY_TELEMETRY_TOPIC
     import tb_device_mqtt
 except ImportError:
     mqtt_client_path = abspath(join(dirname(__file__), '..', '..', 'tb_mqtt_client'))
@@ -44,13 +46,13 @@ except ImportError:
     if exists(mqtt_client_path) and TBUtility.str_to_bool(environ.get(DEV_MODE_PARAMETER_NAME, 'false')):
         path.insert(0, mqtt_client_path)
         from tb_gateway_mqtt import TBGatewayMqttClient, TBDeviceMqttClient, \
-            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC
+            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC, GATEWAY_TELEMETRY_TOPIC
         import tb_device_mqtt
     else:
         print("tb-mqtt-client library not found - installing...")
         TBUtility.install_package('tb-mqtt-client')
         from tb_gateway_mqtt import TBGatewayMqttClient, TBDeviceMqttClient, \
-            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC
+            GATEWAY_ATTRIBUTES_RESPONSE_TOPIC, GATEWAY_ATTRIBUTES_TOPIC, GATEWAY_TELEMETRY_TOPIC
         import tb_device_mqtt
 
 tb_device_mqtt.DEFAULT_TIMEOUT = 3
@@ -457,6 +459,36 @@ class TBClient(threading.Thread):
     def get_max_payload_size(self):
         return self.client.max_payload_size # noqa pylint: disable=protected-access
 
+    def get_devices_datapoints_limit(self):
+        return int(self.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit.get_minimal_limit())  # noqa pylint: disable=protected-access
+
+    def gw_send_packed_telemetry(self, payload: bytes, datapoints_count, quality_of_service=1):
+        return self.__publish_packed(GATEWAY_TELEMETRY_TOPIC, payload, datapoints_count, quality_of_service)
+
+    def gw_send_packed_attributes(self, payload: bytes, datapoints_count, quality_of_service=1):
+        return self.__publish_packed(GATEWAY_ATTRIBUTES_TOPIC, payload, datapoints_count, quality_of_service)
+
+    def __publish_packed(self, topic, payload: bytes, datapoints_count, quality_of_service):
+        """
+        Publishes data of several devices, which is already packed into one message not bigger than
+        the maximal payload size, rate limits of devices connected through the gateway are applied to the message.
+        """
+        client = self.client
+        msg_rate_limit = client._devices_connected_through_gateway_telemetry_messages_rate_limit  # noqa pylint: disable=protected-access
+        dp_rate_limit = client._devices_connected_through_gateway_telemetry_datapoints_rate_limit  # noqa pylint: disable=protected-access
+        if msg_rate_limit.has_limit() or dp_rate_limit.has_limit():
+            msg_rate_limit.increase_rate_limit_counter()
+            dp_rate_limit.increase_rate_limit_counter(datapoints_count)
+            rate_limited = client._wait_for_rate_limit_released(tb_device_mqtt.DEFAULT_TIMEOUT, msg_rate_limit,  # noqa pylint: disable=protected-access
+                                                                dp_rate_limit, amount=datapoints_count)
+            if rate_limited:
+                return rate_limited
+        result = client._client.publish(topic, payload, qos=quality_of_service)  # noqa pylint: disable=protected-access
+        while not client.stopped and result.rc == MQTT_ERR_QUEUE_SIZE:
+            sleep(0.1)
+            result = client._client.publish(topic, payload, qos=quality_of_service)  # noqa pylint: disable=protected-access
+        return tb_device_mqtt.TBPublishInfo([result])
+
     def update_logger(self):
         self.__logger.setLevel(getLogger("tb_connection").level)
         self.__logger.handlers = getLogger("tb_connection").handlers
@@ -19,6 +19,7 @@ import logging.handlers
 import multiprocessing.managers
 import os.path
 import subprocess
+from collections import deque
 from copy import deepcopy
 from os import execv, listdir, path, pathsep, stat, system
 from platform import system as platform_system
@@ -40,19 +41,28 @@ from thingsboard_gateway.gateway.constants import DEFAULT_CONNECTORS, CONNECTED_
     PERSISTENT_GRPC_CONNECTORS_KEY_FILENAME, RENAMING_PARAMETER, CONNECTOR_NAME_PARAMETER, DEVICE_TYPE_PARAMETER, \
     CONNECTOR_ID_PARAMETER, ATTRIBUTES_FOR_REQUEST, CONFIG_VERSION_PARAMETER, CONFIG_SECTION_PARAMETER, \
     DEBUG_METADATA_TEMPLATE_SIZE, SEND_TO_STORAGE_TS_PARAMETER, DATA_RETRIEVING_STARTED, ReportStrategy, \
-    REPORT_STRATEGY_PARAMETER, DEFAULT_STATISTIC, DEFAULT_DEVICE_FILTER, CUSTOM_RPC_DIR, DISCONNECTED_PARAMETER
+    REPORT_STRATEGY_PARAMETER, DEFAULT_STATISTIC, DEFAULT_DEVICE_FILTER, CUSTOM_RPC_DIR, DISCONNECTED_PARAMETER, \
+    DEFAULT_INGEST_QUEUE_CONFIG
+from thingsboard_gateway.gateway.device_data_packer import JSON_PAYLOAD_TYPE, PROTOBUF_PAYLOAD_TYPE, \
+    DeviceDataPacker, PackedMessage
 from thingsboard_gateway.gateway.device_filter import DeviceFilter
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.ingest_queue import AdaptiveBatchSize, IngestQueue, PartitionedWorkerPool
 from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
 from thingsboard_gateway.gateway.shell.proxy import AutoProxy
 from thingsboard_gateway.gateway.statistics.decorators import CountMessage, CollectStorageEventsStatistics, \
     CollectAllSentTBBytesStatistics, CollectRPCReplyStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.gateway.tb_client import TBClient
+from thingsboard_gateway.storage.coalescing_index import COALESCING_PARAMETER, CoalescingIndex
+from thingsboard_gateway.storage.event_storage import EventStorage
 from thingsboard_gateway.storage.file.file_event_storage import FileEventStorage
+from thingsboard_gateway.storage.hybrid.hybrid_event_storage import HybridEventStorage
 from thingsboard_gateway.storage.memory.memory_event_storage import MemoryEventStorage
+from thingsboard_gateway.storage.priority_lanes import PRIORITY_LANES_PARAMETER, PriorityLanes, get_event_lane
+from thingsboard_gateway.storage.segmented_log.segmented_log_event_storage import SegmentedLogEventStorage
 from thingsboard_gateway.storage.sqlite.sqlite_event_storage import SQLiteEventStorage
 from thingsboard_gateway.tb_utility.tb_gateway_remote_configurator import RemoteConfigurator
 from thingsboard_gateway.tb_utility.tb_handler import TBRemoteLoggerHandler
@@ -156,6 +166,19 @@ class TBGatewayService:
         self._event_storage = self._event_storage_types[self.__config["storage"]["type"]](self.__config["storage"],
                                                                                           storage_log,
                                                                                           self.stop_event)
+        if self.__config["storage"].get(PRIORITY_LANES_PARAMETER):
+            self.__priority_lanes = PriorityLanes(self.__config["storage"][PRIORITY_LANES_PARAMETER],
+                                                  self._event_storage, storage_log)
+        if self.__config["storage"].get(COALESCING_PARAMETER) and self._event_storage.PERSISTENT:
+            # Coalesced values are kept only in memory, they would be lost on a crash instead of being stored
+            storage_log.warning("Coalescing is used only with a non-persistent storage, it is disabled for %s storage",
+                                self.__config["storage"]["type"])
+        elif self.__config["storage"].get(COALESCING_PARAMETER):
+            self.__coalescing_index = CoalescingIndex(self.__config["storage"][COALESCING_PARAMETER],
+                                                      self._event_storage.get_event_codec(),
+                                                      self.__priority_lanes or self._event_storage, storage_log)
+        self.__ingest_queue_config = self.__config['thingsboard'].get('ingestQueue', DEFAULT_INGEST_QUEUE_CONFIG)
+        self.__converted_data_queue = IngestQueue(self.__ingest_queue_config)
         if self.__config['thingsboard'].get('reportStrategy', {}).get('type') != "DISABLED":
             self._report_strategy_service = ReportStrategyService(self.__config['thingsboard'],
                                                                   self,
@@ -229,6 +252,15 @@ class TBGatewayService:
         self.__min_pack_send_delay_ms = self.__config['thingsboard'].get('minPackSendDelayMS', 50)
         self.__min_pack_send_delay_ms = self.__min_pack_send_delay_ms / 1000.0
         self.__min_pack_size_to_send = self.__config['thingsboard'].get('minPackSizeToSend', 500)
+        # Data of several devices is sent in one message up to the maximal payload size
+        self.__pack_devices_data = self.__config['thingsboard'].get('packDevicesData', False)
+        # Telemetry and attributes of devices are sent as JSON or as protobuf gateway messages
+        self.__payload_type = self.__config['thingsboard'].get('payloadType', JSON_PAYLOAD_TYPE).lower()
+        if self.__payload_type not in (JSON_PAYLOAD_TYPE, PROTOBUF_PAYLOAD_TYPE):
+            log.error("Unknown payload type %r, JSON payload type will be used.", self.__payload_type)
+            self.__payload_type = JSON_PAYLOAD_TYPE
+        # Count of packs published before the confirmation of the first one is awaited
+        self.__max_packs_in_flight = max(1, self.__config['thingsboard'].get('maxPacksInFlight', 1))
         self.__max_payload_size_in_bytes = self.__config["thingsboard"].get("maxPayloadSizeBytes", 8196)
 
         self._send_thread = Thread(target=self.__read_data_from_storage, daemon=True,
@@ -304,6 +336,9 @@ class TBGatewayService:
         self.__grpc_connectors = None
         self.__grpc_manager = None
         self.__remote_configurator = None
+        self.__priority_lanes = None
+        self.__coalescing_index = None
+        self.__save_converted_data_thread = None
         self.tb_client = None
         self.__requested_config_after_connect = False
         self.__rpc_reply_sent = False
@@ -330,8 +365,8 @@ class TBGatewayService:
         self.__rpc_to_devices_queue = SimpleQueue()
         self.__async_device_actions_queue = SimpleQueue()
         self.__rpc_register_queue = SimpleQueue()
-        self.__converted_data_queue = SimpleQueue()
         self.__sync_device_shared_attrs_queue = SimpleQueue()
+        self.__storage_put_lock = RLock()
 
         self.__messages_confirmation_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4) # noqa
 
@@ -343,6 +378,8 @@ class TBGatewayService:
             "memory": MemoryEventStorage,
             "file": FileEventStorage,
             "sqlite": SQLiteEventStorage,
+            "segmented_log": SegmentedLogEventStorage,
+            "hybrid": HybridEventStorage,
         }
         self.__gateway_rpc_methods = {
             "ping": self.__rpc_ping,
@@ -614,6 +651,12 @@ class TBGatewayService:
         if os.path.exists("/tmp/gateway"):
             os.remove("/tmp/gateway")
         self.__close_connectors()
+        if self.__save_converted_data_thread is not None:
+            self.__save_converted_data_thread.join(timeout=5)
+        if self.__coalescing_index is not None:
+            self.__coalescing_index.stop(self._event_storage)
+        if self.__priority_lanes is not None:
+            self.__priority_lanes.stop()
         if hasattr(self, "_event_storage") and self._event_storage is not None:
             self._event_storage.stop()
         log.info("The gateway has been stopped.")
@@ -1146,36 +1189,115 @@ class TBGatewayService:
                                           CONNECTOR_PARAMETER: connector_name})
             filtration_start = time() * 1000
             if self._report_strategy_service is not None:
-                self._report_strategy_service.filter_data_and_send(data, connector_name, connector_id)
+                accepted = self._report_strategy_service.filter_data_and_send(data, connector_name, connector_id)
             else:
-                self.__converted_data_queue.put((connector_name, connector_id, data))
+                accepted = self.__converted_data_queue.put((connector_name, connector_id, data))
             filtration_end = time() * 1000
             if self.__latency_debug_mode:
                 log.debug("Data filtration took %r ms", filtration_end - filtration_start)
+            if not accepted:
+                # Most connectors do not check the returned status, so dropped data is counted here
+                log.warning("[%r] Data from %s connector was dropped, the queue to storage is full (%d items)",
+                            connector_id, connector_name, self.__converted_data_queue.qsize())
+                StatisticsService.count_connector_message(connector_name, 'storageMsgDropped')
+                return Status.FAILURE
+            if self.__converted_data_queue.is_backpressure_active():
+                return Status.BACKPRESSURE
             return Status.SUCCESS
         except Exception as e:
             log.error("Cannot put converted data!", exc_info=e)
+            StatisticsService.count_connector_message(connector_name, 'storageMsgDropped')
+            return Status.FAILURE
+
+    def send_to_storage_many(self, connector_name, connector_id, data_list: List[ConvertedData]):
+        """
+        Puts data of several devices to the queue to storage in one call, the same as calling "send_to_storage"
+        for every item. Returns FAILURE if any item was dropped, dropped items are counted in the "storageMsgDropped"
+        statistic of the connector.
+        """
+        try:
+            if self.__device_filter:
+                allowed_data = []
+                for data in data_list:
+                    if self.__device_filter.validate_device(connector_name, data):
+                        allowed_data.append(data)
+                    else:
+                        log.warning('Device %s forbidden', data.device_name)
+                data_list = allowed_data
+            if not data_list:
+                return Status.SUCCESS
+
+            if self.__latency_debug_mode:
+                send_to_storage_metadata = {SEND_TO_STORAGE_TS_PARAMETER: int(time() * 1000),
+                                            CONNECTOR_PARAMETER: connector_name}
+                for data in data_list:
+                    if data.metadata:
+                        data.add_to_metadata(send_to_storage_metadata)
+            if self._report_strategy_service is not None:
+                accepted_count = 0
+                for data in data_list:
+                    if self._report_strategy_service.filter_data_and_send(data, connector_name, connector_id):
+                        accepted_count += 1
+            else:
+                accepted_count = self.__converted_data_queue.put_many([(connector_name, connector_id, data)
+                                                                       for data in data_list])
+            if accepted_count < len(data_list):
+                log.warning("[%r] %d of %d items from %s connector were dropped, the queue to storage is full "
+                            "(%d items)", connector_id, len(data_list) - accepted_count, len(data_list),
+                            connector_name, self.__converted_data_queue.qsize())
+                # Only the gateway knows how many items were dropped, so it counts them for the connector
+                StatisticsService.count_connector_message(connector_name, 'storageMsgDropped',
+                                                          count=len(data_list) - accepted_count)
+                return Status.FAILURE
+            if self.__converted_data_queue.is_backpressure_active():
+                return Status.BACKPRESSURE
+            return Status.SUCCESS
+        except Exception as e:
+            log.error("Cannot put converted data!", exc_info=e)
+            StatisticsService.count_connector_message(connector_name, 'storageMsgDropped', count=len(data_list))
             return Status.FAILURE
 
     def __send_to_storage(self):
+        batch_size = AdaptiveBatchSize(self.__ingest_queue_config)
+        process_event = self.__process_event
+        workers = None
+        workers_count = self.__ingest_queue_config.get('workers', 1)
+        if workers_count > 1:
+            # Events of a device are processed by the same worker, so their order is kept
+            workers = PartitionedWorkerPool(workers_count, self.__process_event, self.__get_event_device_name,
+                                            log, name="Storage fill worker")
+            process_event = workers.submit
         while not self.stopped:
             try:
-                tasks = []
-                collecting_start = int(monotonic() * 1000)
-                batch_size = 1000
-                while not self.__converted_data_queue.empty():
-                    connector_name, connector_id, event = self.__converted_data_queue.get_nowait()
-                    tasks.append((connector_name, connector_id, event))
-                    if len(tasks) >= batch_size or int(monotonic() * 1000) - collecting_start > 500:
-                        break
+                tasks = self.__converted_data_queue.get_batch(batch_size.size)
 
                 if tasks:
+                    processing_start = monotonic()
                     for task in tasks:
-                        self.__process_event(task)
+                        process_event(task)
+                    # Workers process events asynchronously, only the time of processing in this thread is known,
+                    # so the batch size is adapted without workers only
+                    if workers is None:
+                        batch_size.update(len(tasks), (monotonic() - processing_start) * 1000,
+                                          self.__converted_data_queue.qsize())
                 else:
                     self.stop_event.wait(0.01)
             except Exception as e:
                 log.error("Error while sending data to storage!", exc_info=e)
+        if workers is not None:
+            # Events left in the queues of the workers are put to storage before it is stopped
+            workers.stop()
+
+    @staticmethod
+    def __get_event_device_name(task):
+        event = task[2]
+        if isinstance(event, list):
+            event = event[0] if event else None
+        if isinstance(event, ConvertedData):
+            return event.device_name
+        if isinstance(event, dict):
+            return event.get('deviceName')
+        return None
 
     def __process_event(self, task):
         connector_name, connector_id, event = task
@@ -1377,24 +1499,34 @@ class TBGatewayService:
 
     @CollectStorageEventsStatistics('storageMsgPushed')
     def __send_data_pack_to_storage(self, data, connector_name, connector_id=None):
-        if isinstance(data, ConvertedData):
-            if self.__latency_debug_mode:
-                data.add_to_metadata({"putToStorageTs": int(time() * 1000)})
-            json_data = dumps(data.to_dict(self.__latency_debug_mode), separators=(',', ':'), skipkeys=True)
-        else:
-            json_data = dumps(data, separators=(',', ':'), skipkeys=True)
-        save_result = self._event_storage.put(json_data)
+        if isinstance(data, ConvertedData) and self.__latency_debug_mode:
+            data.add_to_metadata({"putToStorageTs": int(time() * 1000)})
+        if self.__coalescing_index is not None:
+            data = self.__coalescing_index.coalesce(data, connector_name, self.__latency_debug_mode)
+            if data is None:
+                return
+        event = self._event_storage.get_event_codec().encode(data, self.__latency_debug_mode)
+        lane = get_event_lane(data) if self.__priority_lanes is not None else None
+        # Storages are not safe for concurrent writers, events can be put by several storage fill workers
+        with self.__storage_put_lock:
+            save_result = self.__put_event(event, lane)
         tries = 4
         current_try = 0
         while not save_result and current_try < tries:
             sleep(0.1)
-            save_result = self._event_storage.put(json_data)
+            with self.__storage_put_lock:
+                save_result = self.__put_event(event, lane)
             current_try += 1
         if not save_result:
             log.error('%rData from the device "%s" cannot be saved, connector name is %s.',
                       "[" + connector_id + "] " if connector_id is not None else "",
                       data.device_name if isinstance(data, ConvertedData) else data["deviceName"], connector_name)
 
+    def __put_event(self, event, lane):
+        if self.__priority_lanes is not None:
+            return self.__priority_lanes.put(event, lane)
+        return self._event_storage.put(event)
+
     # def check_size(self, devices_data_in_event_pack, current_data_pack_size, item_size):
     #
     #     if current_data_pack_size + item_size >= self.get_max_payload_size_bytes() - max(100, self.get_max_payload_size_bytes()/10): # noqa
@@ -1412,6 +1544,13 @@ class TBGatewayService:
 
     def __read_data_from_storage(self):
         devices_data_in_event_pack = {}
+        # Packs are read from the coalescing index and the priority lanes, if they are configured,
+        # backlog of the storage is read by them
+        events_source = self.__coalescing_index or self.__priority_lanes or self._event_storage
+        # Packs published and not confirmed yet, only storages are able to read packs ahead
+        packs_in_flight = None
+        if self.__max_packs_in_flight > 1 and isinstance(events_source, EventStorage):
+            packs_in_flight = deque()
         global log
         log.debug("Send data Thread has been started successfully.")
         log.debug("Maximal size of the client message queue is: %r",
@@ -1425,73 +1564,25 @@ class TBGatewayService:
                     log = logging.getLogger('service')
                     logger_get_time = monotonic()
                 if self.tb_client.is_connected():
+                    if packs_in_flight is not None:
+                        self.__send_packs_in_flight(events_source, packs_in_flight)
+                        continue
+
                     events = []
 
                     if self.__remote_configurator is None or not self.__remote_configurator.in_process:
-                        events = self._event_storage.get_event_pack()
+                        events = events_source.get_event_pack()
 
                     if events:
                         events_len = len(events)
                         StatisticsService.add_count('storageMsgPulled', count=events_len)
 
-                        # telemetry_dp_count and attribute_dp_count using only for statistics
-                        telemetry_dp_count = 0
-                        attribute_dp_count = 0
-
                         if self.__latency_debug_mode and events_len > 100:
                             log.debug("Retrieved %r events from the storage.", events_len)
                         start_pack_processing = time()
-                        for event in events:
-                            try:
-                                current_event = loads(event)
-                            except Exception as e:
-                                log.error("Error while processing event from the storage, it will be skipped.",
-                                          exc_info=e)
-                                continue
-
-                            if not devices_data_in_event_pack.get(current_event["deviceName"]): # noqa
-                                devices_data_in_event_pack[current_event["deviceName"]] = {"telemetry": [],
-                                                                                           "attributes": {}}
-                            # start_processing_telemetry_in_event = time()
-                            has_metadata = False
-                            if current_event.get('metadata'):
-                                has_metadata = True
-                            if current_event.get("telemetry"):
-                                if isinstance(current_event["telemetry"], list):
-                                    for item in current_event["telemetry"]:
-                                        if has_metadata and item.get('ts'):
-                                            item.update({'metadata': current_event.get('metadata')})
-                                        # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                        #                                                current_event_pack_data_size,
-                                        #                                                TBUtility.get_data_size(item))
-                                        devices_data_in_event_pack[current_event["deviceName"]]["telemetry"].append(item) # noqa
-                                        telemetry_dp_count += len(item.get('values', []))
-                                else:
-                                    if has_metadata and current_event["telemetry"].get('ts'):
-                                        current_event["telemetry"].update({'metadata': current_event.get('metadata')})
-                                    # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                    #                                                current_event_pack_data_size,
-                                    #                                                TBUtility.get_data_size(current_event["telemetry"])) # noqa
-                                    devices_data_in_event_pack[current_event["deviceName"]]["telemetry"].append(current_event["telemetry"]) # noqa
-                                    telemetry_dp_count += len(current_event["telemetry"].get('values', []))
-                            # log.debug("Processing telemetry in event took %r seconds.", time() - start_processing_telemetry_in_event) # noqa
-                            # start_processing_attributes_in_event = time()
-                            if current_event.get("attributes"):
-                                if isinstance(current_event["attributes"], list):
-                                    for item in current_event["attributes"]:
-                                        # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                        #                                                current_event_pack_data_size,
-                                        #                                                TBUtility.get_data_size(item))
-                                        devices_data_in_event_pack[current_event["deviceName"]]["attributes"].update(item.items()) # noqa
-                                        attribute_dp_count += 1
-                                else:
-                                    # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                    #                                                current_event_pack_data_size,
-                                    #                                                TBUtility.get_data_size(current_event["attributes"])) # noqa
-                                    devices_data_in_event_pack[current_event["deviceName"]]["attributes"].update(current_event["attributes"].items()) # noqa
-                                    attribute_dp_count += 1
+                        telemetry_dp_count, attribute_dp_count = \
+                            self.__decode_event_pack(events, devices_data_in_event_pack)
 
-                            # log.debug("Processing attributes in event took %r seconds.", time() - start_processing_attributes_in_event) # noqa
                         log.debug("Telemetry dp count: %r and attributes dp count: %r. Counting took: %r milliseconds.",  # noqa
                                   telemetry_dp_count, attribute_dp_count, int((time() - start_pack_processing)*1000))  # noqa
                         if devices_data_in_event_pack:
@@ -1520,7 +1611,7 @@ class TBGatewayService:
                             success = self.__handle_published_events()
 
                             if success and self.tb_client.is_connected():
-                                self._event_storage.event_pack_processing_done()
+                                events_source.event_pack_processing_done()
                                 del devices_data_in_event_pack
                                 devices_data_in_event_pack = {}
                                 StatisticsService.add_count('platformTsProduced', count=telemetry_dp_count)
@@ -1531,20 +1622,82 @@ class TBGatewayService:
                     else:
                         self.stop_event.wait(self.__min_pack_send_delay_ms)
                 else:
+                    if packs_in_flight:
+                        packs_in_flight.clear()
                     self.stop_event.wait(1)
             except Exception as e:
                 log.error("Error while sending data to ThingsBoard, it will be resent.", exc_info=e)
+                if packs_in_flight:
+                    packs_in_flight.clear()
                 self.stop_event.wait(1)
         log.info("Send data Thread has been stopped successfully.")
 
-    def __handle_published_events(self):
-        events = []
+    def __send_packs_in_flight(self, events_source, packs_in_flight):
+        """
+        Keeps up to "maxPacksInFlight" packs published and not confirmed by ThingsBoard. Packs are confirmed to
+        the storage in the order they were read, if a pack is not delivered, the storage returns it again
+        and the packs following it are resent.
+        """
+        if self.__remote_configurator is not None and self.__remote_configurator.in_process:
+            packs_in_flight.clear()
+            self.stop_event.wait(self.__min_pack_send_delay_ms)
+            return
+
+        while len(packs_in_flight) < self.__max_packs_in_flight and not self.stopped:
+            events = events_source.get_next_event_pack() if packs_in_flight else events_source.get_event_pack()
+            if not events:
+                break
+            StatisticsService.add_count('storageMsgPulled', count=len(events))
+            devices_data_in_event_pack = {}
+            telemetry_dp_count, attribute_dp_count = self.__decode_event_pack(events, devices_data_in_event_pack)
+            if devices_data_in_event_pack:
+                while self.__rpc_reply_sent:
+                    self.stop_event.wait(0.01)
+                self.__send_data(devices_data_in_event_pack)
+            packs_in_flight.append((self.__get_published_events(), len(events),
+                                    telemetry_dp_count, attribute_dp_count))
+
+        if not packs_in_flight:
+            self.stop_event.wait(self.__min_pack_send_delay_ms)
+            return
 
+        published_events, events_count, telemetry_dp_count, attribute_dp_count = packs_in_flight.popleft()
+        if self.__handle_published_events(published_events) and self.tb_client.is_connected():
+            events_source.event_pack_processing_done()
+            StatisticsService.add_count('platformTsProduced', count=telemetry_dp_count)
+            StatisticsService.add_count('platformAttrProduced', count=attribute_dp_count)
+            StatisticsService.add_count('platformMsgPushed', count=events_count)
+        else:
+            packs_in_flight.clear()
+
+    def __decode_event_pack(self, events, devices_data_in_event_pack):
+        # telemetry_dp_count and attribute_dp_count using only for statistics
+        telemetry_dp_count = 0
+        attribute_dp_count = 0
+        event_codec = self._event_storage.get_event_codec()
+        for event in events:
+            try:
+                event_telemetry_dp_count, event_attribute_dp_count = \
+                    event_codec.decode_into_pack(event, devices_data_in_event_pack)
+            except Exception as e:
+                log.error("Error while processing event from the storage, it will be skipped.", exc_info=e)
+                continue
+            telemetry_dp_count += event_telemetry_dp_count
+            attribute_dp_count += event_attribute_dp_count
+        return telemetry_dp_count, attribute_dp_count
+
+    def __get_published_events(self):
+        events = []
         while not self._published_events.empty() and not self.stopped:
             try:
                 events.append(self._published_events.get_nowait())
             except Empty:
                 break
+        return events
+
+    def __handle_published_events(self, events=None):
+        if events is None:
+            events = self.__get_published_events()
 
         if not events:
             return False
@@ -1584,6 +1737,12 @@ class TBGatewayService:
     @CollectAllSentTBBytesStatistics(start_stat_type='allBytesSentToTB')
     def __send_data(self, devices_data_in_event_pack):
         try:
+            # Published timestamps are added by the client to the data of every device in latency debug mode,
+            # protobuf payloads are always packed
+            if self.__payload_type == PROTOBUF_PAYLOAD_TYPE or (self.__pack_devices_data and
+                                                                 not self.__latency_debug_mode):
+                self.__send_packed_data(devices_data_in_event_pack)
+                return
             for device in devices_data_in_event_pack:
                 final_device_name = device if self.__renamed_devices.get(device) is None else self.__renamed_devices[
                     device]
@@ -1608,6 +1767,36 @@ class TBGatewayService:
         except Exception as e:
             log.error("Error while sending data to ThingsBoard, it will be resent.", exc_info=e)
 
+    def __send_packed_data(self, devices_data_in_event_pack):
+        devices_attributes = {}
+        devices_telemetry = {}
+        for device, device_data in devices_data_in_event_pack.items():
+            if device == self.name or device == "currentThingsBoardGateway":
+                if device_data.get("attributes"):
+                    self._published_events.put(self.send_attributes(device_data["attributes"]))
+                if device_data.get("telemetry"):
+                    self._published_events.put(self.send_telemetry(device_data["telemetry"]))
+            else:
+                final_device_name = self.__renamed_devices.get(device) or device
+                if device_data.get("attributes"):
+                    devices_attributes[final_device_name] = device_data["attributes"]
+                if device_data.get("telemetry"):
+                    devices_telemetry[final_device_name] = device_data["telemetry"]
+            devices_data_in_event_pack[device] = {"telemetry": [], "attributes": {}}
+
+        packer = DeviceDataPacker(self.get_max_payload_size_bytes(), self.tb_client.get_devices_datapoints_limit(),
+                                  self.__payload_type)
+        messages, oversized_devices = packer.pack_attributes(devices_attributes)
+        for message in messages:
+            self._published_events.put(self.gw_send_packed_attributes(message))
+        for device in oversized_devices:
+            self._published_events.put(self.gw_send_attributes(device, devices_attributes[device]))
+        messages, oversized_devices = packer.pack_telemetry(devices_telemetry)
+        for message in messages:
+            self._published_events.put(self.gw_send_packed_telemetry(message))
+        for device in oversized_devices:
+            self._published_events.put(self.gw_send_telemetry(device, devices_telemetry[device]))
+
     @CountMessage('msgsReceivedFromPlatform')
     def _rpc_request_handler(self, request_id, content):
         try:
@@ -2211,6 +2400,16 @@ class TBGatewayService:
     def gw_send_attributes(self, device, attributes, quality_of_service=1):
         return self.tb_client.client.gw_send_attributes(device, attributes, quality_of_service=quality_of_service)
 
+    @CountMessage('msgsSentToPlatform')
+    def gw_send_packed_telemetry(self, message: PackedMessage, quality_of_service=1):
+        return self.tb_client.gw_send_packed_telemetry(message.payload, message.datapoints,
+                                                       quality_of_service=quality_of_service)
+
+    @CountMessage('msgsSentToPlatform')
+    def gw_send_packed_attributes(self, message: PackedMessage, quality_of_service=1):
+        return self.tb_client.gw_send_packed_attributes(message.payload, message.datapoints,
+                                                        quality_of_service=quality_of_service)
+
     # Service RPC methods ----------------
     def ping(self):
         return self.name
@@ -2261,13 +2460,24 @@ class TBGatewayService:
     def get_converted_data_queue(self):
         return self.__converted_data_queue
 
+    def is_storage_backpressure_active(self):
+        return self.__converted_data_queue.is_backpressure_active()
+
+    def get_ingest_queue_statistics(self):
+        return self.__converted_data_queue.get_statistics()
+
     # ----------------------------
     # Storage --------------------
     def get_storage_name(self):
         return self._event_storage.__class__.__name__
 
     def get_storage_events_count(self):
-        return self._event_storage.len()
+        events_count = self._event_storage.len()
+        if self.__priority_lanes is not None:
+            events_count += self.__priority_lanes.len()
+        if self.__coalescing_index is not None:
+            events_count += self.__coalescing_index.len()
+        return events_count
 
     # Connectors -----------------
     def get_available_connectors(self):
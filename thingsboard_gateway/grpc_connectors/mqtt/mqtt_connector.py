@@ -19,11 +19,13 @@ from queue import Queue
 from threading import Thread
 from time import sleep, time
 from re import fullmatch, match, search
+from typing import List
 
 from simplejson import dumps
 
 from thingsboard_gateway.connectors.mqtt.mqtt_connector import MqttConnector, MQTT_VERSIONS, RESULT_CODES_V5, \
     RESULT_CODES_V3
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.grpc_connectors.gw_grpc_connector import GwGrpcConnector, log
 from thingsboard_gateway.grpc_connectors.gw_grpc_msg_creator import GrpcMsgCreator
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
@@ -240,6 +242,8 @@ class GrpcMqttConnector(GwGrpcConnector):
         except Exception as e:
             log.exception(e)
         self._client.loop_stop()
+        for worker in self.__workers_thread_pool:
+            worker.stop()
         log.info('%s has been stopped.', self.get_name())
 
     def stop(self):
@@ -374,25 +378,25 @@ class GrpcMqttConnector(GwGrpcConnector):
 
     def put_data_to_convert(self, converter, message, content) -> bool:
         if not self.__msg_queue.full():
-            self.__msg_queue.put((converter.convert, message.topic, content), True, 100)
+            self.__msg_queue.put((converter, message.topic, content), True, 100)
             return True
         return False
 
-    def _save_converted_msg(self, topic, data):
-        basic_msg = GrpcMsgCreator.get_basic_message(None)
-        telemetry = data['telemetry']
-        attributes = data['attributes']
-        GrpcMsgCreator.create_telemetry_connector_msg(telemetry, device_name=data['deviceName'],
-                                                      basic_message=basic_msg)
-        GrpcMsgCreator.create_attributes_connector_msg(attributes, device_name=data['deviceName'],
-                                                       basic_message=basic_msg)
-        self._grpc_client.send(basic_msg)
-        self.statistics['MessagesSent'] += 1
-        log.debug("Successfully converted message from topic %s", topic)
+    def _save_converted_msgs(self, data_list: List[ConvertedData]):
+        for data in data_list:
+            data = data.to_dict()
+            basic_msg = GrpcMsgCreator.get_basic_message(None)
+            GrpcMsgCreator.create_telemetry_connector_msg(data['telemetry'], device_name=data['deviceName'],
+                                                          basic_message=basic_msg)
+            GrpcMsgCreator.create_attributes_connector_msg(data['attributes'], device_name=data['deviceName'],
+                                                           basic_message=basic_msg)
+            self._grpc_client.send(basic_msg)
+            self.statistics['MessagesSent'] += 1
+            log.debug("Successfully converted message of device %s", data['deviceName'])
 
     def __threads_manager(self):
         if len(self.__workers_thread_pool) == 0:
-            worker = MqttConnector.ConverterWorker("Main", self.__msg_queue, self._save_converted_msg)
+            worker = MqttConnector.ConverterWorker("Main", self.__msg_queue, self._save_converted_msgs, log)
             self.__workers_thread_pool.append(worker)
             worker.start()
 
@@ -401,14 +405,14 @@ class GrpcMqttConnector(GwGrpcConnector):
         if number_of_needed_threads > threads_count < self.__max_number_of_workers:
             thread = MqttConnector.ConverterWorker(
                 "Worker " + ''.join(choice(ascii_lowercase) for _ in range(5)), self.__msg_queue,
-                self._save_converted_msg)
+                self._save_converted_msgs, log)
             self.__workers_thread_pool.append(thread)
             thread.start()
         elif number_of_needed_threads < threads_count and threads_count > 1:
+            # Workers share the queue, a stopped worker leaves the rest of the messages to the others
             worker: MqttConnector.ConverterWorker = self.__workers_thread_pool[-1]
-            if not worker.in_progress:
-                worker.stopped = True
-                self.__workers_thread_pool.remove(worker)
+            worker.stop()
+            self.__workers_thread_pool.remove(worker)
 
     def _on_message(self, client, userdata, message, *extra_params):
         self._on_message_queue.put((client, userdata, message))
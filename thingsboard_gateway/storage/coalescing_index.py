@@ -0,0 +1,180 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from itertools import islice
+from threading import Lock
+from time import time
+from typing import Optional, Union
+
+from thingsboard_gateway.gateway.constants import ATTRIBUTES_PARAMETER, DEVICE_NAME_PARAMETER, \
+    DEVICE_TYPE_PARAMETER, METADATA_PARAMETER, TELEMETRY_PARAMETER, TELEMETRY_TIMESTAMP_PARAMETER, \
+    TELEMETRY_VALUES_PARAMETER
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.storage.event_codec import EventCodec
+
+COALESCING_PARAMETER = "coalescing"
+
+
+class CoalescingIndex:
+    """
+    Keeps only the latest value per device and key for attributes and for telemetry keys marked as state-like,
+    so a long outage does not leave every sample of these keys in the storage backlog.
+    Coalesced values are removed from the data before it is put into the storage and are read before
+    the events of the source (the storage or the priority lanes), the rest of the data is stored as usual.
+    An event pack has the values of at most "read_records_count" devices, the rest are left in the index.
+    The index is kept in memory, its values are put into the storage on stop. Coalesced values would be lost
+    on a crash, so the gateway uses the index only with a non-persistent storage.
+    """
+
+    def __init__(self, config: dict, event_codec: EventCodec, source, logger):
+        self.__log = logger
+        self.__event_codec = event_codec
+        self.__source = source
+        self.__coalesce_attributes = config.get("attributes", True)
+        self.__telemetry_keys = set(config.get("telemetry_keys", []))
+        self.__connectors = set(config["connectors"]) if config.get("connectors") else None
+        self.__read_records_count = config.get("read_records_count", 1000)
+        # Device name -> [device type, attributes, telemetry key -> (ts, value), metadata of the latest data]
+        self.__devices = {}
+        self.__lock = Lock()
+        self.__event_pack = []
+        self.__event_pack_from_source = False
+
+    def coalesce(self, data: Union[ConvertedData, dict], connector_name=None,
+                 with_metadata=False) -> Optional[Union[ConvertedData, dict]]:
+        """Moves the coalesced values into the index, returns the rest of the data or None if nothing is left."""
+        if self.__connectors is not None and connector_name not in self.__connectors:
+            return data
+        if isinstance(data, ConvertedData):
+            if not self.__has_coalesced_values(data):
+                return data
+            data = data.to_dict(with_metadata)
+
+        attributes = data.get(ATTRIBUTES_PARAMETER) or {}
+        if isinstance(attributes, list):
+            merged_attributes = {}
+            for item in attributes:
+                merged_attributes.update(item)
+            attributes = merged_attributes
+        telemetry = data.get(TELEMETRY_PARAMETER) or []
+        if isinstance(telemetry, dict):
+            telemetry = [telemetry]
+
+        coalesced_attributes = attributes if self.__coalesce_attributes else {}
+        coalesced_telemetry = {}
+        left_telemetry = []
+        for item in telemetry:
+            if TELEMETRY_VALUES_PARAMETER in item:
+                ts = item.get(TELEMETRY_TIMESTAMP_PARAMETER) or int(time() * 1000)
+                values = item[TELEMETRY_VALUES_PARAMETER]
+            else:
+                ts, values = int(time() * 1000), item
+            left_values = {}
+            for key, value in values.items():
+                if key in self.__telemetry_keys:
+                    if key not in coalesced_telemetry or coalesced_telemetry[key][0] <= ts:
+                        coalesced_telemetry[key] = (ts, value)
+                else:
+                    left_values[key] = value
+            if left_values:
+                left_item = dict(item) if TELEMETRY_VALUES_PARAMETER in item else {TELEMETRY_TIMESTAMP_PARAMETER: ts}
+                left_item[TELEMETRY_VALUES_PARAMETER] = left_values
+                left_telemetry.append(left_item)
+
+        if not coalesced_attributes and not coalesced_telemetry:
+            return data
+        device_name = data.get(DEVICE_NAME_PARAMETER)
+        with self.__lock:
+            device = self.__devices.get(device_name)
+            if device is None:
+                device = [data.get(DEVICE_TYPE_PARAMETER), {}, {}, None]
+                self.__devices[device_name] = device
+            if data.get(METADATA_PARAMETER):
+                device[3] = data[METADATA_PARAMETER]
+            device[1].update(coalesced_attributes)
+            device_telemetry = device[2]
+            for key, ts_and_value in coalesced_telemetry.items():
+                if key not in device_telemetry or device_telemetry[key][0] <= ts_and_value[0]:
+                    device_telemetry[key] = ts_and_value
+
+        left_attributes = {} if self.__coalesce_attributes else attributes
+        if not left_telemetry and not left_attributes:
+            return None
+        left_data = dict(data)
+        left_data[TELEMETRY_PARAMETER] = left_telemetry
+        left_data[ATTRIBUTES_PARAMETER] = left_attributes
+        return left_data
+
+    def get_event_pack(self):
+        if self.__event_pack_from_source:
+            return self.__source.get_event_pack()
+        if self.__event_pack:
+            return self.__event_pack
+        with self.__lock:
+            devices = [(device_name, self.__devices.pop(device_name))
+                       for device_name in list(islice(self.__devices, self.__read_records_count))]
+        if devices:
+            self.__event_pack = [self.__event_codec.encode(self.__to_data(device_name, device))
+                                 for device_name, device in devices]
+            return self.__event_pack
+        event_pack = self.__source.get_event_pack()
+        self.__event_pack_from_source = bool(event_pack)
+        return event_pack
+
+    def event_pack_processing_done(self):
+        if self.__event_pack_from_source:
+            self.__source.event_pack_processing_done()
+            self.__event_pack_from_source = False
+        self.__event_pack = []
+
+    def stop(self, storage):
+        with self.__lock:
+            events = self.__event_pack + [self.__event_codec.encode(self.__to_data(device_name, device))
+                                          for device_name, device in self.__devices.items()]
+            for index, event in enumerate(events):
+                if not storage.put(event):
+                    self.__log.error("Failed to save %i coalesced events on stop!", len(events) - index)
+                    break
+            self.__event_pack = []
+            self.__devices = {}
+
+    def len(self):
+        return len(self.__event_pack) + len(self.__devices)
+
+    def __has_coalesced_values(self, data: ConvertedData) -> bool:
+        if self.__coalesce_attributes and data.attributes_datapoints_count:
+            return True
+        if self.__telemetry_keys:
+            for entry in data.telemetry:
+                for key in entry.values:
+                    if getattr(key, "key", key) in self.__telemetry_keys:
+                        return True
+        return False
+
+    @staticmethod
+    def __to_data(device_name, device) -> dict:
+        device_type, attributes, telemetry, metadata = device
+        telemetry_by_ts = {}
+        for key, (ts, value) in telemetry.items():
+            telemetry_by_ts.setdefault(ts, {})[key] = value
+        data = {
+            DEVICE_NAME_PARAMETER: device_name,
+            DEVICE_TYPE_PARAMETER: device_type,
+            ATTRIBUTES_PARAMETER: attributes,
+            TELEMETRY_PARAMETER: [{TELEMETRY_TIMESTAMP_PARAMETER: ts, TELEMETRY_VALUES_PARAMETER: values}
+                                  for ts, values in telemetry_by_ts.items()],
+        }
+        if metadata:
+            data[METADATA_PARAMETER] = metadata
+        return data
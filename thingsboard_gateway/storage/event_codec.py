@@ -0,0 +1,284 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from orjson import JSONEncodeError, OPT_NON_STR_KEYS, dumps as orjson_dumps, loads as orjson_loads
+from simplejson import dumps, loads
+
+from thingsboard_gateway.gateway.constants import DEVICE_NAME_PARAMETER, DEVICE_TYPE_PARAMETER, \
+    TELEMETRY_PARAMETER, ATTRIBUTES_PARAMETER, METADATA_PARAMETER, TELEMETRY_TIMESTAMP_PARAMETER, \
+    TELEMETRY_VALUES_PARAMETER
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+
+EVENT_FORMAT_PARAMETER = "event_format"
+DEFAULT_EVENT_FORMAT = "json"
+
+# The first byte of every binary event. 0xB1 is a UTF-8 continuation byte, so it can never start
+# a valid JSON document and the event format can be detected without any extra markers.
+BINARY_EVENT_MAGIC = b'\xb1'
+BINARY_EVENT_VERSION = 1
+BINARY_EVENT_HEADER = BINARY_EVENT_MAGIC + bytes((BINARY_EVENT_VERSION,))
+
+
+def is_binary_event(event) -> bool:
+    return isinstance(event, (bytes, bytearray)) and event[:1] == BINARY_EVENT_MAGIC
+
+
+class EventCodec(ABC):
+    """
+    Serializes data packs before they are put into the event storage and restores them when the send thread
+    reads them back. Decoding does not depend on the configured codec: the format of every event is detected
+    from its first byte, so switching "event_format" never makes already stored events unreadable.
+    """
+
+    name = None
+    # False for codecs whose events are live Python objects, they can only be used by in-memory storages
+    persistent = True
+
+    @abstractmethod
+    def encode(self, data: Union[ConvertedData, dict], with_metadata=False) -> Union[str, bytes]:
+        pass
+
+    @staticmethod
+    def decode(event) -> dict:
+        if is_binary_event(event):
+            return BinaryEventCodec.decode_binary(event)
+        if isinstance(event, StoredEvent):
+            return event.to_dict()
+        return loads(event)
+
+    def decode_into_pack(self, event, devices_data_in_event_pack: Dict[str, dict]) -> Tuple[int, int]:
+        """
+        Decodes the event and merges its telemetry and attributes into the per-device groups of the pack.
+        Returns the number of telemetry and attribute datapoints that were added.
+        """
+        current_event = self.decode(event)
+        device_name = current_event[DEVICE_NAME_PARAMETER]
+        device_data = devices_data_in_event_pack.get(device_name)
+        if not device_data:
+            device_data = {TELEMETRY_PARAMETER: [], ATTRIBUTES_PARAMETER: {}}
+            devices_data_in_event_pack[device_name] = device_data
+
+        telemetry_dp_count = 0
+        attribute_dp_count = 0
+        metadata = current_event.get(METADATA_PARAMETER)
+
+        telemetry = current_event.get(TELEMETRY_PARAMETER)
+        if telemetry:
+            if not isinstance(telemetry, list):
+                telemetry = [telemetry]
+            device_telemetry = device_data[TELEMETRY_PARAMETER]
+            for item in telemetry:
+                if metadata and item.get(TELEMETRY_TIMESTAMP_PARAMETER):
+                    item[METADATA_PARAMETER] = metadata
+                device_telemetry.append(item)
+                telemetry_dp_count += len(item.get(TELEMETRY_VALUES_PARAMETER, []))
+
+        attributes = current_event.get(ATTRIBUTES_PARAMETER)
+        if attributes:
+            device_attributes = device_data[ATTRIBUTES_PARAMETER]
+            if isinstance(attributes, list):
+                for item in attributes:
+                    device_attributes.update(item)
+                    attribute_dp_count += 1
+            else:
+                device_attributes.update(attributes)
+                attribute_dp_count += 1
+
+        return telemetry_dp_count, attribute_dp_count
+
+
+class JsonEventCodec(EventCodec):
+    """Compatibility codec, stores every event as a compact JSON string."""
+
+    name = "json"
+
+    def encode(self, data: Union[ConvertedData, dict], with_metadata=False) -> str:
+        if isinstance(data, ConvertedData):
+            data = data.to_dict(with_metadata)
+        return dumps(data, separators=(',', ':'), skipkeys=True)
+
+
+class BinaryEventCodec(EventCodec):
+    """
+    Compact framed layout: 2 bytes header (magic, version) followed by an orjson-encoded array
+
+    [deviceName, deviceType, attributes, [[ts, values], ...], metadata]
+
+    The positional layout drops the repeated "deviceName"/"telemetry"/"ts"/"values" keys of the JSON format and
+    encoding/decoding runs in native code, no per-value work is done in Python.
+    """
+
+    name = "binary"
+
+    def encode(self, data: Union[ConvertedData, dict], with_metadata=False) -> bytes:
+        if isinstance(data, ConvertedData):
+            frame = [
+                data.device_name,
+                data.device_type,
+                data.attributes.to_dict(),
+                [[entry.ts, {key.key if isinstance(key, DatapointKey) else key: value
+                             for key, value in entry.values.items()}]
+                 for entry in data.telemetry],
+                data.metadata if with_metadata and data.metadata else None
+            ]
+        else:
+            attributes = data.get(ATTRIBUTES_PARAMETER) or {}
+            if isinstance(attributes, list):
+                merged_attributes = {}
+                for item in attributes:
+                    merged_attributes.update(item)
+                attributes = merged_attributes
+            telemetry = data.get(TELEMETRY_PARAMETER) or []
+            if isinstance(telemetry, dict):
+                telemetry = [telemetry]
+            try:
+                telemetry = [[item[TELEMETRY_TIMESTAMP_PARAMETER], item[TELEMETRY_VALUES_PARAMETER]]
+                             for item in telemetry]
+            except (KeyError, TypeError):
+                # Telemetry without timestamps cannot be represented in the binary layout
+                return JsonEventCodec().encode(data, with_metadata)
+            frame = [data.get(DEVICE_NAME_PARAMETER), data.get(DEVICE_TYPE_PARAMETER), attributes, telemetry,
+                     data.get(METADATA_PARAMETER) or None]
+
+        try:
+            return BINARY_EVENT_HEADER + orjson_dumps(frame, option=OPT_NON_STR_KEYS)
+        except JSONEncodeError:
+            # Values that orjson does not support (e.g. Decimal) are still stored in the compatible format
+            return JsonEventCodec().encode(data, with_metadata)
+
+    @staticmethod
+    def decode_binary(event) -> dict:
+        if event[1] != BINARY_EVENT_VERSION:
+            raise ValueError("Unsupported binary event version: %r" % event[1])
+        device_name, device_type, attributes, telemetry, metadata = orjson_loads(memoryview(event)[2:])
+        result = {
+            DEVICE_NAME_PARAMETER: device_name,
+            DEVICE_TYPE_PARAMETER: device_type,
+            TELEMETRY_PARAMETER: [{TELEMETRY_TIMESTAMP_PARAMETER: ts, TELEMETRY_VALUES_PARAMETER: values}
+                                  for ts, values in telemetry],
+            ATTRIBUTES_PARAMETER: attributes
+        }
+        if metadata:
+            result[METADATA_PARAMETER] = metadata
+        return result
+
+
+class StoredEvent(NamedTuple):
+    """
+    Immutable snapshot of a data pack, queued as-is by the in-memory storage.
+    Telemetry items and attributes are already in the form used for sending, keyed by plain strings.
+    """
+
+    device_name: str
+    device_type: Optional[str]
+    attributes: Dict[str, Any]
+    telemetry: List[Dict[str, Any]]
+    metadata: Optional[dict]
+    telemetry_datapoints_count: int
+
+    def to_dict(self) -> dict:
+        result = {
+            DEVICE_NAME_PARAMETER: self.device_name,
+            DEVICE_TYPE_PARAMETER: self.device_type,
+            TELEMETRY_PARAMETER: self.telemetry,
+            ATTRIBUTES_PARAMETER: self.attributes
+        }
+        if self.metadata:
+            result[METADATA_PARAMETER] = self.metadata
+        return result
+
+
+class ObjectEventCodec(EventCodec):
+    """
+    Zero-copy codec for the memory storage: data packs are neither serialized nor parsed, the send thread
+    receives a frozen snapshot of the ConvertedData and merges it into the pack directly.
+    Datapoints are counted while the converter fills the ConvertedData, so no per-value work is left
+    for the send thread.
+    """
+
+    name = "object"
+    persistent = False
+
+    def encode(self, data: Union[ConvertedData, dict], with_metadata=False) -> StoredEvent:
+        if isinstance(data, ConvertedData):
+            return StoredEvent(data.device_name,
+                               data.device_type,
+                               data.attributes.to_dict(),
+                               [{TELEMETRY_TIMESTAMP_PARAMETER: entry.ts,
+                                 TELEMETRY_VALUES_PARAMETER: {key.key if isinstance(key, DatapointKey) else key: value
+                                                              for key, value in entry.values.items()}}
+                                for entry in data.telemetry],
+                               data.metadata if with_metadata and data.metadata else None,
+                               data.telemetry_datapoints_count)
+
+        attributes = data.get(ATTRIBUTES_PARAMETER) or {}
+        if isinstance(attributes, list):
+            merged_attributes = {}
+            for item in attributes:
+                merged_attributes.update(item)
+            attributes = merged_attributes
+        telemetry = data.get(TELEMETRY_PARAMETER) or []
+        if isinstance(telemetry, dict):
+            telemetry = [telemetry]
+        telemetry_datapoints_count = 0
+        for item in telemetry:
+            telemetry_datapoints_count += len(item.get(TELEMETRY_VALUES_PARAMETER, []))
+        return StoredEvent(data.get(DEVICE_NAME_PARAMETER), data.get(DEVICE_TYPE_PARAMETER), dict(attributes),
+                           list(telemetry), data.get(METADATA_PARAMETER) or None, telemetry_datapoints_count)
+
+    def decode_into_pack(self, event, devices_data_in_event_pack: Dict[str, dict]) -> Tuple[int, int]:
+        if not isinstance(event, StoredEvent):
+            return super().decode_into_pack(event, devices_data_in_event_pack)
+
+        device_data = devices_data_in_event_pack.get(event.device_name)
+        if not device_data:
+            device_data = {TELEMETRY_PARAMETER: [], ATTRIBUTES_PARAMETER: {}}
+            devices_data_in_event_pack[event.device_name] = device_data
+
+        if event.telemetry:
+            if event.metadata:
+                # The stored event can be read again if the pack is not sent, so its telemetry is not changed
+                device_data[TELEMETRY_PARAMETER].extend({**item, METADATA_PARAMETER: event.metadata}
+                                                        if item.get(TELEMETRY_TIMESTAMP_PARAMETER) else item
+                                                        for item in event.telemetry)
+            else:
+                device_data[TELEMETRY_PARAMETER].extend(event.telemetry)
+
+        attribute_dp_count = 0
+        if event.attributes:
+            device_data[ATTRIBUTES_PARAMETER].update(event.attributes)
+            attribute_dp_count = 1
+
+        return event.telemetry_datapoints_count, attribute_dp_count
+
+
+EVENT_CODECS = {
+    JsonEventCodec.name: JsonEventCodec,
+    BinaryEventCodec.name: BinaryEventCodec,
+    ObjectEventCodec.name: ObjectEventCodec,
+}
+
+
+def get_event_codec(event_format=None) -> EventCodec:
+    if event_format is None:
+        event_format = DEFAULT_EVENT_FORMAT
+    codec_class = EVENT_CODECS.get(str(event_format).lower())
+    if codec_class is None:
+        raise ValueError("Unknown storage event format: %r, supported formats: %s"
+                         % (event_format, ', '.join(EVENT_CODECS)))
+    return codec_class()
@@ -0,0 +1,153 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import zlib
+from typing import Union
+
+from thingsboard_gateway.storage.event_codec import is_binary_event
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+EVENT_COMPRESSION_PARAMETER = "compression"
+EVENT_COMPRESSION_LEVEL_PARAMETER = "compression_level"
+
+# The first byte of every compressed event, like the binary event magic it can never start a valid JSON document.
+# The second byte is the id of the algorithm together with the dictionary used to compress the event.
+COMPRESSED_EVENT_MAGIC = b'\xb2'
+
+# Preset dictionary with the parts that are repeated in every stored event of both event formats,
+# the most frequent ones are placed at the end. Events are compressed one by one, so without the dictionary
+# the compressor would see every key for the first time. The dictionary of an algorithm id must never be changed,
+# a new id has to be added instead, otherwise the events stored before the change could not be decompressed.
+EVENT_DICTIONARY = (b'"metadata":{"receivedTs":,"publishedTs":,"connector":"}'
+                    b'"status":"state":"value":"voltage":"current":"power":"pressure":"humidity":"temperature":'
+                    b'"attributes":{},"deviceType":"default",'
+                    b'}]],null]",{},[[17'
+                    b'"telemetry":[{"ts":17,"values":{"'
+                    b'{"deviceName":"')
+
+
+def is_compressed_event(event) -> bool:
+    return isinstance(event, (bytes, bytearray)) and event[:1] == COMPRESSED_EVENT_MAGIC
+
+
+class EventCompressor:
+    """
+    Compresses events before they are written by the persistent storages. Decompression does not depend
+    on the configured algorithm: compressed events are detected by their first byte, so the events stored
+    without compression or with another algorithm are still readable after the configuration is changed.
+    """
+
+    name = None
+    algorithm_id = None
+
+    def compress(self, event: Union[str, bytes]) -> Union[str, bytes]:
+        return event
+
+    @staticmethod
+    def decompress(event):
+        if not is_compressed_event(event):
+            return event
+        decompressor = EVENT_DECOMPRESSORS.get(event[1])
+        if decompressor is None:
+            raise ValueError("Unsupported compressed event algorithm: %r" % event[1])
+        record = decompressor(memoryview(event)[2:])
+        return record if is_binary_event(record) else record.decode("utf-8")
+
+    def decompress_pack(self, events: list) -> list:
+        return [self.decompress(event) for event in events]
+
+
+class ZlibEventCompressor(EventCompressor):
+    name = "zlib"
+    algorithm_id = 1
+
+    def __init__(self, level=None):
+        self.__level = 6 if level is None else level
+        self.__header = COMPRESSED_EVENT_MAGIC + bytes((self.algorithm_id,))
+
+    def compress(self, event: Union[str, bytes]) -> bytes:
+        compressor = zlib.compressobj(self.__level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=EVENT_DICTIONARY)
+        data = event.encode("utf-8") if isinstance(event, str) else event
+        return self.__header + compressor.compress(data) + compressor.flush()
+
+    @staticmethod
+    def decompress_zlib(data) -> bytes:
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=EVENT_DICTIONARY)
+        return decompressor.decompress(data) + decompressor.flush()
+
+
+class ZstdEventCompressor(EventCompressor):
+    name = "zstd"
+    algorithm_id = 2
+
+    def __init__(self, level=None):
+        self.__compressor = zstandard.ZstdCompressor(level=3 if level is None else level,
+                                                     dict_data=get_zstd_dictionary(),
+                                                     write_checksum=False, write_content_size=True,
+                                                     write_dict_id=False)
+        self.__header = COMPRESSED_EVENT_MAGIC + bytes((self.algorithm_id,))
+
+    def compress(self, event: Union[str, bytes]) -> bytes:
+        data = event.encode("utf-8") if isinstance(event, str) else event
+        return self.__header + self.__compressor.compress(data)
+
+    @staticmethod
+    def decompress_zstd(data) -> bytes:
+        if zstandard is None:
+            raise ValueError("Event is compressed with zstd, but \"zstandard\" package is not installed")
+        return zstandard.ZstdDecompressor(dict_data=get_zstd_dictionary()).decompress(data)
+
+
+_zstd_dictionary = None
+
+
+def get_zstd_dictionary():
+    global _zstd_dictionary
+    if _zstd_dictionary is None:
+        _zstd_dictionary = zstandard.ZstdCompressionDict(EVENT_DICTIONARY, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+    return _zstd_dictionary
+
+
+EVENT_COMPRESSORS = {
+    ZlibEventCompressor.name: ZlibEventCompressor,
+    ZstdEventCompressor.name: ZstdEventCompressor,
+}
+
+EVENT_DECOMPRESSORS = {
+    ZlibEventCompressor.algorithm_id: ZlibEventCompressor.decompress_zlib,
+    ZstdEventCompressor.algorithm_id: ZstdEventCompressor.decompress_zstd,
+}
+
+
+def get_event_compressor(config, logger) -> EventCompressor:
+    if isinstance(config, dict):
+        compression = config.get(EVENT_COMPRESSION_PARAMETER)
+        level = config.get(EVENT_COMPRESSION_LEVEL_PARAMETER)
+    else:
+        compression = getattr(config, EVENT_COMPRESSION_PARAMETER, None)
+        level = getattr(config, EVENT_COMPRESSION_LEVEL_PARAMETER, None)
+    if compression is None or str(compression).lower() == "none":
+        return EventCompressor()
+    compressor_class = EVENT_COMPRESSORS.get(str(compression).lower())
+    if compressor_class is None:
+        raise ValueError("Unknown storage compression: %r, supported compressions: %s"
+                         % (compression, ', '.join(EVENT_COMPRESSORS)))
+    if compressor_class is ZstdEventCompressor and zstandard is None:
+        logger.warning("Compression \"zstd\" requires \"zstandard\" package, \"zlib\" will be used.")
+        compressor_class = ZlibEventCompressor
+    return compressor_class(level)
@@ -14,12 +14,27 @@
 
 from abc import ABC, abstractmethod
 
+from thingsboard_gateway.storage.event_codec import DEFAULT_EVENT_FORMAT, EVENT_FORMAT_PARAMETER, EventCodec, \
+    get_event_codec
+from thingsboard_gateway.storage.event_compression import EventCompressor, get_event_compressor
+
 
 class EventStorage(ABC):
+    # Persistent storages write events out of the process and cannot keep them as Python objects
+    PERSISTENT = True
 
     def __init__(self, config, logger, main_stop_event):
         self._config = config
         self._main_stop_event = main_stop_event
+        event_format = config.get(EVENT_FORMAT_PARAMETER) if isinstance(config, dict) \
+            else getattr(config, EVENT_FORMAT_PARAMETER, None)
+        self._event_codec = get_event_codec(event_format)
+        if self.PERSISTENT and not self._event_codec.persistent:
+            logger.warning("Event format \"%s\" is supported only by the memory storage, \"%s\" will be used.",
+                           self._event_codec.name, DEFAULT_EVENT_FORMAT)
+            self._event_codec = get_event_codec(DEFAULT_EVENT_FORMAT)
+        # Used by the persistent storages to compress events before they are written and to decompress them on read
+        self._event_compressor = get_event_compressor(config, logger) if self.PERSISTENT else EventCompressor()
 
     @abstractmethod
     def put(self, event):
@@ -35,6 +50,12 @@ class EventStorage(ABC):
         # Indicates that events from previous "get_event_pack" may be cleared
         pass
 
+    def get_next_event_pack(self):
+        # Returns the pack following the packs returned before and not processed yet, so several packs can be sent
+        # at once. "event_pack_processing_done" processes the oldest returned pack, "get_event_pack" returns it again.
+        # Storages that cannot read further return nothing while a pack is processed.
+        return []
+
     @abstractmethod
     def stop(self):
         # Stop the storage processing
@@ -50,3 +71,7 @@ class EventStorage(ABC):
 
     def get_configuration(self):
         return self._config
+
+    def get_event_codec(self) -> EventCodec:
+        # Codec used by the gateway to encode events before "put" and to decode events from "get_event_pack"
+        return self._event_codec
@@ -57,7 +57,7 @@ class EventStorageWriter:
                     self.__log.warning("Failed to close buffered writer! %s", e)
                 self.buffered_writer = None
             try:
-                encoded = b64encode(msg.encode("utf-8"))
+                encoded = b64encode(msg if isinstance(msg, bytes) else msg.encode("utf-8"))
                 if not exists(self.settings.get_data_folder_path() + self.current_file):
                     self.current_file = self.create_datafile()
                 self.buffered_writer = self.get_or_init_buffered_writer(self.current_file)
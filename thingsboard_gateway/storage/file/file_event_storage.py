@@ -42,7 +42,7 @@ class FileEventStorage(EventStorage):
         success = False
         if not self.__stopped:
             try:
-                self.__writer.write(event)
+                self.__writer.write(self._event_compressor.compress(event))
             except DataFileCountError as e:
                 self.__log.error("Failed to write event to storage! Error: %s", e)
             except Exception as e:
@@ -54,7 +54,7 @@ class FileEventStorage(EventStorage):
         return success
 
     def get_event_pack(self):
-        return self.__reader.read()
+        return self._event_compressor.decompress_pack(self.__reader.read())
 
     def event_pack_processing_done(self):
         self.__reader.discard_batch()
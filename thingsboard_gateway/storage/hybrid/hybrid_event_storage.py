@@ -0,0 +1,124 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from logging import getLogger
+from threading import Lock
+
+from thingsboard_gateway.storage.event_codec import EVENT_FORMAT_PARAMETER
+from thingsboard_gateway.storage.event_compression import EVENT_COMPRESSION_LEVEL_PARAMETER, \
+    EVENT_COMPRESSION_PARAMETER
+from thingsboard_gateway.storage.event_storage import EventStorage
+from thingsboard_gateway.storage.file.file_event_storage import FileEventStorage
+from thingsboard_gateway.storage.segmented_log.segmented_log_event_storage import SegmentedLogEventStorage
+from thingsboard_gateway.storage.sqlite.sqlite_event_storage import SQLiteEventStorage
+
+PERSISTENT_STORAGE_TYPES = {
+    "file": FileEventStorage,
+    "sqlite": SQLiteEventStorage,
+    "segmented_log": SegmentedLogEventStorage,
+}
+
+
+class HybridEventStorage(EventStorage):
+    """
+    Keeps events in the bounded memory ring while the uplink keeps up with them. When the ring is full,
+    the oldest events are spilled to the persistent storage, they are read before the events from the ring,
+    so the order of the events is preserved. Events left in the ring are spilled on stop.
+    """
+
+    def __init__(self, config, logger, main_stop_event):
+        super().__init__(config, logger, main_stop_event)
+        self.__log = logger
+        self.__max_records_count = config.get("max_records_count", 10000)
+        self.__events_per_time = config.get("read_records_count", 1000)
+        persistent_storage_config = dict(config.get("persistent_storage", {"type": "sqlite"}))
+        persistent_storage_config.setdefault(EVENT_FORMAT_PARAMETER, self._event_codec.name)
+        for parameter in (EVENT_COMPRESSION_PARAMETER, EVENT_COMPRESSION_LEVEL_PARAMETER):
+            if parameter in config:
+                persistent_storage_config.setdefault(parameter, config[parameter])
+        persistent_storage_type = persistent_storage_config.get("type", "sqlite")
+        if persistent_storage_type not in PERSISTENT_STORAGE_TYPES:
+            raise ValueError("Unsupported persistent storage type \"%s\" for the hybrid storage!"
+                             % persistent_storage_type)
+        self.__persistent_storage = PERSISTENT_STORAGE_TYPES[persistent_storage_type](persistent_storage_config,
+                                                                                      logger, main_stop_event)
+        self.__events = deque()
+        self.__event_pack = []
+        self.__event_pack_is_persistent = False
+        # Events left in the persistent storage after restart are read first
+        self.__spilled = self.__persistent_storage.len() > 0
+        self.__lock = Lock()
+        self.__stopped = False
+        self.__log.debug("Hybrid storage created with following configuration: \nMax size in memory: %i\n"
+                         "Read records per time: %i\nPersistent storage: %s",
+                         self.__max_records_count, self.__events_per_time, persistent_storage_type)
+
+    def put(self, event):
+        if self.__stopped:
+            self.__log.error("Storage is stopped!")
+            return False
+        with self.__lock:
+            if len(self.__events) >= self.__max_records_count:
+                if not self.__persistent_storage.put(self.__events[0]):
+                    self.__log.error("Hybrid storage is full!")
+                    return False
+                self.__events.popleft()
+                self.__spilled = True
+            self.__events.append(event)
+        return True
+
+    def get_event_pack(self):
+        if self.__event_pack:
+            return self.__event_pack
+        if self.__spilled:
+            event_pack = self.__persistent_storage.get_event_pack()
+            if event_pack:
+                self.__event_pack_is_persistent = True
+                return event_pack
+            # Spilled events may be not written yet, the memory ring is read after all of them
+            if self.__persistent_storage.len() > 0:
+                return []
+            self.__spilled = False
+        with self.__lock:
+            self.__event_pack = [self.__events.popleft() for _ in range(min(self.__events_per_time,
+                                                                             len(self.__events)))]
+        self.__event_pack_is_persistent = False
+        return self.__event_pack
+
+    def event_pack_processing_done(self):
+        if self.__event_pack_is_persistent:
+            self.__persistent_storage.event_pack_processing_done()
+            self.__event_pack_is_persistent = False
+        else:
+            self.__event_pack = []
+
+    def stop(self):
+        self.__stopped = True
+        with self.__lock:
+            events = self.__event_pack + list(self.__events)
+            for index, event in enumerate(events):
+                if not self.__persistent_storage.put(event):
+                    self.__log.error("Failed to save %i events from memory on stop!", len(events) - index)
+                    break
+            self.__event_pack = []
+            self.__events.clear()
+        self.__persistent_storage.stop()
+
+    def len(self):
+        return len(self.__events) + len(self.__event_pack) + self.__persistent_storage.len()
+
+    def update_logger(self):
+        self.__log = getLogger("storage")
+        self.__persistent_storage.update_logger()
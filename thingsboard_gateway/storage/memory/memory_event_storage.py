@@ -12,6 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from collections import deque
 from logging import getLogger
 from queue import Empty, Full, Queue
 
@@ -19,13 +20,17 @@ from thingsboard_gateway.storage.event_storage import EventStorage
 
 
 class MemoryEventStorage(EventStorage):
+    PERSISTENT = False
+
     def __init__(self, config, logger, main_stop_event):
         super().__init__(config, logger, main_stop_event)
         self.__log = logger
         self.__queue_len = config.get("max_records_count", 10000)
         self.__events_per_time = config.get("read_records_count", 1000)
         self.__events_queue = Queue(self.__queue_len)
-        self.__event_pack = []
+        # Packs returned and not processed yet, the oldest one is the first
+        self.__event_packs = deque()
+        self.__returned_packs_count = 0
         self.__stopped = False
         self.__log.debug("Memory storage created with following configuration: \nMax size: %i\n Read records per time: %i",
                   self.__queue_len, self.__events_per_time)
@@ -43,16 +48,29 @@ class MemoryEventStorage(EventStorage):
         return success
 
     def get_event_pack(self):
+        self.__returned_packs_count = 0
+        return self.get_next_event_pack()
+
+    def get_next_event_pack(self):
+        if self.__returned_packs_count < len(self.__event_packs):
+            event_pack = self.__event_packs[self.__returned_packs_count]
+            self.__returned_packs_count += 1
+            return event_pack
+        event_pack = []
         try:
-            if not self.__event_pack:
-                self.__event_pack = [self.__events_queue.get_nowait() for _ in
-                                     range(min(self.__events_per_time, self.__events_queue.qsize()))]
+            for _ in range(min(self.__events_per_time, self.__events_queue.qsize())):
+                event_pack.append(self.__events_queue.get_nowait())
         except Empty:
             pass
-        return self.__event_pack
+        if event_pack:
+            self.__event_packs.append(event_pack)
+            self.__returned_packs_count += 1
+        return event_pack
 
     def event_pack_processing_done(self):
-        self.__event_pack = []
+        if self.__event_packs:
+            self.__event_packs.popleft()
+            self.__returned_packs_count = max(self.__returned_packs_count - 1, 0)
 
     def stop(self):
         self.__stopped = True
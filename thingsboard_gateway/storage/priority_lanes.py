@@ -0,0 +1,145 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from threading import Lock
+from typing import Union
+
+from thingsboard_gateway.gateway.constants import ATTRIBUTES_PARAMETER, TELEMETRY_PARAMETER
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.storage.event_storage import EventStorage
+
+PRIORITY_LANES_PARAMETER = "priority_lanes"
+
+ATTRIBUTES_LANE = "attributes"
+LIVE_LANE = "live"
+BACKLOG_LANE = "backlog"
+
+
+def get_event_lane(data: Union[ConvertedData, dict]) -> str:
+    if isinstance(data, ConvertedData):
+        has_telemetry = data.telemetry_datapoints_count > 0
+        has_attributes = data.attributes_datapoints_count > 0
+    else:
+        has_telemetry = bool(data.get(TELEMETRY_PARAMETER))
+        has_attributes = bool(data.get(ATTRIBUTES_PARAMETER))
+    return ATTRIBUTES_LANE if has_attributes and not has_telemetry else LIVE_LANE
+
+
+class PriorityLanes:
+    """
+    Lets fresh events bypass the backlog of the event storage. Attribute updates are always kept in their own
+    memory lane. Telemetry is kept in the live memory lane only while the storage holds more events than
+    "live_backlog_threshold", otherwise it is put into the storage as usual. Packs are read from the lanes and
+    from the storage backlog by the smooth weighted round-robin, so the history is backfilled in parallel with
+    the live data. When a memory lane is full, its events are put into the storage, events left in the lanes
+    are put into the storage on stop.
+
+    Events of the memory lanes are lost if the gateway crashes, so with a persistent storage the lanes are used
+    only if "volatile_lanes" is enabled, otherwise all events are put into the storage. The option trades
+    the durability of the newest attributes and telemetry for their delivery before the backlog.
+    """
+
+    def __init__(self, config: dict, storage: EventStorage, logger):
+        self.__log = logger
+        self.__storage = storage
+        self.__max_records_count = config.get("max_records_count", 10000)
+        self.__read_records_count = config.get("read_records_count", 1000)
+        self.__live_backlog_threshold = config.get("live_backlog_threshold", 1000)
+        self.__memory_lanes_enabled = not storage.PERSISTENT or config.get("volatile_lanes", False)
+        if not self.__memory_lanes_enabled:
+            self.__log.info("Priority lanes are not used: the storage is persistent and \"volatile_lanes\" "
+                            "is not enabled")
+        self.__weights = {
+            ATTRIBUTES_LANE: config.get("attributes_weight", 4),
+            LIVE_LANE: config.get("live_weight", 2),
+            BACKLOG_LANE: config.get("backlog_weight", 1),
+        }
+        self.__current_weights = {lane: 0 for lane in self.__weights}
+        self.__lanes = {ATTRIBUTES_LANE: deque(), LIVE_LANE: deque()}
+        self.__lock = Lock()
+        self.__backlog = storage.len() > self.__live_backlog_threshold
+        self.__event_pack = []
+        self.__event_pack_lane = None
+
+    def put(self, event, lane: str) -> bool:
+        if self.__memory_lanes_enabled and (lane == ATTRIBUTES_LANE or (lane == LIVE_LANE and self.__backlog)):
+            with self.__lock:
+                if len(self.__lanes[lane]) < self.__max_records_count:
+                    self.__lanes[lane].append(event)
+                    return True
+        return self.__storage.put(event)
+
+    def get_event_pack(self):
+        if self.__event_pack_lane == BACKLOG_LANE:
+            return self.__storage.get_event_pack()
+        if self.__event_pack_lane is not None:
+            return self.__event_pack
+
+        lanes = [lane for lane, events in self.__lanes.items() if events]
+        if not lanes:
+            return self.__read_backlog()
+        lanes.append(BACKLOG_LANE)
+        while lanes:
+            lane = self.__select_lane(lanes)
+            if lane == BACKLOG_LANE:
+                event_pack = self.__read_backlog()
+                if event_pack:
+                    return event_pack
+                lanes.remove(BACKLOG_LANE)
+                continue
+            with self.__lock:
+                events = self.__lanes[lane]
+                self.__event_pack = [events.popleft() for _ in range(min(self.__read_records_count, len(events)))]
+            self.__event_pack_lane = lane
+            return self.__event_pack
+        return []
+
+    def event_pack_processing_done(self):
+        if self.__event_pack_lane == BACKLOG_LANE:
+            self.__storage.event_pack_processing_done()
+        self.__event_pack = []
+        self.__event_pack_lane = None
+
+    def stop(self):
+        with self.__lock:
+            events = self.__event_pack + list(self.__lanes[ATTRIBUTES_LANE]) + list(self.__lanes[LIVE_LANE])
+            for index, event in enumerate(events):
+                if not self.__storage.put(event):
+                    self.__log.error("Failed to save %i events from priority lanes on stop!", len(events) - index)
+                    break
+            self.__event_pack = []
+            for events in self.__lanes.values():
+                events.clear()
+
+    def len(self):
+        return len(self.__event_pack) + sum(len(events) for events in self.__lanes.values())
+
+    def __read_backlog(self):
+        event_pack = self.__storage.get_event_pack()
+        self.__backlog = self.__storage.len() > self.__live_backlog_threshold
+        if event_pack:
+            self.__event_pack_lane = BACKLOG_LANE
+        return event_pack
+
+    def __select_lane(self, lanes) -> str:
+        total_weight = 0
+        selected_lane = None
+        for lane in lanes:
+            self.__current_weights[lane] += self.__weights[lane]
+            total_weight += self.__weights[lane]
+            if selected_lane is None or self.__current_weights[lane] > self.__current_weights[selected_lane]:
+                selected_lane = lane
+        self.__current_weights[selected_lane] -= total_weight
+        return selected_lane
@@ -0,0 +1,475 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from mmap import ACCESS_READ, mmap
+from os import fsync, listdir, remove, replace
+from os.path import exists, getsize, join
+from struct import Struct
+from threading import RLock
+from time import monotonic
+from typing import Dict, List, NamedTuple, Optional
+from zlib import crc32
+
+from simplejson import JSONDecodeError, dumps, load
+
+from thingsboard_gateway.storage.segmented_log.segmented_log_settings import SegmentedLogSettings
+
+# Every segment starts with a header, the records count is written when the segment is sealed
+SEGMENT_HEADER = Struct("<4sB3xQ")
+SEGMENT_MAGIC = b"TBSL"
+SEGMENT_VERSION = 1
+SEGMENT_FILE_PREFIX = "segment_"
+SEGMENT_FILE_SUFFIX = ".log"
+STATE_FILE_NAME = "segmented_log_state.json"
+
+# Every record is prefixed with the payload length, CRC32 of the payload and flags.
+# CRC32 is seeded, so zeroes left in the file by a crash are never read as valid empty records.
+RECORD_HEADER = Struct("<IIB")
+RECORD_CRC_SEED = 0x54425347
+TEXT_RECORD_FLAG = 1
+
+# The size and the records count of the active segment at the last fsync, followed by CRC32 of them.
+# Only records written after the checkpoint are scanned on start.
+CHECKPOINT = Struct("<QQQ")
+CHECKPOINT_CRC = Struct("<I")
+CHECKPOINT_FILE_NAME = "segmented_log.checkpoint"
+
+
+class SegmentsCountError(Exception):
+    pass
+
+
+class SegmentedLogPointer(NamedTuple):
+    segment: int
+    # Byte offset of the next record to read and the number of records read from the segment
+    offset: int
+    records: int
+
+
+def encode_record(event) -> bytes:
+    if isinstance(event, str):
+        payload = event.encode("utf-8")
+        flags = TEXT_RECORD_FLAG
+    else:
+        payload = bytes(event)
+        flags = 0
+    return RECORD_HEADER.pack(len(payload), crc32(payload, RECORD_CRC_SEED ^ flags), flags) + payload
+
+
+def read_records(buffer, offset: int, max_count: int, events: list):
+    """
+    Appends up to "max_count" events, read from the buffer starting at the offset.
+    Returns the offset of the next record and False if a corrupted or incomplete record was found at that offset.
+    """
+    end = len(buffer)
+    header_size = RECORD_HEADER.size
+    unpack_header = RECORD_HEADER.unpack_from
+    while max_count > 0 and offset + header_size <= end:
+        length, checksum, flags = unpack_header(buffer, offset)
+        payload_end = offset + header_size + length
+        if payload_end > end:
+            return offset, False
+        payload = buffer[offset + header_size:payload_end]
+        if crc32(payload, RECORD_CRC_SEED ^ flags) != checksum:
+            return offset, False
+        events.append(payload.decode("utf-8") if flags & TEXT_RECORD_FLAG else payload)
+        offset = payload_end
+        max_count -= 1
+    return offset, offset == end or max_count == 0
+
+
+def scan_records(buffer, offset: int):
+    """Returns the number of valid records starting at the offset and the offset after the last valid record."""
+    end = len(buffer)
+    header_size = RECORD_HEADER.size
+    unpack_header = RECORD_HEADER.unpack_from
+    count = 0
+    while offset + header_size <= end:
+        length, checksum, flags = unpack_header(buffer, offset)
+        payload_end = offset + header_size + length
+        if payload_end > end or crc32(buffer[offset + header_size:payload_end], RECORD_CRC_SEED ^ flags) != checksum:
+            break
+        offset = payload_end
+        count += 1
+    return count, offset
+
+
+class SegmentedLog:
+    """
+    Append-only log of events, split into segment files.
+
+    Records are collected in memory and written to the active segment by group commit: once per "fsync_interval_ms"
+    or once "fsync_bytes" are collected, followed by fsync. When the active segment reaches "max_segment_size_bytes",
+    it is sealed and a new segment is started. Segments are deleted by the reader once all their records are read.
+    """
+
+    def __init__(self, settings: SegmentedLogSettings, logger):
+        self.__log = logger
+        self.settings = settings
+        self.__lock = RLock()
+        self.__segments: List[int] = []
+        self.__segments_records_count: Dict[int, int] = {}
+        self.__active_file = None
+        self.__active_segment_size = 0
+        self.__pending = bytearray()
+        self.__unsynced = False
+        self.__fsync_interval = settings.fsync_interval_ms / 1000
+        self.__last_commit_time = monotonic()
+        self.__checkpoint_file = None
+        self.__load_segments()
+
+    def append(self, event):
+        record = encode_record(event)
+        with self.__lock:
+            active_segment = self.__segments[-1]
+            if (self.__segments_records_count[active_segment]
+                    and self.__active_segment_size + len(record) > self.settings.max_segment_size_bytes):
+                if len(self.__segments) >= self.settings.max_segments_count:
+                    raise SegmentsCountError("The number of segments has been exceeded - change the settings or "
+                                             "check the connection. New data will be lost.")
+                self.__roll_segment()
+                active_segment = self.__segments[-1]
+            self.__pending += record
+            self.__active_segment_size += len(record)
+            self.__segments_records_count[active_segment] += 1
+            if len(self.__pending) >= self.settings.fsync_bytes \
+                    or monotonic() - self.__last_commit_time >= self.__fsync_interval:
+                self.commit()
+
+    def commit(self, sync=True):
+        """Writes the collected records to the active segment, with "sync" they are also synced to the disk."""
+        with self.__lock:
+            if self.__active_file is None:
+                return
+            if self.__pending:
+                self.__active_file.write(self.__pending)
+                self.__active_file.flush()
+                self.__pending.clear()
+                self.__unsynced = True
+            if sync:
+                if self.__unsynced:
+                    fsync(self.__active_file.fileno())
+                    self.__unsynced = False
+                    self.__write_checkpoint()
+                self.__last_commit_time = monotonic()
+
+    def close(self):
+        with self.__lock:
+            if self.__active_file is not None:
+                self.commit()
+                self.__active_file.close()
+                self.__active_file = None
+            if self.__checkpoint_file is not None:
+                self.__checkpoint_file.close()
+                self.__checkpoint_file = None
+
+    def get_segments(self) -> List[int]:
+        with self.__lock:
+            return self.__segments[:]
+
+    def get_next_segment(self, segment_id) -> Optional[int]:
+        with self.__lock:
+            for segment in self.__segments:
+                if segment > segment_id:
+                    return segment
+
+    def is_active_segment(self, segment_id) -> bool:
+        with self.__lock:
+            return self.__segments[-1] == segment_id
+
+    def map_segment(self, segment_id) -> Optional[mmap]:
+        """Maps the written part of the segment, records collected for the group commit are written before."""
+        with self.__lock:
+            if segment_id not in self.__segments_records_count:
+                return None
+            if segment_id == self.__segments[-1]:
+                self.commit(sync=False)
+            with open(self.get_segment_path(segment_id), "rb") as segment_file:
+                return mmap(segment_file.fileno(), 0, access=ACCESS_READ)
+
+    def delete_segments_before(self, segment_id):
+        with self.__lock:
+            for segment in self.__segments[:-1]:
+                if segment >= segment_id:
+                    break
+                try:
+                    remove(self.get_segment_path(segment))
+                except OSError as e:
+                    self.__log.warning("Failed to delete segment %s! Error: %s", segment, e)
+                self.__segments.remove(segment)
+                del self.__segments_records_count[segment]
+                self.__log.debug("Segmented log -- Deleted read segment %s", segment)
+
+    def get_records_count(self, from_segment=None) -> int:
+        with self.__lock:
+            return sum(count for segment, count in self.__segments_records_count.items()
+                       if from_segment is None or segment >= from_segment)
+
+    def get_segment_path(self, segment_id) -> str:
+        return join(self.settings.data_folder_path,
+                    "%s%020d%s" % (SEGMENT_FILE_PREFIX, segment_id, SEGMENT_FILE_SUFFIX))
+
+    def update_logger(self, logger):
+        self.__log = logger
+
+    def __roll_segment(self):
+        sealed_segment = self.__segments[-1]
+        self.commit()
+        self.__active_file.close()
+        self.__write_segment_header(sealed_segment, self.__segments_records_count[sealed_segment])
+        self.__open_active_segment(sealed_segment + 1)
+        self.__log.debug("Segmented log -- Sealed segment %s with %i records", sealed_segment,
+                         self.__segments_records_count[sealed_segment])
+
+    def __open_active_segment(self, segment_id):
+        path = self.get_segment_path(segment_id)
+        try:
+            size = getsize(path)
+        except OSError:
+            size = 0
+        if size < SEGMENT_HEADER.size:
+            self.__write_segment_header(segment_id, 0, truncate=True)
+            size = SEGMENT_HEADER.size
+        self.__active_file = open(path, "ab")
+        self.__active_segment_size = size
+        self.__last_commit_time = monotonic()
+        if segment_id not in self.__segments_records_count:
+            self.__segments.append(segment_id)
+            self.__segments_records_count[segment_id] = 0
+
+    def __write_segment_header(self, segment_id, records_count, truncate=False):
+        # The header is written in place: in append mode the data would be written to the end of the file
+        with open(self.get_segment_path(segment_id), "wb" if truncate else "r+b") as segment_file:
+            segment_file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, records_count))
+            segment_file.flush()
+            fsync(segment_file.fileno())
+
+    def __write_checkpoint(self):
+        # The checkpoint is not synced: if it is lost, more records are scanned on start
+        active_segment = self.__segments[-1]
+        checkpoint = CHECKPOINT.pack(active_segment, self.__active_segment_size,
+                                     self.__segments_records_count[active_segment])
+        try:
+            self.__checkpoint_file.seek(0)
+            self.__checkpoint_file.write(checkpoint + CHECKPOINT_CRC.pack(crc32(checkpoint)))
+            self.__checkpoint_file.flush()
+        except (IOError, ValueError) as e:
+            self.__log.warning("Failed to update segmented log checkpoint! Error: %s", e)
+
+    def __read_checkpoint(self):
+        checkpoint_path = join(self.settings.data_folder_path, CHECKPOINT_FILE_NAME)
+        checkpoint = None
+        if exists(checkpoint_path):
+            with open(checkpoint_path, "rb") as checkpoint_file:
+                data = checkpoint_file.read(CHECKPOINT.size + CHECKPOINT_CRC.size)
+            if len(data) == CHECKPOINT.size + CHECKPOINT_CRC.size \
+                    and CHECKPOINT_CRC.unpack_from(data, CHECKPOINT.size)[0] == crc32(data[:CHECKPOINT.size]):
+                checkpoint = CHECKPOINT.unpack_from(data)
+        self.__checkpoint_file = open(checkpoint_path, "r+b" if exists(checkpoint_path) else "w+b")
+        return checkpoint
+
+    def __load_segments(self):
+        checkpoint = self.__read_checkpoint()
+        segments = []
+        for file_name in listdir(self.settings.data_folder_path):
+            if file_name.startswith(SEGMENT_FILE_PREFIX) and file_name.endswith(SEGMENT_FILE_SUFFIX):
+                try:
+                    segments.append(int(file_name[len(SEGMENT_FILE_PREFIX):-len(SEGMENT_FILE_SUFFIX)]))
+                except ValueError:
+                    continue
+        segments.sort()
+
+        for index, segment_id in enumerate(segments):
+            is_last_segment = index == len(segments) - 1
+            records_count = self.__recover_segment(segment_id, is_last_segment, checkpoint)
+            if records_count is None:
+                continue
+            self.__segments.append(segment_id)
+            self.__segments_records_count[segment_id] = records_count
+        if self.__segments and self.__segments[-1] == segments[-1]:
+            self.__open_active_segment(self.__segments[-1])
+        else:
+            self.__open_active_segment(segments[-1] + 1 if segments else 0)
+        self.__log.info("Segmented log -- Loaded %i segments with %i records", len(self.__segments),
+                        self.get_records_count())
+
+    def __recover_segment(self, segment_id, is_last_segment, checkpoint) -> Optional[int]:
+        """
+        Returns the records count of the segment or None if the segment is damaged.
+        Sealed segments store the records count in the header, the last segment is scanned from the checkpoint and
+        the incomplete record written before the crash is truncated.
+        """
+        path = self.get_segment_path(segment_id)
+        if getsize(path) < SEGMENT_HEADER.size:
+            if is_last_segment:
+                return 0
+            self.__log.error("Segmented log -- Segment %s is damaged and will be skipped", segment_id)
+            return None
+        with open(path, "rb") as segment_file:
+            with mmap(segment_file.fileno(), 0, access=ACCESS_READ) as buffer:
+                magic, version, records_count = SEGMENT_HEADER.unpack_from(buffer, 0)
+                if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+                    self.__log.error("Segmented log -- Segment %s has unknown format and will be skipped", segment_id)
+                    return None
+                if records_count and not is_last_segment:
+                    return records_count
+                scan_offset, records_count = SEGMENT_HEADER.size, 0
+                if is_last_segment and checkpoint is not None and checkpoint[0] == segment_id \
+                        and SEGMENT_HEADER.size <= checkpoint[1] <= len(buffer):
+                    _, scan_offset, records_count = checkpoint
+                scanned_records_count, valid_end = scan_records(buffer, scan_offset)
+                records_count += scanned_records_count
+                size = len(buffer)
+        if is_last_segment:
+            if valid_end < size:
+                self.__log.warning("Segmented log -- Truncated %i bytes of incomplete record in segment %s",
+                                   size - valid_end, segment_id)
+                with open(path, "r+b") as segment_file:
+                    segment_file.truncate(valid_end)
+        else:
+            # The gateway was stopped while the segment was sealed
+            self.__write_segment_header(segment_id, records_count)
+        return records_count
+
+
+class SegmentedLogReader:
+    """Reads records of the segmented log from memory mapped segments, starting at the pointer from the state file."""
+
+    def __init__(self, segmented_log: SegmentedLog, settings: SegmentedLogSettings, logger):
+        self.__log = logger
+        self.__segmented_log = segmented_log
+        self.settings = settings
+        self.__state_file_path = join(settings.data_folder_path, STATE_FILE_NAME)
+        # Batches returned and not discarded yet with the pointers to their ends, the oldest one is the first
+        self.__batches = deque()
+        self.__returned_batches_count = 0
+        self.__mapped_segment = None
+        self.__mapped_buffer = None
+        self.__current_pointer = self.__read_state_file()
+        self.__new_pointer = self.__current_pointer
+        self.__segmented_log.delete_segments_before(self.__current_pointer.segment)
+
+    def read(self):
+        if self.__batches:
+            self.__log.debug("The previous batch was not discarded!")
+        self.__returned_batches_count = 0
+        return self.read_next()
+
+    def read_next(self):
+        """Returns the batch following the batches returned before and not discarded yet."""
+        if self.__returned_batches_count < len(self.__batches):
+            batch = self.__batches[self.__returned_batches_count][0]
+            self.__returned_batches_count += 1
+            return batch
+        batch = []
+        pointer = self.__new_pointer
+        while len(batch) < self.settings.max_read_records_count:
+            is_active_segment = self.__segmented_log.is_active_segment(pointer.segment)
+            buffer = self.__get_buffer(pointer.segment, is_active_segment)
+            if buffer is None:
+                pointer = self.__get_next_segment_pointer(pointer.segment)
+                if pointer is None:
+                    pointer = self.__new_pointer
+                    break
+                continue
+            read_count = len(batch)
+            offset, valid = read_records(buffer, pointer.offset, self.settings.max_read_records_count - len(batch),
+                                         batch)
+            pointer = SegmentedLogPointer(pointer.segment, offset, pointer.records + len(batch) - read_count)
+            if len(batch) >= self.settings.max_read_records_count or (valid and is_active_segment):
+                break
+            if not valid:
+                self.__log.error("Segmented log -- Corrupted record at offset %i of segment %s, "
+                                 "the rest of the segment will be skipped", offset, pointer.segment)
+            next_pointer = self.__get_next_segment_pointer(pointer.segment)
+            if next_pointer is None:
+                break
+            pointer = next_pointer
+        self.__new_pointer = pointer
+        if batch:
+            self.__batches.append((batch, pointer))
+            self.__returned_batches_count += 1
+        return batch
+
+    def discard_batch(self):
+        """Discards the oldest returned batch."""
+        try:
+            pointer = self.__batches.popleft()[1] if self.__batches else self.__new_pointer
+            self.__returned_batches_count = max(self.__returned_batches_count - 1, 0)
+            self.__write_state_file(pointer)
+            self.__current_pointer = pointer
+            if self.__mapped_segment is not None and self.__mapped_segment < self.__current_pointer.segment:
+                self.__unmap()
+            self.__segmented_log.delete_segments_before(self.__current_pointer.segment)
+        except Exception as e:
+            self.__log.exception("Failed to discard batch! Error: %s", e)
+
+    def get_unread_records_count(self) -> int:
+        pointer = self.__current_pointer
+        return max(self.__segmented_log.get_records_count(from_segment=pointer.segment) - pointer.records, 0)
+
+    def close(self):
+        self.__unmap()
+
+    def update_logger(self, logger):
+        self.__log = logger
+
+    def __get_buffer(self, segment_id, is_active_segment):
+        # Sealed segments are mapped once, the active segment is mapped again to see the new records
+        if self.__mapped_segment != segment_id or is_active_segment:
+            self.__unmap()
+            self.__mapped_buffer = self.__segmented_log.map_segment(segment_id)
+            self.__mapped_segment = segment_id if self.__mapped_buffer is not None else None
+        return self.__mapped_buffer
+
+    def __unmap(self):
+        if self.__mapped_buffer is not None:
+            self.__mapped_buffer.close()
+        self.__mapped_buffer = None
+        self.__mapped_segment = None
+
+    def __get_next_segment_pointer(self, segment_id) -> Optional[SegmentedLogPointer]:
+        next_segment = self.__segmented_log.get_next_segment(segment_id)
+        if next_segment is None:
+            return None
+        return SegmentedLogPointer(next_segment, SEGMENT_HEADER.size, 0)
+
+    def __read_state_file(self) -> SegmentedLogPointer:
+        segments = self.__segmented_log.get_segments()
+        try:
+            with open(self.__state_file_path) as state_file:
+                state = load(state_file)
+            pointer = SegmentedLogPointer(state["segment"], state["offset"], state["records"])
+            if pointer.segment in segments:
+                self.__log.info("Segmented log -- Initializing from state file: [%s:%i]",
+                                self.__segmented_log.get_segment_path(pointer.segment), pointer.offset)
+                return pointer
+        except FileNotFoundError:
+            pass
+        except (JSONDecodeError, KeyError, TypeError) as e:
+            self.__log.error("Failed to decode state file! Error: %s", e)
+        except IOError as e:
+            self.__log.warning("Failed to fetch info from state file! Error: %s", e)
+        return SegmentedLogPointer(segments[0], SEGMENT_HEADER.size, 0)
+
+    def __write_state_file(self, pointer: SegmentedLogPointer):
+        # The state is replaced atomically, so it is never lost if the gateway is stopped while it is written
+        temporary_path = self.__state_file_path + ".tmp"
+        try:
+            with open(temporary_path, "w") as state_file:
+                state_file.write(dumps(pointer._asdict()))
+            replace(temporary_path, self.__state_file_path)
+        except IOError as e:
+            self.__log.warning("Failed to update state file! Error: %s", e)
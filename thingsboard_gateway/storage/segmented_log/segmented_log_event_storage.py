@@ -0,0 +1,95 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from os import makedirs
+from os.path import exists
+from threading import Event, Thread
+
+from thingsboard_gateway.storage.event_storage import EventStorage
+from thingsboard_gateway.storage.segmented_log.segmented_log import SegmentedLog, SegmentedLogReader, \
+    SegmentsCountError
+from thingsboard_gateway.storage.segmented_log.segmented_log_settings import SegmentedLogSettings
+
+
+class SegmentedLogEventStorage(EventStorage):
+    """
+    File storage based on the append-only segmented log: events are stored as length-prefixed binary records
+    with CRC32, the read position is stored as a byte offset, so the reading is resumed without scanning the data.
+    """
+
+    def __init__(self, config, logger, main_stop_event):
+        super().__init__(config, logger, main_stop_event)
+        self.__log = logger
+        self.settings = SegmentedLogSettings(config)
+        self.init_data_folder_if_not_exist()
+        self.__segmented_log = SegmentedLog(self.settings, self.__log)
+        self.__reader = SegmentedLogReader(self.__segmented_log, self.settings, self.__log)
+        self.__stopped = Event()
+        self.__commit_thread = Thread(target=self.__commit_periodically, daemon=True,
+                                      name="Segmented log commit thread")
+        self.__commit_thread.start()
+
+    def put(self, event):
+        success = False
+        if not self.__stopped.is_set():
+            try:
+                self.__segmented_log.append(self._event_compressor.compress(event))
+            except SegmentsCountError as e:
+                self.__log.error("Failed to write event to storage! Error: %s", e)
+            except Exception as e:
+                self.__log.exception("Failed to write event to storage! Error: %s", e)
+            else:
+                success = True
+        else:
+            self.__log.error("Storage is closed!")
+        return success
+
+    def get_event_pack(self):
+        return self._event_compressor.decompress_pack(self.__reader.read())
+
+    def get_next_event_pack(self):
+        return self._event_compressor.decompress_pack(self.__reader.read_next())
+
+    def event_pack_processing_done(self):
+        self.__reader.discard_batch()
+
+    def init_data_folder_if_not_exist(self):
+        path = self.settings.data_folder_path
+        if not exists(path):
+            try:
+                makedirs(path)
+            except OSError as e:
+                self.__log.error('Failed to create data folder! Error: %s', e)
+
+    def stop(self):
+        self.__stopped.set()
+        self.__segmented_log.close()
+        self.__reader.close()
+
+    def len(self):
+        return self.__reader.get_unread_records_count()
+
+    def update_logger(self):
+        self.__log = getLogger("storage")
+        self.__segmented_log.update_logger(self.__log)
+        self.__reader.update_logger(self.__log)
+
+    def __commit_periodically(self):
+        # Records collected in memory are committed even if no new events are put
+        while not self.__stopped.wait(self.settings.fsync_interval_ms / 1000):
+            try:
+                self.__segmented_log.commit()
+            except Exception as e:
+                self.__log.exception("Failed to commit segmented log! Error: %s", e)
@@ -0,0 +1,24 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+
+class SegmentedLogSettings:
+    def __init__(self, config):
+        self.data_folder_path = config.get("data_folder_path", "./")
+        self.max_segments_count = max(config.get("max_segments_count", 10), 1)
+        self.max_segment_size_bytes = config.get("max_segment_size_bytes", 16 * 1024 * 1024)
+        # Group commit: written records are synced to the disk once per interval or once enough bytes are written
+        self.fsync_interval_ms = config.get("fsync_interval_ms", 1000)
+        self.fsync_bytes = config.get("fsync_bytes", 1024 * 1024)
+        self.max_read_records_count = config.get("max_read_records_count", 1000)
@@ -14,9 +14,10 @@
 
 from os.path import dirname, getsize, exists
 from sqlite3 import DatabaseError, ProgrammingError, InterfaceError, OperationalError
-from time import sleep, monotonic, time
+from collections import deque
+from time import monotonic, time
 from logging import getLogger
-from threading import Event, Thread
+from threading import Event, RLock, Thread
 from queue import Queue, Empty
 import datetime
 
@@ -61,8 +62,15 @@ class Database(Thread):
         self.init_table()
         self.process_queue = processing_queue
         self.__last_msg_check = 0
-        self.__can_prepare_new_batch = True
-        self.__next_batch = []
+        # Batches read ahead while the previous ones are published, the first one is not acknowledged yet
+        self.__read_ahead_batches = deque()
+        self.__read_ahead_size = 0
+        self.__read_ahead_row_id = 0
+        self.__read_ahead_lock = RLock()
+        # Rows up to the acknowledged id are not read anymore, they are deleted in the next write transaction
+        self.__acknowledged_row_id = 0
+        self.__deleted_row_id = 0
+        self.__stored_messages_count = self.__count_stored_messages()
         self.__initialized = True
 
     def init_table(self):
@@ -103,22 +111,18 @@ class Database(Thread):
     def run(self):
         self.__log.info("Database thread started %r", id(self))
         interval = self.settings.oversize_check_period * 60
-        sleep_time = 0.2
 
         last_time = monotonic()
         while not self.stopped.is_set() and not self.database_stopped_event.is_set():
             try:
-                processing_started = monotonic()
                 if self.__should_read:
-                    if self.__can_prepare_new_batch and not self.__next_batch:
-                        self.__next_batch = self.read_data()
-                        self.__can_prepare_new_batch = False
+                    self.__read_ahead()
                 if self.__should_write:
+                    # Blocks until messages are received
                     self.process()
-
-                remaining = sleep_time - (monotonic() - processing_started)
-                if remaining > 0 and self.process_queue.empty():
-                    sleep(remaining)
+                else:
+                    self.__write_transaction([])
+                    self.database_stopped_event.wait(0.1)
 
                 if not self.__reached_size_limit:
                     now = monotonic()
@@ -153,55 +157,57 @@ class Database(Thread):
             ):
                 self.__last_msg_check = cur_time
                 self.delete_data_lte(self.settings.messages_ttl_in_days)
-            if not self.process_queue.empty():
-                batch = []
-                start_collecting = monotonic()
-                while (
-                    len(batch) < self.settings.batch_size
-                    and not self.stopped.is_set()
-                    and monotonic() - start_collecting < 0.1
-                ):
-                    try:
-                        batch.append((cur_time, self.process_queue.get_nowait()))
-
-                    except Empty:
-                        if monotonic() - start_collecting > 0.1:
-                            break
-                        sleep(0.01)
-
-                if batch:
-                    start_writing = monotonic()
-
-                    self.db.execute_many_write(
-                        """INSERT INTO messages (timestamp, message) VALUES (?, ?);""",
-                        batch,
-                    )
-
-                    self.db.commit()
-
-                    self.__log.trace(
-                        "Wrote %d records in %.2f ms, queue size: %d, Avg time per 1 record: %.2f ms",
-                        len(batch),
-                        (monotonic() - start_writing) * 1000,
-                        self.process_queue.qsize(),
-                        (monotonic() - start_writing) * 1000 / len(batch),
-                    )
-            else:
-                self.database_stopped_event.wait(0.1)
+            # Group commit: messages received within 100 ms after the first one are written in one transaction
+            batch = []
+            try:
+                batch.append((cur_time, self.process_queue.get(timeout=0.1)))
+                collecting_deadline = monotonic() + 0.1
+                while len(batch) < self.settings.batch_size and not self.database_stopped_event.is_set():
+                    batch.append((cur_time, self.process_queue.get(timeout=max(collecting_deadline - monotonic(), 0))))
+            except Empty:
+                pass
+
+            start_writing = monotonic()
+            if self.__write_transaction(batch) and batch:
+                with self.__read_ahead_lock:
+                    self.__stored_messages_count += len(batch)
+                self.__log.trace(
+                    "Wrote %d records in %.2f ms, queue size: %d, Avg time per 1 record: %.2f ms",
+                    len(batch),
+                    (monotonic() - start_writing) * 1000,
+                    self.process_queue.qsize(),
+                    (monotonic() - start_writing) * 1000 / len(batch),
+                )
 
         except Exception as e:
             self.db.rollback()
             self.__log.exception("Failed to write data to storage! Error: %s", e)
 
-    def clean_next_batch(self):
-        self.__next_batch = []
+    def __write_transaction(self, batch) -> bool:
+        """Inserts the batch and deletes the acknowledged rows in one transaction."""
+        statements = []
+        if batch:
+            statements.append(("INSERT INTO messages (timestamp, message) VALUES (?, ?);", batch, True))
+        acknowledged_row_id = self.__acknowledged_row_id
+        if acknowledged_row_id > self.__deleted_row_id:
+            statements.append(("DELETE FROM messages WHERE id <= ?;", (acknowledged_row_id,), False))
+        if not statements:
+            return False
+        if not self.db.execute_transaction(statements):
+            self.__log.error("Failed to write %d records to storage!", len(batch))
+            return False
+        self.__deleted_row_id = acknowledged_row_id
+        return True
 
     def database_has_records(self) -> bool:
         """
         Returns True if there's at least one row in messages, False otherwise.
         """
+        if self.__stored_messages_count > 0:
+            return True
         try:
-            cursor = self.db.execute_read("SELECT EXISTS(SELECT 1 FROM messages);")
+            cursor = self.db.execute_read("SELECT EXISTS(SELECT 1 FROM messages WHERE id > ?);",
+                                          (self.__acknowledged_row_id,))
             if not cursor:
                 return False
             row = cursor.fetchone()
@@ -213,54 +219,84 @@ class Database(Thread):
             self.__log.debug("Out of memory checking for records")
             return False
 
-    def read_data(self):
+    def read_data(self, index=0):
+        """Returns the batch with the index among the batches that are not acknowledged yet."""
         if self.database_stopped_event.is_set() or not self.__initialized:
             return []
+        if self.db.closed or self.stopped.is_set() or not self.db.connection:
+            return []
+        with self.__read_ahead_lock:
+            # The batch is read again until it is acknowledged
+            while len(self.__read_ahead_batches) <= index:
+                if not self.__read_next_batch():
+                    return []
+            return self.__read_ahead_batches[index][0]
+
+    def delete_first_batch(self):
+        with self.__read_ahead_lock:
+            if self.__read_ahead_batches:
+                self.delete_data(self.__read_ahead_batches[0][0][-1]["id"])
+
+    def __read_ahead(self):
+        read_ahead_size_limit = float(self.settings.read_ahead_size_limit) * 1000000
+        while (
+            len(self.__read_ahead_batches) < self.settings.read_ahead_batches_count
+            and self.__read_ahead_size < read_ahead_size_limit
+            and not self.stopped.is_set()
+            and not self.database_stopped_event.is_set()
+        ):
+            if not self.__read_next_batch():
+                return
+
+    def __read_next_batch(self) -> bool:
         try:
-            if self.db.closed or self.stopped.is_set() or not self.db.connection:
-                return []
-            if self.__next_batch:
-                return self.__next_batch
-            start_time = monotonic()
-            data = self.db.execute_read(
-                """SELECT id, timestamp, message FROM messages LIMIT ?;""",
-                (self.settings.max_read_records_count,),
-            )
-            if not data:
-                return []
-            collected_data = data.fetchall()
-            elapsed_time = (monotonic() - start_time) * 1000
-            if collected_data:
+            with self.__read_ahead_lock:
+                start_time = monotonic()
+                data = self.db.execute_read(
+                    """SELECT id, timestamp, message FROM messages WHERE id > ? ORDER BY id LIMIT ?;""",
+                    (max(self.__read_ahead_row_id, self.__acknowledged_row_id), self.settings.max_read_records_count),
+                )
+                if not data:
+                    return False
+                collected_data = data.fetchall()
+                if not collected_data:
+                    return False
+                batch_size = sum(len(row["message"]) for row in collected_data)
+                self.__read_ahead_batches.append((collected_data, batch_size))
+                self.__read_ahead_size += batch_size
+                self.__read_ahead_row_id = collected_data[-1]["id"]
                 self.__log.trace(
-                    "Read %d records in %.2f ms", len(collected_data), elapsed_time
+                    "Read %d records in %.2f ms, read ahead batches: %d",
+                    len(collected_data), (monotonic() - start_time) * 1000, len(self.__read_ahead_batches)
                 )
-            return collected_data
+                return True
         except DatabaseError:
-            return []
+            return False
         except (ProgrammingError, InterfaceError) as e:
             self.__log.debug("Error reading data from storage: %s", e)
-            return []
+            return False
         except MemoryError:
-            return []
+            return False
 
     def interrupt(self):
         self.db.interrupt()
 
     def delete_data(self, row_id):
-        if self.database_stopped_event.is_set():
-            return
-        try:
-            data = self.db.execute_write(
-                """DELETE FROM messages WHERE id <= ?;""",
-                [
-                    row_id,
-                ],
-            )
-            self.db.commit()
-            return data
-        except Exception as e:
-            self.db.rollback()
-            self.__log.exception("Failed to delete data from storage! Error: %s", e)
+        # The rows are deleted by the database thread, together with the next written batch
+        with self.__read_ahead_lock:
+            if row_id <= self.__acknowledged_row_id:
+                return
+            self.__acknowledged_row_id = row_id
+            while self.__read_ahead_batches and self.__read_ahead_batches[0][0][0]["id"] <= row_id:
+                rows, batch_size = self.__read_ahead_batches.popleft()
+                unacknowledged_rows = [row for row in rows if row["id"] > row_id]
+                self.__stored_messages_count -= len(rows) - len(unacknowledged_rows)
+                if unacknowledged_rows:
+                    unacknowledged_size = sum(len(row["message"]) for row in unacknowledged_rows)
+                    self.__read_ahead_batches.appendleft((unacknowledged_rows, unacknowledged_size))
+                    self.__read_ahead_size -= batch_size - unacknowledged_size
+                    return
+                self.__read_ahead_size -= batch_size
 
     def delete_data_lte(self, days):
         if self.database_stopped_event.is_set():
@@ -271,6 +307,8 @@ class Database(Thread):
                 """DELETE FROM messages WHERE timestamp <= ? ;""", [ts]
             )
             self.db.commit()
+            with self.__read_ahead_lock:
+                self.__stored_messages_count = self.__count_stored_messages()
             return data
         except Exception as e:
             self.db.rollback()
@@ -316,11 +354,15 @@ class Database(Thread):
     def get_stored_messages_count(self) -> int:
         if self.database_stopped_event.is_set():
             return -1
+        # Counted once on start and kept by the written and the acknowledged batches
+        return self.__stored_messages_count
 
+    def __count_stored_messages(self) -> int:
         try:
-            cursor = self.db.execute_read("SELECT COUNT(*) FROM messages;")
+            cursor = self.db.execute_read("SELECT COUNT(*) FROM messages WHERE id > ?;",
+                                          (self.__acknowledged_row_id,))
             if cursor is None:
-                return -1
+                return 0
 
             row = cursor.fetchone()
             if not row:
@@ -330,17 +372,12 @@ class Database(Thread):
 
         except (DatabaseError, InterfaceError) as e:
             self.__log.exception("Failed to query message count from SQLite: %s", e)
-            return -1
+            return 0
 
     def close_db(self):
         if not self.database_stopped_event.is_set():
             self.database_stopped_event.set()
 
-    def can_prepare_new_batch(self):
-        self.__next_batch = []
-        self.__can_prepare_new_batch = True
-        return self.__can_prepare_new_batch
-
     def update_logger(self):
         self.__log = getLogger("storage")
         self.db.update_logger(logger=self.__log)
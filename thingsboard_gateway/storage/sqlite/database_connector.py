@@ -210,6 +210,51 @@ class DatabaseConnector:
                 current_try += 1
                 sleep(0.05 * current_try)
 
+    def execute_transaction(self, statements) -> bool:
+        """
+        Execute write queries in one transaction and commit it.
+        Every statement is a tuple of the query, its parameters and a flag that the query is executed
+        for the sequence of parameters.
+        """
+        if self.__closed:
+            return False
+        tries = 4
+        current_try = 0
+        # The first try is made after the database is stopped as well, to commit the last taken batch
+        while current_try < tries and (current_try == 0 or not self.database_stopped_event.is_set()):
+            try:
+                with self.lock:
+                    if self.__closed or self.connection is None:
+                        return False
+                    cursor = self.connection.cursor()
+                    if not self.connection.in_transaction:
+                        cursor.execute("BEGIN TRANSACTION;")
+                    for query, parameters, many in statements:
+                        if many:
+                            cursor.executemany(query, parameters)
+                        else:
+                            cursor.execute(query, parameters)
+                    self.connection.commit()
+                    return True
+            except sqlite3.OperationalError as e:
+                self.__log.debug("Failed to execute transaction in database", exc_info=e)
+                self.__rollback_transaction()
+                current_try += 1
+                sleep(0.05 * current_try)
+            except Exception as e:
+                self.__log.exception("Failed to execute transaction in database", exc_info=e)
+                self.__rollback_transaction()
+                return False
+        return False
+
+    def __rollback_transaction(self):
+        try:
+            with self.lock:
+                if self.connection is not None and self.connection.in_transaction:
+                    self.connection.rollback()
+        except Exception as e:
+            self.__log.debug("Failed to rollback transaction", exc_info=e)
+
     def rollback(self):
         """
         Rollback changes after exception
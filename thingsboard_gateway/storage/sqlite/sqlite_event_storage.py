@@ -111,6 +111,7 @@ class SQLiteEventStorage(EventStorage):
         if not self.__read_database.database_has_records() and len(self._database_files) > 1:
             self.__rotate_read_database()
         self.delete_time_point = 0
+        self.__returned_packs_count = 0
         self.__join_thread_timeout = 5
         self.__event_pack_processing_start = monotonic()
 
@@ -190,11 +191,15 @@ class SQLiteEventStorage(EventStorage):
 
     def __finalize_write_database_thread(self) -> None:
         self.__write_database.db.commit()
+        # The thread is stopped before it is joined, it commits the batch it has already taken from the queue,
+        # so no message is written to the new DB before the older ones
         try:
-            self.__write_database.interrupt()
-            self.__log.trace("Interrupted oversize DB thread")
-        except AttributeError:
-            pass
+            self.__write_database.close_db()
+            self.__log.trace("Closed oversize DB connection")
+        except ProgrammingError as e:
+            self.__log.debug("Close_db on closed DB: %s", e)
+        except Exception as e:
+            self.__log.debug("Close_db error: %s", e)
         try:
             self.__write_database.join(timeout=self.__join_thread_timeout)
             if self.__write_database.is_alive():
@@ -203,13 +208,6 @@ class SQLiteEventStorage(EventStorage):
             self.__log.debug("Join runtime error: %s", e)
         except Exception as e:
             self.__log.debug("Join error: %s", e)
-        try:
-            self.__write_database.close_db()
-            self.__log.trace("Closed oversize DB connection")
-        except ProgrammingError as e:
-            self.__log.debug("Close_db on closed DB: %s", e)
-        except Exception as e:
-            self.__log.debug("Close_db error: %s", e)
         self.__write_database.db.close()
 
     def __check_and_handle_max_db_count(self) -> bool:
@@ -246,19 +244,25 @@ class SQLiteEventStorage(EventStorage):
             int((monotonic() - self.__event_pack_processing_start) * 1000),
         )
         if not self.stopped.is_set():
+            if self.__returned_packs_count > 1:
+                # The next returned packs are still processed, only the oldest one is acknowledged
+                self.__returned_packs_count -= 1
+                self.__read_database.delete_first_batch()
+                return
+            self.__returned_packs_count = 0
             self.delete_data(self.delete_time_point)
             if not self.__read_database.database_has_records():
                 self.__read_database.process_file_limit()
                 if self.__read_database.reached_size_limit:
                     self.__rotate_read_database()
 
-        collect()
-
     def get_event_pack(self):
         if not self.stopped.is_set():
             self.__event_pack_processing_start = monotonic()
             event_pack_messages = []
+            self.delete_time_point = 0
             data_from_storage = self.read_data()
+            self.__returned_packs_count = 1 if data_from_storage else 0
             if not data_from_storage and not path.exists(
                     self.__read_database.settings.data_file_path
             ):
@@ -278,13 +282,21 @@ class SQLiteEventStorage(EventStorage):
                     self.__read_database.get_stored_messages_count(),
                 )
 
-            self.__read_database.can_prepare_new_batch()
-
             return event_pack_messages
 
         else:
             return []
 
+    def get_next_event_pack(self):
+        # Packs are read further only from the current read DB, the next DB is read after the rotation
+        if self.stopped.is_set() or not self.__returned_packs_count:
+            return []
+        data_from_storage = self.__read_database.read_data(index=self.__returned_packs_count)
+        if not data_from_storage:
+            return []
+        self.__returned_packs_count += 1
+        return self.process_event_storage_data(data_from_storage=data_from_storage, event_pack_messages=[])
+
     def process_event_storage_data(self, data_from_storage, event_pack_messages):
 
         if not data_from_storage:
@@ -296,6 +308,7 @@ class SQLiteEventStorage(EventStorage):
                 element_to_insert = row["message"]
                 if not element_to_insert:
                     continue
+                element_to_insert = self._event_compressor.decompress(element_to_insert)
 
                 event_pack_messages.append(element_to_insert)
                 if not self.delete_time_point or self.delete_time_point < row["id"]:
@@ -324,8 +337,8 @@ class SQLiteEventStorage(EventStorage):
                 sleep(0.05)
             self.__read_database.db.commit()
             self.__read_database.interrupt()
-            self.__read_database.join(timeout=self.__join_thread_timeout)
             self.__read_database.close_db()
+            self.__read_database.join(timeout=self.__join_thread_timeout)
             self.__read_database.db.close()
         except Exception:
             self.__log.debug("Interruption during delete cleanup")
@@ -400,7 +413,7 @@ class SQLiteEventStorage(EventStorage):
                     self.__cleanup_write_db_after_thread_termination()
                     self.__start_write_database(new_config=new_write_database_config)
                 self.__log.trace("Queuing message: %r", message)
-                self.write_queue.put_nowait(message)
+                self.write_queue.put_nowait(self._event_compressor.compress(message))
                 return True
             return False
         except Full:
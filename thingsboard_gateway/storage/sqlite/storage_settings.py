@@ -30,6 +30,11 @@ class StorageSettings:
         self.size_limit = config.get("size_limit", 1024)
         self.max_db_amount = config.get("max_db_amount", 10)
         self.oversize_check_period = config.get("oversize_check_period", 1)
+        self.event_format = config.get("event_format")
+        self.read_ahead_batches_count = config.get("read_ahead_batches_count", 4)
+        self.read_ahead_size_limit = config.get("read_ahead_size_limit", 16)
+        self.compression = config.get("compression")
+        self.compression_level = config.get("compression_level")
         self.validate_settings()
 
     def validate_settings(self):
@@ -0,0 +1,117 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from functools import lru_cache
+from logging import getLogger
+from re import compile as compile_regex
+
+from thingsboard_gateway.tb_utility.json_path import get_json_path
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+log = getLogger("service")
+
+# The same placeholders as found by TBUtility.get_values
+PLACEHOLDER_PATTERN = compile_regex(r'\$\{[${A-Za-z0-9. ^\]\[*_:"-]*\}')
+TAG_PATTERN = compile_regex(r'\${(?:(.*))}')
+
+MISSING = object()
+
+
+class _Placeholder:
+    __slots__ = ("expression", "key", "json_path")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        tag = TAG_PATTERN.search(expression).group(1)
+        tag_parts = tag.split()
+        self.key = tag_parts[0] if tag_parts else None
+        self.json_path = None
+        if self.key is not None:
+            if " " in tag:
+                tag = '.'.join('"' + section_key + '"' if " " in section_key else section_key
+                               for section_key in tag.split('.'))
+            try:
+                self.json_path = get_json_path(tag)
+            except Exception as e:
+                log.debug(e)
+
+    def get_value(self, data):
+        if self.key is None:
+            # Placeholder without a tag is never resolved, even to the expression itself
+            return None
+        if isinstance(data, dict) and self.key in data:
+            return data[self.key]
+        if isinstance(data, (dict, list)):
+            if self.json_path is None:
+                return MISSING
+            try:
+                value = self.json_path.find_first(data)
+            except Exception as e:
+                log.debug(e)
+                return MISSING
+            return MISSING if value is None else value
+        value = TBUtility.get_value(self.expression, data)
+        return MISSING if value is None else value
+
+
+class ExpressionTemplate:
+    """
+    Expression with "${...}" placeholders, split once into literal segments and placeholders with prepared
+    accessors: a direct key of the message or a compiled json path. Rendering gives the same result as
+    replacing tags found by TBUtility.get_values with their values, without any regular expression work.
+    """
+
+    __slots__ = ("expression", "__segments")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        segments = []
+        position = 0
+        for placeholder_match in PLACEHOLDER_PATTERN.finditer(expression):
+            if placeholder_match.start() > position:
+                segments.append(expression[position:placeholder_match.start()])
+            segments.append(_Placeholder(placeholder_match.group(0)))
+            position = placeholder_match.end()
+        if segments and position < len(expression):
+            segments.append(expression[position:])
+        self.__segments = segments
+
+    @property
+    def is_constant(self) -> bool:
+        return not self.__segments
+
+    def render(self, data, keep_missing_placeholders=False) -> str:
+        """
+        Returns the expression with values of the message instead of placeholders, a placeholder without value
+        is replaced by "None" or kept as is.
+        """
+        if not self.__segments:
+            return self.expression
+        parts = []
+        for segment in self.__segments:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+            value = segment.get_value(data)
+            if value is MISSING:
+                parts.append(segment.expression if keep_missing_placeholders else "None")
+            else:
+                parts.append(str(value))
+        return "".join(parts)
+
+
+# Device name expressions can be built from data, so the number of the kept templates is limited
+@lru_cache(maxsize=10000)
+def get_expression_template(expression: str) -> ExpressionTemplate:
+    return ExpressionTemplate(expression)
@@ -0,0 +1,139 @@
+#     Copyright 2025. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from functools import lru_cache
+from operator import itemgetter
+from re import compile as compile_regex
+from typing import Optional, Tuple
+
+from jsonpath_rw import parse
+
+# Tokens of jsonpath_rw lexer used by simple paths
+IDENTIFIER_PATTERN = compile_regex(r'[a-zA-Z_@][a-zA-Z0-9_@\-]*')
+INDEX_PATTERN = compile_regex(r'\[[ \t]*(-?\d+)[ \t]*\]')
+RESERVED_WORDS = ('where',)
+IGNORED_CHARACTERS = ' \t'
+
+
+def _skip_ignored(path: str, position: int) -> int:
+    while position < len(path) and path[position] in IGNORED_CHARACTERS:
+        position += 1
+    return position
+
+
+def _read_field(path: str, position: int) -> Tuple[Optional[str], int]:
+    """Reads an identifier or a quoted field name the way jsonpath_rw lexer does."""
+    if position < len(path) and path[position] in ('"', "'"):
+        quote = path[position]
+        field = []
+        position += 1
+        while position < len(path):
+            character = path[position]
+            if character == quote:
+                return ''.join(field), position + 1
+            if character == '\\':
+                position += 1
+                if position == len(path):
+                    break
+                character = path[position]
+            field.append(character)
+            position += 1
+        return None, position
+    identifier_match = IDENTIFIER_PATTERN.match(path, position)
+    if identifier_match is None or identifier_match.group(0) in RESERVED_WORDS:
+        return None, position
+    return identifier_match.group(0), identifier_match.end()
+
+
+def _compile_getters(path: str) -> Optional[tuple]:
+    """
+    Returns getters for a path of fields and indexes, like "$.sensor.values[0].temp" or "data['field name']",
+    or None if the path has other parts.
+    """
+    getters = []
+    position = _skip_ignored(path, 0)
+    if path.startswith('$', position):
+        position = _skip_ignored(path, position + 1)
+        if position == len(path):
+            return ()
+        if path[position] == '.':
+            position = _skip_ignored(path, position + 1)
+        elif path[position] != '[':
+            return None
+    expect_field = position < len(path) and path[position] != '['
+    while True:
+        if expect_field:
+            field, position = _read_field(path, position)
+            if field is None:
+                return None
+            getters.append(itemgetter(field))
+        position = _skip_ignored(path, position)
+        if position == len(path):
+            return tuple(getters) if getters else None
+        index_match = INDEX_PATTERN.match(path, position)
+        if index_match is not None:
+            getters.append(itemgetter(int(index_match.group(1))))
+            position = index_match.end()
+            expect_field = False
+        elif path[position] == '.' and getters:
+            position = _skip_ignored(path, position + 1)
+            expect_field = True
+        elif path[position] == '[':
+            field, position = _read_field(path, _skip_ignored(path, position + 1))
+            position = _skip_ignored(path, position)
+            if field is None or not path.startswith(']', position):
+                return None
+            getters.append(itemgetter(field))
+            position += 1
+            expect_field = False
+        else:
+            return None
+
+
+class JsonPath:
+    """
+    Path to a value in the message, compiled once. Paths of fields and indexes are resolved by a chain of
+    getters; paths with wildcards, slices, filters and other jsonpath_rw features are resolved by jsonpath_rw.
+    The first match is returned in both cases, as TBUtility.get_value did with jsonpath_rw only.
+    """
+
+    __slots__ = ("expression", "__getters", "__jsonpath_expression")
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.__getters = _compile_getters(expression)
+        self.__jsonpath_expression = parse(expression) if self.__getters is None else None
+
+    @property
+    def is_simple(self) -> bool:
+        return self.__getters is not None
+
+    def find_first(self, data, default=None):
+        getters = self.__getters
+        if getters is None:
+            jsonpath_match = self.__jsonpath_expression.find(data)
+            return jsonpath_match[0].value if jsonpath_match else default
+        value = data
+        try:
+            for getter in getters:
+                value = getter(value)
+        except (LookupError, TypeError, AttributeError):
+            return default
+        return value
+
+
+# Paths are compiled once for all connectors, the number of the kept ones is limited like it was in TBUtility
+@lru_cache(maxsize=10000)
+def get_json_path(expression: str) -> JsonPath:
+    return JsonPath(expression)
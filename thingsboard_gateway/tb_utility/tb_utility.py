@@ -21,18 +21,16 @@ from re import search, findall
 from time import monotonic, sleep
 from typing import Union, TYPE_CHECKING
 from uuid import uuid4
-from cachetools import TTLCache
 
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.x509.oid import NameOID
-from jsonpath_rw import parse
 from orjson import JSONDecodeError, dumps, loads, OPT_NON_STR_KEYS
 
-from thingsboard_gateway.gateway.constants import SECURITY_VAR, REPORT_STRATEGY_PARAMETER
-from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
-from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.constants import SECURITY_VAR
+from thingsboard_gateway.gateway.entities.datapoint_key_registry import DEFAULT_DATAPOINT_KEY_REGISTRY
+from thingsboard_gateway.tb_utility.json_path import get_json_path
 from thingsboard_gateway.tb_utility.tb_logger import TbLogger
 
 if TYPE_CHECKING:
@@ -43,8 +41,6 @@ log = getLogger("service")
 
 
 class TBUtility:
-    JSONPATH_EXPRESSION_CACHE = TTLCache(maxsize=10000, ttl=30)
-
     # Data conversion methods
 
     @staticmethod
@@ -145,13 +141,7 @@ class TBUtility:
                 try:
                     if " " in target_str:
                         target_str = '.'.join('"' + section_key + '"' if " " in section_key else section_key for section_key in target_str.split('.'))  # noqa
-                    jsonpath_expression = TBUtility.JSONPATH_EXPRESSION_CACHE.get(target_str)
-                    if jsonpath_expression is None:
-                        jsonpath_expression = parse(target_str)
-                        TBUtility.JSONPATH_EXPRESSION_CACHE[target_str] = jsonpath_expression
-                    jsonpath_match = jsonpath_expression.find(body)
-                    if jsonpath_match:
-                        full_value = jsonpath_match[0].value
+                    full_value = get_json_path(target_str).find_first(body)
                 except Exception as e:
                     log.debug(e)
             elif isinstance(body, (str, bytes)):
@@ -240,17 +230,10 @@ class TBUtility:
             return str(evaluated_data)
 
     @staticmethod
-    def convert_key_to_datapoint_key(key, device_report_strategy, key_config, logger=None):
-        key_report_strategy = None
-        if device_report_strategy is not None:
-            key_report_strategy = device_report_strategy
-        if key_config.get(REPORT_STRATEGY_PARAMETER) is not None:
-            try:
-                key_report_strategy = ReportStrategyConfig(key_config.get(REPORT_STRATEGY_PARAMETER))
-            except ValueError:
-                if logger is not None:
-                    logger.trace("Report strategy config is not specified for key %s", key)
-        return DatapointKey(key, key_report_strategy)
+    def convert_key_to_datapoint_key(key, device_report_strategy, key_config, logger=None, key_registry=None):
+        if key_registry is None:
+            key_registry = DEFAULT_DATAPOINT_KEY_REGISTRY
+        return key_registry.get_datapoint_key(key, device_report_strategy, key_config, logger)
 
     # Service methods
 